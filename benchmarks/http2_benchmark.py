@@ -0,0 +1,147 @@
+"""
+Benchmark of HTTP/1.1 and HTTP/2 transports for concurrent async requests against a local test server.
+
+The server answers every request after a fixed delay, emulating api latency, and counts TCP connections.
+HTTP/2 is spoken with prior knowledge (h2c), as the local server has no TLS to negotiate it by ALPN,
+which is how the client gets HTTP/2 from api.hunter.io. It needs 'h2' package.
+
+    python benchmarks/http2_benchmark.py --requests 2000 --concurrency 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Optional
+
+import h2.config
+import h2.connection
+import h2.events
+import httpx
+
+h2_preface: bytes = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+response_body: bytes = json.dumps({'data': {'status': 'valid', 'result': 'deliverable'}}).encode()
+
+
+class BenchmarkServer(asyncio.Protocol):
+    """Connection of test server, speaking HTTP/1.1 or HTTP/2 (prior knowledge)."""
+
+    connections: int = 0
+    delay: float = 0.05
+
+    def __init__(self) -> None:
+        """Initialize connection state."""
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer: bytes = b''
+        self.h2_connection: Optional[h2.connection.H2Connection] = None
+
+    def connection_made(self, transport: Any) -> None:
+        """Count new connection."""
+        self.transport = transport
+        BenchmarkServer.connections += 1
+
+    def data_received(self, received: bytes) -> None:
+        """Dispatch data to HTTP/1.1 or HTTP/2 handler."""
+        if self.h2_connection is None and (self.buffer + received).startswith(h2_preface):
+            self.h2_connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+            self.h2_connection.initiate_connection()
+        if self.h2_connection is not None:
+            self._h2_received(self.buffer + received)
+            self.buffer = b''
+            return
+        self.buffer += received
+        while b'\r\n\r\n' in self.buffer:
+            _, self.buffer = self.buffer.split(b'\r\n\r\n', 1)
+            asyncio.get_running_loop().call_later(self.delay, self._http1_respond)
+
+    def _http1_respond(self) -> None:
+        """Write HTTP/1.1 response."""
+        headers: bytes = 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {length}\r\n\r\n'.format(
+            length=len(response_body),
+        ).encode()
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(headers + response_body)
+
+    def _h2_received(self, received: bytes) -> None:
+        """Handle HTTP/2 frames."""
+        for event in self.h2_connection.receive_data(received):  # type: ignore
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.get_running_loop().call_later(self.delay, self._h2_respond, event.stream_id)
+        self.transport.write(self.h2_connection.data_to_send())  # type: ignore
+
+    def _h2_respond(self, stream_id: int) -> None:
+        """Write HTTP/2 response to the stream."""
+        if self.transport is None or self.transport.is_closing():
+            return
+        self.h2_connection.send_headers(  # type: ignore
+            stream_id,
+            [(':status', '200'), ('content-type', 'application/json'), ('content-length', str(len(response_body)))],
+        )
+        self.h2_connection.send_data(stream_id, response_body, end_stream=True)  # type: ignore
+        self.transport.write(self.h2_connection.data_to_send())  # type: ignore
+
+
+async def run_requests(http_client: httpx.AsyncClient, url: str, requests: int, concurrency: int) -> float:
+    """Perform requests with given concurrency, return elapsed time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(number: int) -> None:
+        async with semaphore:
+            response: httpx.Response = await http_client.get(url, params={'email': '{n}@company.com'.format(n=number)})
+            response.raise_for_status()
+
+    started_at: float = time.perf_counter()
+    await asyncio.gather(*(request(number) for number in range(requests)))
+    return time.perf_counter() - started_at
+
+
+async def benchmark(requests: int, concurrency: int, delay: float) -> None:
+    """Run both transports against local server and print results."""
+    BenchmarkServer.delay = delay
+    server: asyncio.AbstractServer = await asyncio.get_running_loop().create_server(
+        BenchmarkServer,
+        '127.0.0.1',
+        0,
+        backlog=4096,
+    )
+    url: str = 'http://127.0.0.1:{port}/v2/email-verifier'.format(port=server.sockets[0].getsockname()[1])
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    transports: dict[str, dict] = {
+        'HTTP/1.1': {'http2': False, 'limits': limits},
+        'HTTP/2': {'http1': False, 'http2': True, 'limits': limits},
+    }
+    print(
+        '{requests} requests, {concurrency} in flight, {delay}s server latency'.format(
+            requests=requests,
+            concurrency=concurrency,
+            delay=delay,
+        )
+    )
+    async with server:
+        for name, options in transports.items():
+            BenchmarkServer.connections = 0
+            async with httpx.AsyncClient(**options) as http_client:
+                elapsed: float = await run_requests(http_client, url, requests, concurrency)
+            print(
+                '{name:>8}: {elapsed:6.2f}s {rate:8.0f} req/s {connections:5} connections'.format(
+                    name=name,
+                    elapsed=elapsed,
+                    rate=requests / elapsed,
+                    connections=BenchmarkServer.connections,
+                )
+            )
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--delay', type=float, default=0.05)
+    arguments = parser.parse_args()
+    asyncio.run(benchmark(arguments.requests, arguments.concurrency, arguments.delay))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of cold import time of forager_forward, measured by python -X importtime in fresh interpreters.
+
+Import time includes third-party and standard library modules, imported with the module, unless they are given
+by --preload. Best cumulative import time of the module out of several runs is compared with the budget, the
+heaviest modules, imported with it, are printed. Exit status is 1 if the budget is exceeded.
+
+    python benchmarks/import_time_benchmark.py --module forager_forward.client_initializer --budget 60
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+
+project_root: Path = Path(__file__).resolve().parents[1]
+
+
+def import_times(module: str, preloaded: tuple[str, ...]) -> dict[str, int]:
+    """Import module after preloaded ones in fresh interpreter, get cumulative import time (microseconds) of modules."""
+    statement: str = 'import {modules}'.format(modules=', '.join((*preloaded, module)))
+    completed = subprocess.run(  # noqa: S603
+        (sys.executable, '-X', 'importtime', '-c', statement),
+        capture_output=True,
+        check=True,
+        cwd=project_root,
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.strip() in {'site', *preloaded}:
+            times.clear()  # modules above are imported by interpreter startup or preloaded
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    """Parse arguments, run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='forager_forward.client_initializer')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--preload', nargs='*', default=[], help='modules, imported before the module')
+    parser.add_argument('--budget', type=float, default=60, help='milliseconds')
+    parser.add_argument('--top', type=int, default=10)
+    arguments = parser.parse_args()
+    preloaded: tuple[str, ...] = tuple(arguments.preload)
+    runs: list[dict[str, int]] = [import_times(arguments.module, preloaded) for _ in range(arguments.runs)]
+    best: dict[str, int] = min(runs, key=lambda times: times[arguments.module])
+    top: int = arguments.top
+    heaviest: list[tuple[str, int]] = sorted(best.items(), key=lambda item: item[1], reverse=True)[:top]
+    for name, cumulative in heaviest:
+        print('{cumulative:8.1f} ms  {name}'.format(cumulative=cumulative / 1000, name=name))
+    elapsed: float = best[arguments.module] / 1000
+    print(
+        '{module}: {elapsed:.1f} ms, budget {budget:.1f} ms'.format(
+            module=arguments.module,
+            elapsed=elapsed,
+            budget=arguments.budget,
+        )
+    )
+    if elapsed > arguments.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
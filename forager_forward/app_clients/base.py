@@ -1,18 +1,213 @@
 """Client with base functionality."""
-from typing import Any, Optional
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import importlib.util
+import threading
+import time
+import warnings
+from concurrent import futures
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+from weakref import WeakKeyDictionary
 
 import httpx
 
-from forager_forward.common.exceptions import ForagerAPIError
+from forager_forward.app_clients.circuit_breaker import CircuitBreaker, CircuitBreakers
+from forager_forward.app_clients.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    is_overload_status,
+)
+from forager_forward.app_clients.credit_ledger import CreditLedger
+from forager_forward.app_clients.key_pool import ApiKeyPool, default_cooldown
+from forager_forward.app_clients.scheduler import (
+    RequestScheduler,
+    default_rate_per_key,
+    request_priority,
+)
+from forager_forward.app_clients.timeouts import (
+    LatencyTracker,
+    hedge_min_samples,
+    hedge_percentile,
+    operation_timeout,
+    remaining_time,
+)
+from forager_forward.common.domain_index import DomainIndex, domain_index
+from forager_forward.common.exceptions import (
+    ForagerAPIError,
+    ForagerDeadlineError,
+    ForagerError,
+    ForagerQuotaError,
+    ForagerVerificationPendingError,
+)
+from forager_forward.common.json_stream import JsonArrayStream
+from forager_forward.common.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from forager_forward.app_clients import negative_cache, response_cache
+else:
+    negative_cache = lazy_import('forager_forward.app_clients.negative_cache')
+    response_cache = lazy_import('forager_forward.app_clients.response_cache')
+
+hedge_workers: int = 8
+pool_connections: int = 20
+executor_workers: int = 8
 
 
 class BaseClient(object):
     """Base functionality for client."""
 
-    def __init__(self, api_key: str) -> None:
-        """Initialize client."""
-        self.api_key: str = api_key
+    def __init__(
+        self,
+        api_key: str | Iterable[str],
+        http2: bool = False,
+        transport: Optional[Any] = None,
+        key_cooldown: float = default_cooldown,
+    ) -> None:
+        """
+        Initialize client with one api key or with several keys to balance requests between.
+
+        :param api_key: str Api key or iterable of keys.
+        :param http2: bool Multiplex concurrent requests over few HTTP/2 connections, it needs optional 'h2'
+            package, HTTP/1.1 is used without it and with servers, which don't negotiate HTTP/2.
+        :param transport: httpx transport for sync and async requests instead of network one, e.g. ReplayTransport.
+        :param key_cooldown: float Seconds, key is skipped after 429 without X-RateLimit-Reset header, requests
+            raise ForagerQuotaError meanwhile, if all keys are skipped.
+        """
+        self.transport: Optional[Any] = transport
+        self.http2: bool = http2 and http2_available()
+        if http2 and not self.http2:
+            warnings.warn(
+                "HTTP/2 needs 'h2' package (forager_forward[http2] extra), HTTP/1.1 is used.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        self.key_pool: ApiKeyPool = ApiKeyPool((api_key,) if isinstance(api_key, str) else api_key, key_cooldown)
         self.endpoint: str = 'https://api.hunter.io/v2/'
+        self.credit_ledger: CreditLedger = CreditLedger()
+        self.domain_index: DomainIndex = domain_index
+        self.concurrency_limiter: AdaptiveConcurrencyLimiter = AdaptiveConcurrencyLimiter()
+        self.circuit_breakers: CircuitBreakers = CircuitBreakers()
+        self.latency_tracker: LatencyTracker = LatencyTracker()
+        self.hedged_operations: frozenset[str] = frozenset()
+        self.response_cache: Optional[response_cache.ResponseCache] = None
+        self.negative_cache: Optional[negative_cache.NegativeCache] = None
+        self._refreshing: set[str] = set()
+        self._refresh_tasks: set[asyncio.Task] = set()
+        self._hedge_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._executor: Optional[futures.ThreadPoolExecutor] = None
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = WeakKeyDictionary()
+        self._pool_lock = threading.Lock()
+        self.scheduler: RequestScheduler = RequestScheduler(default_rate_per_key * len(self.key_pool.api_keys))
+
+    @property
+    def api_key(self) -> str:
+        """Get primary api key."""
+        return self.key_pool.api_keys[0]
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Get pooled http client, shared by sync requests of all threads."""
+        with self._pool_lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    http2=self.http2,
+                    limits=pool_limits(),
+                    transport=self.transport,
+                )
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Get pooled async http client of the running event loop, shared by its requests."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        with self._pool_lock:
+            if loop not in self._async_http_clients:
+                self._async_http_clients[loop] = httpx.AsyncClient(
+                    http2=self.http2,
+                    limits=pool_limits(),
+                    transport=self.transport,
+                )
+            return self._async_http_clients[loop]
+
+    @property
+    def executor(self) -> futures.ThreadPoolExecutor:
+        """Get thread pool of the client for sync calls, submitted by submit."""
+        with self._pool_lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(executor_workers, thread_name_prefix='forager-worker')
+            return self._executor
+
+    def close(self) -> None:
+        """Close pooled http client and shut thread pools down."""
+        with self._pool_lock:
+            http_client, self._http_client = self._http_client, None
+            executors = (self._executor, self._hedge_executor)
+            self._executor = None
+            self._hedge_executor = None
+        if http_client is not None:
+            http_client.close()
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    async def aclose(self) -> None:
+        """Close pooled async http client of the running event loop."""
+        with self._pool_lock:
+            async_http_client: Optional[httpx.AsyncClient] = self._async_http_clients.pop(
+                asyncio.get_running_loop(),
+                None,
+            )
+        if async_http_client is not None:
+            await async_http_client.aclose()
+
+    def key_usage(self) -> dict[str, dict]:
+        """Get requests, errors and remaining budget per api key."""
+        return self.key_pool.usage()
+
+    def priority(self, priority_class: str) -> ContextManager[None]:
+        """
+        Get context manager, setting priority class of requests performed in the context.
+
+        :param priority_class: str 'interactive', 'normal' (default) or 'bulk'.
+        :return: ContextManager Context for with statement.
+        """
+        return request_priority(priority_class)
+
+    def check_budget(self, operation: str, count: int, strict: bool = True) -> int:
+        """
+        Check remaining credits cover a batch of operations, refreshing balance from the api if it is outdated.
+
+        :param operation: str Name of request operation.
+        :param count: int Number of operations in the batch.
+        :param strict: bool Raise ForagerBudgetError if batch can't be covered, otherwise return affordable part.
+        :return: int Number of operations, which can be performed.
+        """
+        if self.credit_ledger.needs_refresh():
+            accounts: Iterable[dict | httpx.Response] = (
+                self._perform_request('account', api_key=api_key) for api_key in self.key_pool.api_keys
+            )
+            self.credit_ledger.refresh(account for account in accounts if isinstance(account, dict))
+        return self.credit_ledger.check_budget(operation, count, strict=strict)
+
+    async def acheck_budget(self, operation: str, count: int, strict: bool = True) -> int:
+        """Check remaining credits cover a batch of operations, async version of check_budget."""
+        if self.credit_ledger.needs_refresh():
+            accounts: list[dict | httpx.Response] = [
+                await self._aperform_request('account', api_key=api_key) for api_key in self.key_pool.api_keys
+            ]
+            self.credit_ledger.refresh(account for account in accounts if isinstance(account, dict))
+        return self.credit_ledger.check_budget(operation, count, strict=strict)
 
     def _perform_request(
         self,
@@ -21,24 +216,26 @@ class BaseClient(object):
         raw: bool = False,
         **kwargs: Any,
     ) -> dict | httpx.Response:
-        """Perform http request."""
-        param_dict: dict = kwargs.get('param_dict', {})
-        param_dict['api_key'] = self.api_key
-        request = httpx.Request(
-            method,
-            '{domain}{operation}'.format(domain=self.endpoint, operation=operation),
-            params=param_dict,
-            json=kwargs.get('payload'),
-            headers=kwargs.get('headers'),
-        )
-        with httpx.Client() as client:
-            response: httpx.Response = client.send(request)
-        if raw:
-            return response
-        some_data: Optional[dict] = response.json().get('data')
-        if some_data is not None:
-            return some_data
-        raise ForagerAPIError(response.json())
+        """
+        Perform http request or get its data from response_cache, if it is set.
+
+        Stale cached data is returned at once and refreshed in the client thread pool. ForagerAPIError, cached
+        by negative_cache, is re-raised without request. kwargs 'cache' False skips the lookups, but fresh
+        data and errors are still cached.
+        """
+        self._check_negative(operation, method, raw, kwargs)
+        cached: Optional[tuple[Any, bool]] = self._cached(operation, method, raw, kwargs)
+        if cached is not None:
+            if cached[1] and self._start_refresh(operation, kwargs):
+                self.executor.submit(contextvars.copy_context().run, self._refresh, operation, kwargs)
+            return cached[0]
+        try:
+            response_data: dict | httpx.Response = self._request(operation, method, raw, **kwargs)
+        except ForagerAPIError as error:
+            self._remember_error(operation, method, kwargs, error)
+            raise
+        self._cache(operation, method, raw, kwargs, response_data)
+        return response_data
 
     async def _aperform_request(
         self,
@@ -47,21 +244,426 @@ class BaseClient(object):
         raw: bool = False,
         **kwargs: Any,
     ) -> dict | httpx.Response:
-        """Perform async http request."""
-        param_dict: dict = kwargs.get('param_dict', {})
-        param_dict['api_key'] = self.api_key
-        request = httpx.Request(
+        """Perform async http request or get its data from caches, stale data is refreshed by a task."""
+        self._check_negative(operation, method, raw, kwargs)
+        cached: Optional[tuple[Any, bool]] = self._cached(operation, method, raw, kwargs)
+        if cached is not None:
+            if cached[1] and self._start_refresh(operation, kwargs):
+                refresh_task: asyncio.Task = asyncio.create_task(self._arefresh(operation, kwargs))
+                self._refresh_tasks.add(refresh_task)
+                refresh_task.add_done_callback(self._refresh_tasks.discard)
+            return cached[0]
+        try:
+            response_data: dict | httpx.Response = await self._arequest(operation, method, raw, **kwargs)
+        except ForagerAPIError as error:
+            self._remember_error(operation, method, kwargs, error)
+            raise
+        self._cache(operation, method, raw, kwargs, response_data)
+        return response_data
+
+    def _request(
+        self,
+        operation: str,
+        method: str = 'get',
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> dict | httpx.Response:
+        """
+        Perform http request, failing over to another api key on quota exhaustion.
+
+        Every attempt has timeout of the operation, cut to the time left till the deadline, if kwargs 'deadline'
+        (seconds for the whole call) is given.
+        """
+        deadline_at: Optional[float] = _deadline_at(kwargs.get('deadline'))
+        tried_keys: set[str] = set()
+        while True:
+            api_key: str = self._next_api_key(tried_keys, kwargs.get('api_key'))
+            request: httpx.Request = self._build_request(operation, method, api_key, kwargs, deadline_at)
+            try:
+                response: httpx.Response = self._hedged_send(operation, api_key, request)
+            except httpx.TimeoutException as error:
+                _raise_on_deadline(deadline_at, error)
+                raise
+            if not self.key_pool.record_response(api_key, response):
+                return self._process_response(operation, response, raw)
+            tried_keys.add(api_key)
+
+    async def _arequest(
+        self,
+        operation: str,
+        method: str = 'get',
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> dict | httpx.Response:
+        """Perform async http request, failing over to another api key on quota exhaustion, see _request."""
+        deadline_at: Optional[float] = _deadline_at(kwargs.get('deadline'))
+        tried_keys: set[str] = set()
+        while True:
+            api_key: str = self._next_api_key(tried_keys, kwargs.get('api_key'))
+            request: httpx.Request = self._build_request(operation, method, api_key, kwargs, deadline_at)
+            try:
+                response: httpx.Response = await self._ahedged_send(operation, api_key, request)
+            except httpx.TimeoutException as error:
+                _raise_on_deadline(deadline_at, error)
+                raise
+            if not self.key_pool.record_response(api_key, response):
+                return self._process_response(operation, response, raw)
+            tried_keys.add(api_key)
+
+    def _stream_request(self, operation: str, path: Sequence[str], method: str = 'get', **kwargs: Any) -> Iterator[Any]:
+        """
+        Perform http request with streamed response, giving items of JSON array at path as soon as they are decoded.
+
+        Body is read by chunks and parsed incrementally, so only one item is kept in memory. Items of data, cached
+        by response_cache, are given without request, stale data is refreshed in the client thread pool. Streamed
+        responses aren't hedged and aren't saved to response_cache, as they aren't kept whole, api errors are
+        remembered by negative_cache, see _request.
+        """
+        self._check_negative(operation, method, False, kwargs)
+        cached: Optional[tuple[Any, bool]] = self._cached(operation, method, False, kwargs)
+        if cached is not None:
+            if cached[1] and self._start_refresh(operation, kwargs):
+                self.executor.submit(contextvars.copy_context().run, self._refresh, operation, kwargs)
+            yield from _cached_items(cached[0], path)
+            return
+        deadline_at: Optional[float] = _deadline_at(kwargs.get('deadline'))
+        tried_keys: set[str] = set()
+        while True:
+            api_key: str = self._next_api_key(tried_keys, kwargs.get('api_key'))
+            request: httpx.Request = self._build_request(operation, method, api_key, kwargs, deadline_at)
+            try:
+                response: httpx.Response = self._send(operation, api_key, request, stream=True)
+            except httpx.TimeoutException as error:
+                _raise_on_deadline(deadline_at, error)
+                raise
+            is_exhausted: bool = self.key_pool.record_response(api_key, response)
+            try:
+                if response.status_code == httpx.codes.OK and not is_exhausted:
+                    self.credit_ledger.charge(operation)
+                    parser: JsonArrayStream = JsonArrayStream(path)
+                    for chunk in response.iter_bytes():
+                        yield from parser.feed(chunk)
+                    yield from parser.close()
+                    return
+                response.read()
+            finally:
+                response.close()
+            if not is_exhausted:
+                self._raise_response_error(operation, method, kwargs, response)
+            tried_keys.add(api_key)
+
+    async def _astream_request(
+        self,
+        operation: str,
+        path: Sequence[str],
+        method: str = 'get',
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Perform async http request with streamed response, stale cached data is refreshed by a task."""
+        self._check_negative(operation, method, False, kwargs)
+        cached: Optional[tuple[Any, bool]] = self._cached(operation, method, False, kwargs)
+        if cached is not None:
+            if cached[1] and self._start_refresh(operation, kwargs):
+                refresh_task: asyncio.Task = asyncio.create_task(self._arefresh(operation, kwargs))
+                self._refresh_tasks.add(refresh_task)
+                refresh_task.add_done_callback(self._refresh_tasks.discard)
+            for cached_item in _cached_items(cached[0], path):
+                yield cached_item
+            return
+        deadline_at: Optional[float] = _deadline_at(kwargs.get('deadline'))
+        tried_keys: set[str] = set()
+        while True:
+            api_key: str = self._next_api_key(tried_keys, kwargs.get('api_key'))
+            request: httpx.Request = self._build_request(operation, method, api_key, kwargs, deadline_at)
+            try:
+                response: httpx.Response = await self._asend(operation, api_key, request, stream=True)
+            except httpx.TimeoutException as error:
+                _raise_on_deadline(deadline_at, error)
+                raise
+            is_exhausted: bool = self.key_pool.record_response(api_key, response)
+            try:
+                if response.status_code == httpx.codes.OK and not is_exhausted:
+                    self.credit_ledger.charge(operation)
+                    parser: JsonArrayStream = JsonArrayStream(path)
+                    async for chunk in response.aiter_bytes():
+                        for item in parser.feed(chunk):
+                            yield item
+                    for last_item in parser.close():
+                        yield last_item
+                    return
+                await response.aread()
+            finally:
+                await response.aclose()
+            if not is_exhausted:
+                self._raise_response_error(operation, method, kwargs, response)
+            tried_keys.add(api_key)
+
+    def _raise_response_error(self, operation: str, method: str, options: dict, response: httpx.Response) -> None:
+        """Raise ForagerAPIError of not successful streamed response, remembering it by negative_cache."""
+        try:
+            self._process_response(operation, response, raw=False)
+        except ForagerAPIError as error:
+            self._remember_error(operation, method, options, error)
+            raise
+        except ValueError:
+            api_error = ForagerAPIError(_error_data(response))
+            self._remember_error(operation, method, options, api_error)
+            raise api_error
+        raise ForagerAPIError(response.json())
+
+    def _cached(self, operation: str, method: str, raw: bool, options: dict) -> Optional[tuple[Any, bool]]:
+        """Get cached data and stale flag of the request, None if it isn't cached or cache is off."""
+        if self.response_cache is None or raw or options.get('cache') is False:
+            return None
+        if not self.response_cache.is_cacheable(operation, method, options):
+            return None
+        return self.response_cache.get(operation, options)
+
+    def _cache(self, operation: str, method: str, raw: bool, options: dict, response_data: Any) -> None:
+        """Save data of cacheable request to response_cache."""
+        if self.response_cache is not None and not raw and self.response_cache.is_cacheable(operation, method, options):
+            self.response_cache.set(operation, options, response_data)
+
+    def _check_negative(self, operation: str, method: str, raw: bool, options: dict) -> None:
+        """Re-raise error of the request, cached by negative_cache."""
+        if self.negative_cache is None or raw or options.get('cache') is False:
+            return
+        if method == 'get' and options.get('api_key') is None:
+            self.negative_cache.check(operation, options.get('param_dict', {}))
+
+    def _remember_error(self, operation: str, method: str, options: dict, error: ForagerAPIError) -> None:
+        """Save api error of the request to negative_cache."""
+        if self.negative_cache is not None and method == 'get' and options.get('api_key') is None:
+            self.negative_cache.remember(operation, options.get('param_dict', {}), error)
+
+    def _start_refresh(self, operation: str, options: dict) -> bool:
+        """Mark stale request as refreshing, False if its refresh is in progress already."""
+        refresh_key: str = response_cache.cache_key(operation, options)
+        with self._pool_lock:
+            if refresh_key in self._refreshing:
+                return False
+            self._refreshing.add(refresh_key)
+            return True
+
+    def _refresh(self, operation: str, options: dict) -> None:
+        """Refresh stale cached data of request with bulk priority, keeping stale data on failure."""
+        try:
+            with request_priority('bulk'):
+                self._perform_request(operation, **dict(options, cache=False))
+        except (ForagerError, httpx.HTTPError):
+            return
+        finally:
+            self._refreshed(operation, options)
+
+    async def _arefresh(self, operation: str, options: dict) -> None:
+        """Refresh stale cached data of request, async version of _refresh."""
+        try:
+            with request_priority('bulk'):
+                await self._aperform_request(operation, **dict(options, cache=False))
+        except (ForagerError, httpx.HTTPError):
+            return
+        finally:
+            self._refreshed(operation, options)
+
+    def _refreshed(self, operation: str, options: dict) -> None:
+        """Unmark refreshed request."""
+        with self._pool_lock:
+            self._refreshing.discard(response_cache.cache_key(operation, options))
+
+    def _hedged_send(self, operation: str, api_key: str, request: httpx.Request) -> httpx.Response:
+        """Send request, for hedged operations fire second attempt if the first one is slower than p95 latency."""
+        hedge_delay: Optional[float] = self._hedge_delay(operation)
+        if hedge_delay is None:
+            return self._send(operation, api_key, request)
+        attempts: list[futures.Future] = [self._submit_send(operation, api_key, request)]
+        done, _ = futures.wait(attempts, timeout=hedge_delay)
+        if not done:
+            attempts.append(self._submit_send(operation, api_key, request))
+        errors: list[BaseException] = []
+        for attempt in futures.as_completed(attempts):
+            error: Optional[BaseException] = attempt.exception()
+            if error is None:
+                return attempt.result()
+            errors.append(error)
+        raise errors[-1]
+
+    def _submit_send(self, operation: str, api_key: str, request: httpx.Request) -> futures.Future:
+        """Send request in hedging thread pool, keeping context (e.g. priority class) of the caller."""
+        with self._pool_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = futures.ThreadPoolExecutor(hedge_workers, thread_name_prefix='forager-hedge')
+            executor: futures.ThreadPoolExecutor = self._hedge_executor
+        return executor.submit(contextvars.copy_context().run, self._send, operation, api_key, request)
+
+    async def _ahedged_send(self, operation: str, api_key: str, request: httpx.Request) -> httpx.Response:
+        """Send async request, for hedged operations fire second attempt if the first one is slower than p95 latency."""
+        hedge_delay: Optional[float] = self._hedge_delay(operation)
+        if hedge_delay is None:
+            return await self._asend(operation, api_key, request)
+        pending: set[asyncio.Future] = {asyncio.ensure_future(self._asend(operation, api_key, request))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                pending.add(asyncio.ensure_future(self._asend(operation, api_key, request)))
+            errors: list[BaseException] = []
+            while done or pending:
+                for attempt in done:
+                    error: Optional[BaseException] = attempt.exception()
+                    if error is None:
+                        return attempt.result()
+                    errors.append(error)
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            raise errors[-1]
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    def _hedge_delay(self, operation: str) -> Optional[float]:
+        """Get delay before second attempt, None if operation is not hedged or there are not enough latencies."""
+        if operation not in self.hedged_operations:
+            return None
+        return self.latency_tracker.percentile(operation, hedge_percentile, min_samples=hedge_min_samples)
+
+    def _send(self, operation: str, api_key: str, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """
+        Send request by pooled client within rate budget of the scheduler, through operation circuit breaker.
+
+        Open breaker rejects request before it waits for rate budget. Body of streamed response isn't read,
+        it should be closed by the caller.
+        """
+        breaker: CircuitBreaker = self.circuit_breakers.get(operation)
+        breaker.before_call()
+        failed: Optional[bool] = None
+        try:
+            self.scheduler.acquire()
+            started_at: float = time.monotonic()
+            response: httpx.Response = (
+                self.http_client.send(request, stream=True) if stream else self.http_client.send(request)
+            )
+            failed = response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+            self.latency_tracker.record(operation, time.monotonic() - started_at)
+        except httpx.HTTPError as error:
+            failed = isinstance(error, httpx.TransportError)
+            self.key_pool.record_error(api_key)
+            raise
+        finally:
+            breaker.record(failed)
+        return response
+
+    async def _asend(
+        self,
+        operation: str,
+        api_key: str,
+        request: httpx.Request,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send request by pooled async client through operation circuit breaker, within adaptive concurrency limit.
+
+        Open breaker rejects request before it waits for rate budget of the scheduler and the limit. The limit
+        is backed off on 429, 5xx and timeouts. Body of streamed response isn't read, it should be closed by the caller.
+        """
+        breaker: CircuitBreaker = self.circuit_breakers.get(operation)
+        breaker.before_call()
+        try:
+            await self.scheduler.aacquire()
+            acquired_at: float = await self.concurrency_limiter.acquire()
+        except BaseException:
+            breaker.record(None)
+            raise
+        failed: Optional[bool] = None
+        overloaded: Optional[bool] = None
+        started_at: float = time.monotonic()
+        try:
+            response: httpx.Response = await (
+                self.async_http_client.send(request, stream=True) if stream else self.async_http_client.send(request)
+            )
+            failed = response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+            self.latency_tracker.record(operation, time.monotonic() - started_at)
+            overloaded = is_overload_status(response.status_code)
+        except httpx.HTTPError as error:
+            failed = isinstance(error, httpx.TransportError)
+            overloaded = True if isinstance(error, httpx.TimeoutException) else None
+            self.key_pool.record_error(api_key)
+            raise
+        finally:
+            self.concurrency_limiter.release(acquired_at, overloaded)
+            breaker.record(failed)
+        return response
+
+    def _next_api_key(self, tried_keys: set[str], pinned_key: Optional[str] = None) -> str:
+        """Get api key for the next attempt, pinned key is used if it is given."""
+        if pinned_key is None:
+            return self.key_pool.acquire(exclude=tried_keys)
+        if pinned_key in tried_keys:
+            raise ForagerQuotaError('Api key has exhausted its quota.')
+        return pinned_key
+
+    def _build_request(
+        self,
+        operation: str,
+        method: str,
+        api_key: str,
+        options: dict,
+        deadline_at: Optional[float] = None,
+    ) -> httpx.Request:
+        """Build request for the operation, signed with given api key, with timeout of the operation."""
+        param_dict: dict = options.get('param_dict', {})
+        timeout: float = operation_timeout(operation, param_dict)
+        time_left: Optional[float] = remaining_time(deadline_at)
+        return httpx.Request(
             method,
             '{domain}{operation}'.format(domain=self.endpoint, operation=operation),
-            params=param_dict,
-            json=kwargs.get('payload'),
-            headers=kwargs.get('headers'),
+            params=dict(param_dict, api_key=api_key),
+            json=options.get('payload'),
+            headers=options.get('headers'),
+            extensions={'timeout': httpx.Timeout(timeout if time_left is None else min(timeout, time_left)).as_dict()},
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.send(request)
+
+    def _process_response(self, operation: str, response: httpx.Response, raw: bool) -> dict | httpx.Response:
+        """Charge credits and get 'data' from response or raise ForagerAPIError."""
+        if response.status_code == httpx.codes.OK:
+            self.credit_ledger.charge(operation)
         if raw:
             return response
+        if response.status_code == httpx.codes.ACCEPTED:
+            raise ForagerVerificationPendingError(response.json() if response.content else {})
         some_data: Optional[dict] = response.json().get('data')
         if some_data is not None:
             return some_data
         raise ForagerAPIError(response.json())
+
+
+def http2_available() -> bool:
+    """Check optional 'h2' package, needed for HTTP/2, is installed."""
+    return importlib.util.find_spec('h2') is not None
+
+
+def pool_limits() -> httpx.Limits:
+    """Get connection pool limits, the same for sync and async http clients."""
+    return httpx.Limits(max_connections=pool_connections, max_keepalive_connections=pool_connections)
+
+
+def _cached_items(cached_data: Any, path: Sequence[str]) -> list[Any]:
+    """Get items of JSON array at path in cached data of 'data' key, empty list if there is no array."""
+    for key in path[1:]:
+        cached_data = cached_data.get(key) if isinstance(cached_data, dict) else None
+    return cached_data if isinstance(cached_data, list) else []
+
+
+def _error_data(response: httpx.Response) -> dict:
+    """Get api error payload for response, which body isn't JSON, e.g. error page of proxy."""
+    return {'errors': [{'id': 'invalid_response', 'code': response.status_code, 'details': response.reason_phrase}]}
+
+
+def _deadline_at(deadline: Optional[float]) -> Optional[float]:
+    """Convert deadline in seconds to monotonic time."""
+    return None if deadline is None else time.monotonic() + deadline
+
+
+def _raise_on_deadline(deadline_at: Optional[float], error: httpx.TimeoutException) -> None:
+    """Raise ForagerDeadlineError, if timeout happened because deadline is exceeded."""
+    if deadline_at is not None and time.monotonic() >= deadline_at:
+        raise ForagerDeadlineError('Deadline exceeded.') from error
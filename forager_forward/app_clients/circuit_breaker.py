@@ -0,0 +1,107 @@
+"""Circuit breaker to fail fast while api is degraded."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from forager_forward.common.exceptions import ForagerCircuitOpenError
+
+closed_state: str = 'closed'
+open_state: str = 'open'
+half_open_state: str = 'half_open'
+
+
+class CircuitBreaker(object):
+    """
+    Thread safe circuit breaker of one operation.
+
+    Closed breaker lets calls through and opens after failure_threshold consecutive failures.
+    Open breaker rejects calls for recovery_timeout seconds, then becomes half-open and lets
+    half_open_calls probe calls through: success of a probe closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_calls: int = 1) -> None:
+        """Initialize closed breaker."""
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.half_open_calls: int = half_open_calls
+        self._failures: int = 0
+        self._opened_at: Optional[float] = None
+        self._probes: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Get breaker state."""
+        with self._lock:
+            return self._state()
+
+    def before_call(self) -> None:
+        """Let call through or raise ForagerCircuitOpenError."""
+        with self._lock:
+            state: str = self._state()
+            if state == closed_state:
+                return
+            if state == half_open_state and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+        raise ForagerCircuitOpenError('Circuit is open, api is considered degraded.')
+
+    def record(self, failed: Optional[bool]) -> None:
+        """
+        Record call outcome.
+
+        :param failed: bool True for failed call (network error, timeout, 5xx), False for successful,
+            None for call without outcome (e.g. cancelled).
+        """
+        with self._lock:
+            probe: bool = self._state() == half_open_state
+            if probe:
+                self._probes = max(self._probes - 1, 0)
+            if failed is None:
+                return
+            if not failed:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if probe or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def _state(self) -> str:
+        """Get breaker state, lock should be held."""
+        if self._opened_at is None:
+            return closed_state
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return open_state
+        return half_open_state
+
+
+class CircuitBreakers(object):
+    """Circuit breakers per operation, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_calls: int = 1) -> None:
+        """Initialize breakers settings."""
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.half_open_calls: int = half_open_calls
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, operation: str) -> CircuitBreaker:
+        """Get breaker of the operation."""
+        with self._lock:
+            if operation not in self._breakers:
+                self._breakers[operation] = CircuitBreaker(
+                    self.failure_threshold,
+                    self.recovery_timeout,
+                    self.half_open_calls,
+                )
+            return self._breakers[operation]
+
+    def states(self) -> dict[str, str]:
+        """Get state of every breaker."""
+        with self._lock:
+            breakers: dict[str, CircuitBreaker] = dict(self._breakers)
+        return {operation: breaker.state for operation, breaker in breakers.items()}
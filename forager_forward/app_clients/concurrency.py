@@ -0,0 +1,141 @@
+"""Adaptive (AIMD) concurrency limiter for async requests."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+overload_status_codes: frozenset[int] = frozenset((403, 429))
+latency_tolerance: float = 2.0
+latency_smoothing: float = 0.1
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limit of requests in flight, adapted by additive increase / multiplicative decrease.
+
+    The limit grows by about one per limit of healthy responses and is multiplied by backoff on overload
+    (429, 5xx, timeouts). A response is healthy if its latency is not much higher than the average one.
+    Only one decrease happens per window of requests, started before the previous decrease.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff: float = 0.5,
+    ) -> None:
+        """Initialize limiter."""
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.backoff: float = backoff
+        self._limit: float = float(initial_limit)
+        self._in_flight: int = 0
+        self._latency: Optional[float] = None
+        self._decreased_at: float = 0
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._counters: dict[str, int] = {'increases': 0, 'decreases': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Get current limit of requests in flight."""
+        return int(self._limit)
+
+    async def acquire(self) -> float:
+        """
+        Wait for free slot.
+
+        :return: float Monotonic time the slot was acquired at, it should be given back to release.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return time.monotonic()
+                waiter: asyncio.Future = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                    else:
+                        self._wake_waiters()
+                raise
+
+    def release(self, acquired_at: float, overloaded: Optional[bool]) -> None:
+        """
+        Free slot and adapt the limit.
+
+        :param acquired_at: float Value returned by acquire.
+        :param overloaded: bool Request failed because of api overload (429, 5xx, timeout),
+            None for request without response (e.g. cancelled), it doesn't change the limit.
+        """
+        latency: float = time.monotonic() - acquired_at
+        with self._lock:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease(acquired_at)
+            elif overloaded is not None:
+                self._adapt_to_latency(latency)
+            self._wake_waiters()
+
+    def metrics(self) -> dict:
+        """Get current limit, requests in flight and waiting, average latency and number of limit changes."""
+        with self._lock:
+            return dict(
+                self._counters,
+                limit=self.limit,
+                in_flight=self._in_flight,
+                waiting=len(self._waiters),
+                latency=self._latency,
+            )
+
+    def _adapt_to_latency(self, latency: float) -> None:
+        """Increase limit if latency is healthy, update average latency."""
+        if self._latency is None or latency <= self._latency * latency_tolerance:
+            self._increase()
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += (latency - self._latency) * latency_smoothing
+
+    def _increase(self) -> None:
+        """Increase limit additively."""
+        if self._limit >= self.max_limit:
+            return
+        previous_limit: int = self.limit
+        self._limit = min(self._limit + 1 / self._limit, float(self.max_limit))
+        if self.limit > previous_limit:
+            self._counters['increases'] += 1
+
+    def _decrease(self, acquired_at: float) -> None:
+        """Decrease limit multiplicatively, once per window of requests."""
+        if acquired_at < self._decreased_at:
+            return
+        self._limit = max(self._limit * self.backoff, float(self.min_limit))
+        self._decreased_at = time.monotonic()
+        self._counters['decreases'] += 1
+
+    def _wake_waiters(self) -> None:
+        """Wake waiters for free slots."""
+        for _ in range(min(self.limit - self._in_flight, len(self._waiters))):
+            loop, waiter = self._waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def is_overload_status(status_code: int) -> bool:
+    """Check response status means api is overloaded."""
+    return status_code in overload_status_codes or status_code >= 500
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    """Resolve waiter future, if it isn't cancelled."""
+    if not waiter.done():
+        waiter.set_result(None)
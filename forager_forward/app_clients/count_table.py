@@ -0,0 +1,112 @@
+"""Columnar table of email_count results for many domains."""
+from __future__ import annotations
+
+import csv
+import json
+from array import array
+from typing import IO, Any, Iterator, Optional
+
+count_departments: tuple[str, ...] = (
+    'executive',
+    'it',
+    'finance',
+    'management',
+    'sales',
+    'legal',
+    'support',
+    'hr',
+    'marketing',
+    'communication',
+)
+count_seniorities: tuple[str, ...] = ('junior', 'senior', 'executive')
+count_columns: tuple[str, ...] = (
+    'total',
+    'personal_emails',
+    'generic_emails',
+    *('department_{name}'.format(name=name) for name in count_departments),
+    *('seniority_{name}'.format(name=name) for name in count_seniorities),
+)
+missing_count: int = -1
+
+
+class EmailCountTable(object):
+    """
+    email_count results of many domains, stored in parallel arrays of counts, one per column.
+
+    Row of a domain, which count has failed or isn't received yet, has -1 in every column,
+    api error payloads of failed rows are kept apart by row number.
+    """
+
+    def __init__(self, domains: list[str]) -> None:
+        """Initialize table with empty row per domain."""
+        self.domains: list[str] = domains
+        self.columns: dict[str, array] = {
+            column: array('l', [missing_count]) * len(domains) for column in count_columns
+        }
+        self.errors: dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        """Get number of rows."""
+        return len(self.domains)
+
+    def fill(self, row: int, count_data: dict) -> None:
+        """
+        Fill row with email_count data.
+
+        :param row: int Row number.
+        :param count_data: dict email_count data, departments and seniorities are read from its nested dicts.
+        """
+        flat_data: dict[str, Any] = {
+            'total': count_data.get('total'),
+            'personal_emails': count_data.get('personal_emails'),
+            'generic_emails': count_data.get('generic_emails'),
+        }
+        for group in ('department', 'seniority'):
+            for name, count in (count_data.get(group) or {}).items():
+                flat_data['{group}_{name}'.format(group=group, name=name)] = count
+        for column, values in self.columns.items():
+            count = flat_data.get(column)
+            values[row] = missing_count if count is None else count
+
+    def fail(self, row: int, error_data: Any) -> None:
+        """Keep api error payload of the row."""
+        self.errors[row] = error_data
+
+    def row(self, row: int) -> dict:
+        """Get row as dict with 'domain' and counts, -1 for missing ones."""
+        return dict(
+            {column: values[row] for column, values in self.columns.items()},
+            domain=self.domains[row],
+        )
+
+    def rows(self) -> Iterator[dict]:
+        """Iterate over rows as dicts."""
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def to_csv(self, output: str | IO[str]) -> None:
+        """
+        Write table to CSV with 'domain', counts and 'error' columns, missing counts are empty.
+
+        :param output: str Path to the file or file object, opened for writing.
+        """
+        if isinstance(output, str):
+            with open(output, 'w', encoding='utf-8', newline='') as output_file:
+                self._write_csv(output_file)
+        else:
+            self._write_csv(output)
+
+    def _write_csv(self, output_file: IO[str]) -> None:
+        """Write table rows to CSV file."""
+        writer = csv.writer(output_file)
+        writer.writerow(('domain', *self.columns, 'error'))
+        columns: list[array] = list(self.columns.values())
+        for row, domain in enumerate(self.domains):
+            error: Optional[Any] = self.errors.get(row)
+            writer.writerow(
+                (
+                    domain,
+                    *('' if values[row] == missing_count else values[row] for values in columns),
+                    '' if error is None else json.dumps(error, default=str),
+                ),
+            )
@@ -0,0 +1,96 @@
+"""Local accounting of Hunter.io credits."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable, Optional
+
+from forager_forward.common.exceptions import ForagerBudgetError
+
+operation_costs: dict[str, tuple[str, int]] = {
+    'domain-search': ('searches', 1),
+    'email-finder': ('searches', 1),
+    'email-verifier': ('verifications', 1),
+}
+default_refresh_interval: float = 300.0
+
+
+class CreditLedger(object):
+    """Thread safe ledger of remaining credits, decremented locally and refreshed from 'account' operation."""
+
+    def __init__(self, refresh_interval: float = default_refresh_interval) -> None:
+        """Initialize ledger with unknown balance."""
+        self.refresh_interval: float = refresh_interval
+        self._remaining: dict[str, int] = {}
+        self._spent: dict[str, int] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self) -> bool:
+        """Check balance is unknown or outdated."""
+        with self._lock:
+            refreshed_at: Optional[float] = self._refreshed_at
+        return refreshed_at is None or time.monotonic() - refreshed_at > self.refresh_interval
+
+    def refresh(self, accounts: Iterable[dict]) -> None:
+        """
+        Set balance from 'account' operation data.
+
+        :param accounts: Iterable 'data' of account responses, one per api key. Balances are summed up.
+        """
+        remaining: dict[str, int] = {}
+        for account in accounts:
+            for bucket, counters in account.get('requests', {}).items():
+                available: int = counters.get('available', 0) - counters.get('used', 0)
+                remaining[bucket] = remaining.get(bucket, 0) + max(available, 0)
+        with self._lock:
+            self._remaining = remaining
+            self._refreshed_at = time.monotonic()
+
+    def charge(self, operation: str, count: int = 1) -> None:
+        """Decrement balance after successful operation."""
+        cost: Optional[tuple[str, int]] = operation_costs.get(operation)
+        if cost is None:
+            return
+        bucket, price = cost
+        with self._lock:
+            self._spent[operation] = self._spent.get(operation, 0) + count
+            if bucket in self._remaining:
+                self._remaining[bucket] = max(self._remaining[bucket] - price * count, 0)
+
+    def remaining(self, operation: str) -> Optional[int]:
+        """Get number of operations, which can be performed, None if it is free or balance is unknown."""
+        cost: Optional[tuple[str, int]] = operation_costs.get(operation)
+        if cost is None:
+            return None
+        bucket, price = cost
+        with self._lock:
+            balance: Optional[int] = self._remaining.get(bucket)
+        return None if balance is None else balance // price
+
+    def check_budget(self, operation: str, count: int, strict: bool = True) -> int:
+        """
+        Check remaining balance covers the batch.
+
+        :param operation: str Name of request operation.
+        :param count: int Number of operations in the batch.
+        :param strict: bool Raise ForagerBudgetError if batch can't be covered, otherwise return affordable part.
+        :return: int Number of operations, which can be performed.
+        """
+        remaining: Optional[int] = self.remaining(operation)
+        if remaining is None or remaining >= count:
+            return count
+        if strict:
+            raise ForagerBudgetError(
+                'Remaining budget covers {remaining} of {count} {op} operations.'.format(
+                    remaining=remaining,
+                    count=count,
+                    op=operation,
+                ),
+            )
+        return remaining
+
+    def spent(self) -> dict[str, int]:
+        """Get number of charged operations per operation type."""
+        with self._lock:
+            return dict(self._spent)
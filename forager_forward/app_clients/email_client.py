@@ -1,20 +1,93 @@
 """Email client for wrapping Hunter.io API."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
 from abc import abstractmethod
-from typing import Any, Optional
+from collections import deque
+from concurrent import futures
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+from forager_forward.app_clients.scheduler import request_priority
+from forager_forward.common.common_utilities import (
+    canonicalize_email,
+    create_and_validate_params,
+)
+from forager_forward.common.domain_index import DomainIndex
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerAPIError
+from forager_forward.common.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import httpx
+
+    from forager_forward.app_clients import count_table
+    from forager_forward.common.bloom_filter import BloomFilter
+else:
+    count_table = lazy_import('forager_forward.app_clients.count_table')
 
-import httpx
+sync_operation_methods: dict[str, str] = {
+    'account': 'account',
+    'domain-search': 'domain_search',
+    'email-count': 'email_count',
+    'email-finder': 'email_finder',
+    'email-verifier': 'verify_email',
+}
 
-from forager_forward.common.common_utilities import create_and_validate_params
+
+def split_local_verdicts(
+    emails: Iterable[str],
+    index: DomainIndex,
+    seen: Optional[BloomFilter] = None,
+) -> tuple[dict, dict[str, list[str]]]:
+    """
+    Split emails to ones, having local verdict, and ones, which should be verified by api.
+
+    :param emails: Iterable Emails to verify.
+    :param index: DomainIndex Index with local verdicts.
+    :param seen: BloomFilter Canonical emails, verified earlier, they get {'result': 'seen'} verdict without api call.
+    :return: tuple Results dict by original emails in their order with local verdicts filled in,
+        and original emails grouped by canonical email, which should be verified by api.
+    """
+    results: dict = {}
+    remote: dict[str, list[str]] = {}
+    for email in emails:
+        if email in results:
+            continue
+        try:
+            canonical: str = canonicalize_email(email)
+            create_and_validate_params('email-verifier', email=canonical)
+        except ArgumentValidationError:
+            results[email] = index.verdict(email, 'syntax')
+            continue
+        if seen is not None and canonical in seen:
+            results[email] = {'email': email, 'result': 'seen', 'source': 'seen-set'}
+            continue
+        results[email] = index.lookup(canonical)
+        if results[email] is None:
+            remote.setdefault(canonical, []).append(email)
+    return results, remote
 
 
 class EmailClient(object):
     """Client for performing api calls."""
 
+    domain_index: DomainIndex
+
     def domain_search(
         self,
         domain: Optional[str] = None,
         company: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
         **kwargs: Any,
     ) -> dict | httpx.Response:
         """
@@ -23,6 +96,7 @@ class EmailClient(object):
         :param domain: str The domain on which to search for emails. Must be defined if company is not.
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :param kwargs: Any Can be from the list below:
             - limit: int The maximum number of emails to give back. Default is 10.
             - offset: int The number of emails to skip. Default is 0.
@@ -39,13 +113,37 @@ class EmailClient(object):
         """
         operation: str = 'domain-search'
         param_dict: dict = create_and_validate_params(operation, domain=domain, company=company, **kwargs)
-        return self._perform_request(operation, param_dict=param_dict, raw=raw)
+        return self._perform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    def domain_search_stream(
+        self,
+        domain: Optional[str] = None,
+        company: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Iterator[dict]:
+        """
+        Perform domain_research request, giving email records from streamed response as soon as they are decoded.
+
+        Response body is parsed incrementally, so large pages (limit=100 with full sources) aren't kept in memory.
+        Records of page, cached by response_cache, are given without request.
+
+        :param domain: str The domain on which to search for emails. Must be defined if company is not.
+        :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :param kwargs: Any The same as of domain_search.
+        :return: Iterator Records of 'data.emails' in their order.
+        """
+        operation: str = 'domain-search'
+        param_dict: dict = create_and_validate_params(operation, domain=domain, company=company, **kwargs)
+        return self._stream_request(operation, ('data', 'emails'), param_dict=param_dict, deadline=deadline)
 
     def email_finder(
         self,
         domain: Optional[str] = None,
         company: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
         **kwargs: Any,
     ) -> dict | httpx.Response:
         """
@@ -54,6 +152,7 @@ class EmailClient(object):
         :param domain: str The domain on which to search for emails. Must be defined if company is not.
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :param kwargs: Any Can be from the list below:
             - first_name: str The person's first name. It doesn't need to be in lowercase.
             - last_name: str The person's last name. It doesn't need to be in lowercase.
@@ -71,26 +170,53 @@ class EmailClient(object):
             company=company,
             **kwargs,
         )
-        return self._perform_request(operation, param_dict=param_dict, raw=raw)
+        return self._perform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
 
     def verify_email(
         self,
         email: str,
         raw: bool = False,
+        deadline: Optional[float] = None,
     ) -> dict | httpx.Response:
         """
         Verify the deliverability of an email address.
 
-        :param email: str Email to verify.
+        :param email: str Email to verify, it is sent in canonical form (trimmed, lowercased, IDNA domain).
         :param raw: bool Gives back the entire response instead of just the 'data'.
-        :return: Full payload of the query as a dict.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :return: Full payload of the query as a dict. ForagerVerificationPendingError is raised, if verification
+            is still in progress, VerificationJob polls such emails.
         """
         operation: str = 'email-verifier'
         param_dict: dict = create_and_validate_params(
             operation,
-            email=email,
+            email=canonicalize_email(email),
         )
-        return self._perform_request(operation, param_dict=param_dict, raw=raw)
+        return self._perform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    def verify_emails(self, emails: Iterable[str], seen: Optional[BloomFilter] = None) -> dict[str, dict]:
+        """
+        Verify the deliverability of many email addresses.
+
+        Addresses with a verdict in the local domain index are not sent to api, others are sent with 'bulk' priority.
+
+        :param emails: Iterable Emails to verify.
+        :param seen: BloomFilter Seen-set of canonical emails: seen ones aren't sent to api and get
+            {'result': 'seen'} verdict, verified ones are added.
+        :return: dict Verification data per email, api error payload for failed ones.
+        """
+        results, remote = split_local_verdicts(emails, self.domain_index, seen)
+        self.check_budget('email-verifier', len(remote))
+        with request_priority('bulk'):
+            for canonical, originals in remote.items():
+                try:
+                    email_data: dict | httpx.Response = self.verify_email(canonical)
+                except ForagerAPIError as error:
+                    email_data = error.args[0]
+                else:
+                    _mark_seen(seen, canonical)
+                results.update(dict.fromkeys(originals, email_data))
+        return results
 
     def email_count(
         self,
@@ -98,6 +224,7 @@ class EmailClient(object):
         company: Optional[str] = None,
         email_type: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
     ) -> dict | httpx.Response:
         """
         Count emails for domain or company.
@@ -106,6 +233,7 @@ class EmailClient(object):
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param email_type: str The type of emails to give back. Can be one of 'personal' or 'generic'.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :return: Full payload of the query as a dict.
         """
         operation: str = 'email-count'
@@ -115,7 +243,87 @@ class EmailClient(object):
             company=company,
             type=email_type,
         )
-        return self._perform_request(operation, param_dict=param_dict, raw=raw)
+        return self._perform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    def email_count_many(self, domains: Iterable[str], workers: int = 8) -> count_table.EmailCountTable:
+        """
+        Count emails for many domains concurrently, requests are sent with 'bulk' priority.
+
+        :param domains: Iterable Domains to count emails for.
+        :param workers: int Number of threads, performing requests.
+        :return: EmailCountTable Counts in columns by domain rows, with api error payloads of failed domains.
+        """
+        table = count_table.EmailCountTable(list(domains))
+        with request_priority('bulk'):
+            for row, count_data in enumerate(self.map('email-count', table.domains, workers, return_exceptions=True)):
+                if isinstance(count_data, ForagerAPIError):
+                    table.fail(row, count_data.args[0])
+                elif isinstance(count_data, Exception):
+                    raise count_data
+                else:
+                    table.fill(row, count_data)
+        return table
+
+    def submit(self, operation: str, argument: Any) -> futures.Future:
+        """
+        Perform operation in thread pool of the client, sharing its pooled http client.
+
+        :param operation: str 'domain-search', 'email-finder', 'email-verifier', 'email-count' or 'account'.
+        :param argument: Any Dict of keyword arguments or the first positional argument (domain, email).
+        :return: Future Future of the call result.
+        """
+        return self.executor.submit(
+            contextvars.copy_context().run,
+            _call_operation,
+            self._operation_method(operation),
+            argument,
+        )
+
+    def map(
+        self,
+        operation: str,
+        arguments: Iterable[Any],
+        workers: int = 8,
+        ordered: bool = True,
+        return_exceptions: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Perform operation for every argument in pool of workers threads, sharing pooled http client of the client.
+
+        Not more than two calls per worker are submitted ahead of consumed results, so arguments can be
+        a long stream. Calls, which are not started, are cancelled, if iteration is stopped. Requests over
+        connection limit of the pooled http client wait for free connection.
+
+        :param operation: str 'domain-search', 'email-finder', 'email-verifier', 'email-count' or 'account'.
+        :param arguments: Iterable Dict of keyword arguments or the first positional argument (domain, email) per call.
+        :param workers: int Number of threads of the call, performing operations concurrently.
+        :param ordered: bool Give results in order of arguments, otherwise as soon as they are ready.
+        :param return_exceptions: bool Give errors in place of results of failed calls, otherwise raise the first one.
+        :return: Iterator Results of the calls.
+        """
+        method: Callable = self._operation_method(operation)
+        window: deque[futures.Future] = deque()
+        executor = futures.ThreadPoolExecutor(workers, thread_name_prefix='forager-map')
+        try:
+            for argument in arguments:
+                window.append(executor.submit(contextvars.copy_context().run, _call_operation, method, argument))
+                if len(window) >= workers * 2:
+                    yield from _take_results(window, workers, ordered, return_exceptions)
+            yield from _take_results(window, 0, ordered, return_exceptions)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def account(self, raw: bool = False, deadline: Optional[float] = None) -> dict | httpx.Response:
+        """
+        Get information about the account: plan, used and available requests.
+
+        :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :return: Full payload of the query as a dict.
+        """
+        operation: str = 'account'
+        param_dict: dict = create_and_validate_params(operation)
+        return self._perform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
 
     @abstractmethod
     def _perform_request(
@@ -127,15 +335,74 @@ class EmailClient(object):
     ) -> dict | httpx.Response:
         """Perform http request."""
 
+    @abstractmethod
+    def _stream_request(self, operation: str, path: Sequence[str], method: str = 'get', **kwargs: Any) -> Iterator[Any]:
+        """Perform http request, giving items of JSON array at path of streamed response."""
+
+    @abstractmethod
+    def check_budget(self, operation: str, count: int, strict: bool = True) -> int:
+        """Check remaining credits cover a batch of operations."""
+
+    @property
+    @abstractmethod
+    def executor(self) -> futures.ThreadPoolExecutor:
+        """Get thread pool for sync calls."""
+
+    def _operation_method(self, operation: str) -> Callable:
+        """Get client method of the operation."""
+        if operation not in sync_operation_methods:
+            raise ArgumentValidationError('{op} is not allowed operation'.format(op=operation))
+        return getattr(self, sync_operation_methods[operation])
+
+
+def _call_operation(method: Callable, argument: Any) -> Any:
+    """Call client method with dict of keyword arguments or with the first positional argument."""
+    if isinstance(argument, dict):
+        return method(**argument)
+    return method(argument)
+
+
+def _mark_seen(seen: Optional[BloomFilter], canonical: str) -> None:
+    """Add verified canonical email to seen-set, if it is given."""
+    if seen is not None:
+        seen.add(canonical)
+
+
+def _take_results(
+    window: deque[futures.Future],
+    keep: int,
+    ordered: bool,
+    return_exceptions: bool,
+) -> Iterator[Any]:
+    """Take results of submitted calls till not more than keep calls are left."""
+    while len(window) > keep:
+        if ordered:
+            done: Iterable[futures.Future] = (window.popleft(),)
+        else:
+            done, _ = futures.wait(window, return_when=futures.FIRST_COMPLETED)
+        for future in done:
+            if not ordered:
+                window.remove(future)
+            error: Optional[BaseException] = future.exception()
+            if error is None:
+                yield future.result()
+            elif return_exceptions and isinstance(error, Exception):
+                yield error
+            else:
+                raise error
+
 
 class AsyncEmailClient(object):
     """Client for performing async api calls."""
 
+    domain_index: DomainIndex
+
     async def adomain_search(
         self,
         domain: Optional[str] = None,
         company: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
         **kwargs: Any,
     ) -> dict | httpx.Response:
         """
@@ -144,6 +411,7 @@ class AsyncEmailClient(object):
         :param domain: str The domain on which to search for emails. Must be defined if company is not.
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :param kwargs: Any Can be from the list below:
             - limit: int The maximum number of emails to give back. Default is 10.
             - offset: int The number of emails to skip. Default is 0.
@@ -165,13 +433,34 @@ class AsyncEmailClient(object):
             company=company,
             **kwargs,
         )
-        return await self._aperform_request(operation, param_dict=param_dict, raw=raw)
+        return await self._aperform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    def adomain_search_stream(
+        self,
+        domain: Optional[str] = None,
+        company: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """
+        Perform async domain_research request, giving email records from streamed response, see domain_search_stream.
+
+        :param domain: str The domain on which to search for emails. Must be defined if company is not.
+        :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :param kwargs: Any The same as of domain_search.
+        :return: AsyncIterator Records of 'data.emails' in their order.
+        """
+        operation: str = 'domain-search'
+        param_dict: dict = create_and_validate_params(operation, domain=domain, company=company, **kwargs)
+        return self._astream_request(operation, ('data', 'emails'), param_dict=param_dict, deadline=deadline)
 
     async def aemail_finder(
         self,
         domain: Optional[str] = None,
         company: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
         **kwargs: Any,
     ) -> dict | httpx.Response:
         """
@@ -180,6 +469,7 @@ class AsyncEmailClient(object):
         :param domain: str The domain on which to search for emails. Must be defined if company is not.
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :param kwargs: Any Can be from the list below:
             - first_name: str The person's first name. It doesn't need to be in lowercase.
             - last_name: str The person's last name. It doesn't need to be in lowercase.
@@ -197,26 +487,59 @@ class AsyncEmailClient(object):
             company=company,
             **kwargs,
         )
-        return await self._aperform_request(operation, param_dict=param_dict, raw=raw)
+        return await self._aperform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
 
     async def averify_email(
         self,
         email: str,
         raw: bool = False,
+        deadline: Optional[float] = None,
     ) -> dict | httpx.Response:
         """
         Verify the deliverability of an email address.
 
-        :param email: str Email to verify.
+        :param email: str Email to verify, it is sent in canonical form (trimmed, lowercased, IDNA domain).
         :param raw: bool Gives back the entire response instead of just the 'data'.
-        :return: Full payload of the query as a dict.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :return: Full payload of the query as a dict. ForagerVerificationPendingError is raised, if verification
+            is still in progress, VerificationJob polls such emails.
         """
         operation: str = 'email-verifier'
         param_dict: dict = create_and_validate_params(
             operation,
-            email=email,
+            email=canonicalize_email(email),
         )
-        return await self._aperform_request(operation, param_dict=param_dict, raw=raw)
+        return await self._aperform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    async def averify_emails(
+        self,
+        emails: Iterable[str],
+        concurrency: int = 100,
+        seen: Optional[BloomFilter] = None,
+    ) -> dict[str, dict]:
+        """
+        Verify the deliverability of many email addresses concurrently.
+
+        Addresses with a verdict in the local domain index are not sent to api, others are sent with 'bulk' priority.
+
+        :param emails: Iterable Emails to verify.
+        :param concurrency: int Maximum number of requests in flight, client's adaptive concurrency limiter
+            keeps it lower while api is overloaded.
+        :param seen: BloomFilter Seen-set of canonical emails: seen ones aren't sent to api and get
+            {'result': 'seen'} verdict, verified ones are added.
+        :return: dict Verification data per email, api error payload for failed ones.
+        """
+        results, remote = split_local_verdicts(emails, self.domain_index, seen)
+        await self.acheck_budget('email-verifier', len(remote))
+        semaphore = asyncio.Semaphore(concurrency)
+        with request_priority('bulk'):
+            await asyncio.gather(
+                *(
+                    self._averify_to(results, canonical, originals, semaphore, seen)
+                    for canonical, originals in remote.items()
+                ),
+            )
+        return results
 
     async def aemail_count(
         self,
@@ -224,6 +547,7 @@ class AsyncEmailClient(object):
         company: Optional[str] = None,
         email_type: Optional[str] = None,
         raw: bool = False,
+        deadline: Optional[float] = None,
     ) -> dict | httpx.Response:
         """
         Count emails for domain or company.
@@ -232,6 +556,7 @@ class AsyncEmailClient(object):
         :param company: str The name of the company on which to search for emails. Must be defined if domain is not.
         :param email_type: str The type of emails to give back. Can be one of 'personal' or 'generic'.
         :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
         :return: Full payload of the query as a dict.
         """
         operation: str = 'email-count'
@@ -241,7 +566,33 @@ class AsyncEmailClient(object):
             company=company,
             type=email_type,
         )
-        return await self._aperform_request(operation, param_dict=param_dict, raw=raw)
+        return await self._aperform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
+
+    async def aemail_count_many(self, domains: Iterable[str], concurrency: int = 100) -> count_table.EmailCountTable:
+        """
+        Count emails for many domains concurrently, requests are sent with 'bulk' priority.
+
+        :param domains: Iterable Domains to count emails for.
+        :param concurrency: int Maximum number of requests in flight.
+        :return: EmailCountTable Counts in columns by domain rows, with api error payloads of failed domains.
+        """
+        table = count_table.EmailCountTable(list(domains))
+        rows: Iterator[int] = iter(range(len(table)))
+        with request_priority('bulk'):
+            await asyncio.gather(*(self._acount_rows(table, rows) for _ in range(min(concurrency, len(table)))))
+        return table
+
+    async def aaccount(self, raw: bool = False, deadline: Optional[float] = None) -> dict | httpx.Response:
+        """
+        Get information about the account: plan, used and available requests.
+
+        :param raw: bool Gives back the entire response instead of just the 'data'.
+        :param deadline: float Seconds for the whole call including retries, then ForagerDeadlineError is raised.
+        :return: Full payload of the query as a dict.
+        """
+        operation: str = 'account'
+        param_dict: dict = create_and_validate_params(operation)
+        return await self._aperform_request(operation, param_dict=param_dict, raw=raw, deadline=deadline)
 
     @abstractmethod
     async def _aperform_request(
@@ -252,3 +603,43 @@ class AsyncEmailClient(object):
         **kwargs: Any,
     ) -> dict | httpx.Response:
         """Perform async http request."""
+
+    @abstractmethod
+    def _astream_request(
+        self,
+        operation: str,
+        path: Sequence[str],
+        method: str = 'get',
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Perform async http request, giving items of JSON array at path of streamed response."""
+
+    @abstractmethod
+    async def acheck_budget(self, operation: str, count: int, strict: bool = True) -> int:
+        """Check remaining credits cover a batch of operations."""
+
+    async def _acount_rows(self, table: count_table.EmailCountTable, rows: Iterator[int]) -> None:
+        """Count emails for domains of table rows, taken from shared iterator."""
+        for row in rows:
+            try:
+                table.fill(row, await self.aemail_count(table.domains[row]))  # type: ignore
+            except ForagerAPIError as error:
+                table.fail(row, error.args[0])
+
+    async def _averify_to(
+        self,
+        results: dict,
+        canonical: str,
+        originals: list[str],
+        semaphore: asyncio.Semaphore,
+        seen: Optional[BloomFilter] = None,
+    ) -> None:
+        """Verify canonical email and put verification data to results for all its original forms."""
+        async with semaphore:
+            try:
+                email_data: dict | httpx.Response = await self.averify_email(canonical)
+            except ForagerAPIError as error:
+                email_data = error.args[0]
+            else:
+                _mark_seen(seen, canonical)
+        results.update(dict.fromkeys(originals, email_data))
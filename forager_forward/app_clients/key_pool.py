@@ -0,0 +1,137 @@
+"""Pool of Hunter.io api keys with quota-aware key selection."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from forager_forward.common.exceptions import ArgumentError, ForagerQuotaError
+from forager_forward.common.validators import common_validators
+
+if TYPE_CHECKING:
+    import httpx
+
+remaining_header: str = 'X-RateLimit-Remaining'
+reset_header: str = 'X-RateLimit-Reset'
+quota_status_codes: frozenset[int] = frozenset((429,))
+default_cooldown: float = 60.0
+
+
+class KeyUsage(object):
+    """Usage counters and remaining budget of one api key."""
+
+    def __init__(self) -> None:
+        """Initialize usage counters."""
+        self.requests: int = 0
+        self.errors: int = 0
+        self.remaining: Optional[int] = None
+        self.exhausted_until: float = 0
+
+    def is_available(self, now: float) -> bool:
+        """Check key is not exhausted at the moment."""
+        return self.exhausted_until <= now
+
+    def as_dict(self) -> dict:
+        """Get usage counters as dict."""
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'remaining': self.remaining,
+            'exhausted': self.exhausted_until > time.monotonic(),
+        }
+
+
+class ApiKeyPool(object):
+    """
+    Thread safe pool of api keys, routing each request to the key with the most remaining budget.
+
+    Key, which got 429 response, is skipped till X-RateLimit-Reset seconds pass or for cooldown seconds without
+    the header. When all keys are skipped, acquire raises ForagerQuotaError at once instead of waiting.
+    """
+
+    def __init__(self, api_keys: Iterable[str], cooldown: float = default_cooldown) -> None:
+        """
+        Initialize pool.
+
+        :param api_keys: Iterable Api keys, duplicates are dropped.
+        :param cooldown: float Seconds, key is skipped after 429 response without reset header.
+        """
+        self.api_keys: tuple[str, ...] = tuple(dict.fromkeys(api_keys))
+        if not self.api_keys:
+            raise ArgumentError('At least one api key should be given.')
+        for api_key in self.api_keys:
+            common_validators.validate_str('api_key', api_key)
+        self.cooldown: float = cooldown
+        self._usage: dict[str, KeyUsage] = {api_key: KeyUsage() for api_key in self.api_keys}
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude: Optional[set[str]] = None) -> str:
+        """
+        Choose api key for the next request.
+
+        Keys with unknown budget are preferred over keys with known one, then keys with bigger
+        remaining budget, then less loaded keys.
+
+        :param exclude: set Keys, which should not be used (e.g. already failed for this request).
+        :return: str Api key.
+        """
+        now: float = time.monotonic()
+        with self._lock:
+            candidates: list[tuple[str, KeyUsage]] = [
+                (api_key, usage)
+                for api_key, usage in self._usage.items()
+                if usage.is_available(now) and (exclude is None or api_key not in exclude)
+            ]
+            if not candidates:
+                raise ForagerQuotaError('All api keys have exhausted their quota.')
+            api_key, usage = max(candidates, key=self._priority)
+            usage.requests += 1
+        return api_key
+
+    def record_response(self, api_key: str, response: httpx.Response) -> bool:
+        """
+        Update key budget from response.
+
+        :param api_key: str Key, the request was performed with.
+        :param response: httpx.Response Received response.
+        :return: bool True, if key has exhausted its quota and request should be repeated with another key.
+        """
+        remaining: Optional[int] = _int_header(response, remaining_header)
+        with self._lock:
+            usage: KeyUsage = self._usage[api_key]
+            if remaining is not None:
+                usage.remaining = remaining
+            if response.status_code >= 400:
+                usage.errors += 1
+            if response.status_code not in quota_status_codes:
+                return False
+            reset: Optional[int] = _int_header(response, reset_header)
+            usage.remaining = 0
+            usage.exhausted_until = time.monotonic() + (self.cooldown if reset is None else reset)
+        return True
+
+    def record_error(self, api_key: str) -> None:
+        """Count failed request for the key."""
+        with self._lock:
+            self._usage[api_key].errors += 1
+
+    def usage(self) -> dict[str, dict]:
+        """Get usage counters for every key."""
+        with self._lock:
+            return {api_key: usage.as_dict() for api_key, usage in self._usage.items()}
+
+    def _priority(self, candidate: tuple[str, KeyUsage]) -> tuple[Any, ...]:
+        """Get sort key of the candidate, bigger is better."""
+        usage: KeyUsage = candidate[1]
+        return usage.remaining is None, usage.remaining or 0, -usage.requests
+
+
+def _int_header(response: httpx.Response, header: str) -> Optional[int]:
+    """Get integer header value, if it presents and valid."""
+    header_value: Optional[str] = response.headers.get(header)
+    if header_value is None:
+        return None
+    try:
+        return int(header_value)
+    except ValueError:
+        return None
@@ -0,0 +1,117 @@
+"""Negative cache of api errors, re-raised without network calls."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from forager_forward.common.common_utilities import canonicalize_email
+from forager_forward.common.exceptions import (
+    ForagerAPIError,
+    ForagerQuotaError,
+    ForagerVerificationPendingError,
+)
+
+permanent_status_codes: frozenset[int] = frozenset((400, 404, 410, 422, 451))
+uncached_status_codes: frozenset[int] = frozenset((401, 403, 429))
+uncached_errors: tuple[type[ForagerAPIError], ...] = (ForagerQuotaError, ForagerVerificationPendingError)
+
+
+class NegativeCache(object):
+    """
+    In-memory LRU cache of ForagerAPIError payloads by operation and canonical params.
+
+    Permanent errors (wrong params, not found) are kept for permanent_ttl, transient ones (5xx and errors
+    without status) for shorter transient_ttl. Errors of api keys (401, 403, 429), quota errors and pending
+    verifications aren't cached, as the same request can succeed at once with another key or later.
+    """
+
+    def __init__(self, permanent_ttl: float = 3600, transient_ttl: float = 60, max_entries: int = 10000) -> None:
+        """
+        Initialize cache.
+
+        :param permanent_ttl: float Seconds, permanent error is re-raised for.
+        :param transient_ttl: float Seconds, transient error is re-raised for.
+        :param max_entries: int Maximal number of errors, the least recently used ones are evicted.
+        """
+        self.permanent_ttl: float = permanent_ttl
+        self.transient_ttl: float = transient_ttl
+        self.max_entries: int = max_entries
+        self._errors: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {'hits': 0, 'permanent': 0, 'transient': 0}
+        self._lock = threading.Lock()
+
+    def check(self, operation: str, param_dict: dict) -> None:
+        """
+        Re-raise cached error of request.
+
+        :param operation: str Name of request operation.
+        :param param_dict: dict Request params.
+        :raises ForagerAPIError: Cached error with its original payload.
+        """
+        key: str = negative_key(operation, param_dict)
+        with self._lock:
+            entry: Optional[tuple[float, Any]] = self._errors.get(key)
+            if entry is None:
+                return
+            if entry[0] <= time.monotonic():
+                del self._errors[key]  # noqa: WPS420
+                return
+            self._errors.move_to_end(key)
+            self._counters['hits'] += 1
+        raise ForagerAPIError(entry[1])
+
+    def remember(self, operation: str, param_dict: dict, error: ForagerAPIError) -> bool:
+        """
+        Cache error of request, if it is cacheable.
+
+        :param operation: str Name of request operation.
+        :param param_dict: dict Request params.
+        :param error: ForagerAPIError Raised error.
+        :return: bool True, if error is cached.
+        """
+        status: Optional[int] = error_status(error.args[0] if error.args else None)
+        if isinstance(error, uncached_errors) or status in uncached_status_codes:
+            return False
+        is_permanent: bool = status in permanent_status_codes
+        expires_at: float = time.monotonic() + (self.permanent_ttl if is_permanent else self.transient_ttl)
+        key: str = negative_key(operation, param_dict)
+        with self._lock:
+            self._errors[key] = (expires_at, error.args[0] if error.args else None)
+            self._errors.move_to_end(key)
+            while len(self._errors) > self.max_entries:
+                self._errors.popitem(last=False)
+            self._counters['permanent' if is_permanent else 'transient'] += 1
+        return True
+
+    def clear(self) -> None:
+        """Forget all errors."""
+        with self._lock:
+            self._errors.clear()
+
+    def metrics(self) -> dict:
+        """Get hits, numbers of cached permanent and transient errors and number of entries."""
+        with self._lock:
+            return dict(self._counters, entries=len(self._errors))
+
+
+def error_status(error_data: Any) -> Optional[int]:
+    """Get http status of api error payload: {'errors': [{'id': ..., 'code': 400, ...}]}."""
+    if not isinstance(error_data, dict):
+        return None
+    for error_item in error_data.get('errors') or ():
+        if isinstance(error_item, dict) and isinstance(error_item.get('code'), int):
+            return error_item['code']
+    return None
+
+
+def negative_key(operation: str, param_dict: dict) -> str:
+    """Get key of request by operation and params with canonical domain and email."""
+    canonical_params: dict = dict(param_dict)
+    if isinstance(canonical_params.get('domain'), str):
+        canonical_params['domain'] = canonical_params['domain'].strip().lower()
+    if isinstance(canonical_params.get('email'), str):
+        canonical_params['email'] = canonicalize_email(canonical_params['email'])
+    return json.dumps([operation, canonical_params], sort_keys=True, default=str)
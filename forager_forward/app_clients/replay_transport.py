@@ -0,0 +1,171 @@
+"""Transport, recording api responses to gzip fixture file and replaying them without network."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from forager_forward.common.exceptions import (
+    ArgumentValidationError,
+    ForagerReplayError,
+)
+
+replay_modes: tuple[str, ...] = ('replay', 'record')
+skipped_headers: frozenset[str] = frozenset(('content-encoding', 'content-length', 'transfer-encoding'))
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport for sync and async clients, recording responses or replaying recorded ones.
+
+    Responses are kept by method, path, query params except api_key and request body, so recorded fixture
+    is replayed with any key. In 'record' mode requests are sent by upstream transport and responses are saved
+    to gzip JSON file on save/close. In 'replay' mode no request leaves the process, recorded response is
+    returned after latency seconds, request without recorded response raises ForagerReplayError.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = 'replay',
+        latency: float = 0,
+        upstream: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize transport, loading fixture file, if it exists.
+
+        :param path: str Path to gzip fixture file.
+        :param mode: str 'replay' or 'record'.
+        :param latency: float Seconds, every replayed response is delayed for.
+        :param upstream: Transport for recorded requests, by default HTTP transport of httpx.
+        """
+        if mode not in replay_modes:
+            raise ArgumentValidationError('{mode} is not allowed replay mode'.format(mode=mode))
+        self.path: str = path
+        self.mode: str = mode
+        self.latency: float = latency
+        self.upstream: Optional[Any] = upstream
+        self.stats: dict[str, int] = {'replayed': 0, 'recorded': 0, 'missing': 0}
+        self._responses: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as fixture_file:
+                self._responses = json.load(fixture_file)
+
+    def __len__(self) -> int:
+        """Get number of recorded responses."""
+        return len(self._responses)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Replay or record response of sync request."""
+        if self.mode == 'record':
+            if self.upstream is None:
+                self.upstream = httpx.HTTPTransport()
+            response: httpx.Response = self.upstream.handle_request(request)
+            try:
+                response.read()
+            finally:
+                response.close()
+            return self._record(request, response)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._replay(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Replay or record response of async request."""
+        if self.mode == 'record':
+            return self._record(request, await self._asend(request))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._replay(request)
+
+    def save(self) -> None:
+        """Write recorded responses to fixture file."""
+        with self._lock:
+            fixture_data: str = json.dumps(self._responses, sort_keys=True)
+        temporary_path: str = '{path}.tmp'.format(path=self.path)
+        with gzip.open(temporary_path, 'wt', encoding='utf-8') as fixture_file:
+            fixture_file.write(fixture_data)
+        os.replace(temporary_path, self.path)
+
+    def close(self) -> None:
+        """Save recorded responses and close upstream transport."""
+        if self.mode == 'record':
+            self.save()
+            if isinstance(self.upstream, httpx.BaseTransport):
+                self.upstream.close()
+
+    async def aclose(self) -> None:
+        """Save recorded responses."""
+        if self.mode == 'record':
+            self.save()
+
+    async def _asend(self, request: httpx.Request) -> httpx.Response:
+        """Send async request by upstream transport, HTTP transport of httpx is opened per request by default."""
+        if self.upstream is not None:
+            response: httpx.Response = await self.upstream.handle_async_request(request)
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            return response
+        async with httpx.AsyncHTTPTransport() as transport:
+            response = await transport.handle_async_request(request)
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            return response
+
+    def _record(self, request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        """Keep response of request, return its copy."""
+        response_data: dict = {
+            'status': response.status_code,
+            'headers': [
+                [name, header_value]
+                for name, header_value in response.headers.items()
+                if name.lower() not in skipped_headers
+            ],
+            'body': response.content.decode('utf-8', errors='replace'),
+        }
+        with self._lock:
+            self._responses[request_key(request)] = response_data
+            self.stats['recorded'] += 1
+        return _response(request, response_data)
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        """Get recorded response of request."""
+        key: str = request_key(request)
+        with self._lock:
+            response_data: Optional[dict] = self._responses.get(key)
+            self.stats['missing' if response_data is None else 'replayed'] += 1
+        if response_data is None:
+            raise ForagerReplayError('No recorded response for {key}'.format(key=key))
+        return _response(request, response_data)
+
+
+def request_key(request: httpx.Request) -> str:
+    """Get fixture key of request: method, path, sorted query params except api_key and body."""
+    params: list[tuple[str, str]] = sorted(
+        (name, param_value) for name, param_value in request.url.params.multi_items() if name != 'api_key'
+    )
+    key: str = '{method} {path}?{query}'.format(method=request.method, path=request.url.path, query=urlencode(params))
+    body: bytes = request.content
+    return '{key} {body}'.format(key=key, body=body.decode('utf-8', errors='replace')) if body else key
+
+
+def _response(request: httpx.Request, response_data: dict) -> httpx.Response:
+    """Build response from recorded data."""
+    return httpx.Response(
+        response_data['status'],
+        headers=response_data['headers'],
+        content=response_data['body'].encode(),
+        request=request,
+    )
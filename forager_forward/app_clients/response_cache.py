@@ -0,0 +1,179 @@
+"""Two-tier response cache: in-memory LRU and SQLite file, kept across restarts."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+day: int = 24 * 60 * 60
+cache_ttls: dict[str, float] = {
+    'domain-search': 7 * day,
+    'email-count': day,
+}
+
+
+class ResponseCache(object):
+    """
+    Cache of response data of cacheable operations, in-memory LRU (L1) over SQLite file (L2).
+
+    Entry is fresh for ttl of its operation and stale for stale_ttl after that: stale entry is served at
+    once and should be refreshed by the caller. SQLite file keeps entries across restarts, it is bounded by
+    max_disk_entries and compacted in background thread after every compact_every writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1000,
+        max_disk_entries: int = 100000,
+        stale_ttl: float = day,
+        ttls: Optional[dict[str, float]] = None,
+        compact_every: int = 1000,
+    ) -> None:
+        """
+        Initialize cache.
+
+        :param path: str Path to SQLite file, only in-memory tier is used if it isn't given.
+        :param max_entries: int Maximal number of entries in memory.
+        :param max_disk_entries: int Maximal number of entries in SQLite file.
+        :param stale_ttl: float Seconds, expired entry is served as stale.
+        :param ttls: dict Seconds, entry of operation is fresh, only these operations are cached.
+        :param compact_every: int Number of writes between background compactions.
+        """
+        self.max_entries: int = max_entries
+        self.max_disk_entries: int = max_disk_entries
+        self.stale_ttl: float = stale_ttl
+        self.ttls: dict[str, float] = cache_ttls if ttls is None else ttls
+        self.compact_every: int = compact_every
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'writes': 0, 'compactions': 0}
+        self._compactor: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, data TEXT)',
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)')
+            self._connection.commit()
+
+    def is_cacheable(self, operation: str, method: str, options: dict) -> bool:
+        """Check request of the operation with the options (kwargs of _perform_request) can be cached."""
+        return operation in self.ttls and method == 'get' and options.get('api_key') is None
+
+    def get(self, operation: str, options: dict) -> Optional[tuple[Any, bool]]:
+        """
+        Get cached data of request.
+
+        :param operation: str Name of request operation.
+        :param options: dict Request options, 'param_dict' and 'payload' are the part of the key.
+        :return: tuple Data and True if it is stale, None if there is no usable entry.
+        """
+        key: str = cache_key(operation, options)
+        now: float = time.time()
+        with self._lock:
+            entry: Optional[tuple[float, Any]] = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._connection is not None:
+                row: Optional[tuple] = self._connection.execute(
+                    'SELECT stored_at, data FROM responses WHERE key = ?',
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+            age: float = now - entry[0] if entry is not None else 0
+            if entry is None or age > self.ttls[operation] + self.stale_ttl:
+                self._counters['misses'] += 1
+                return None
+            is_stale: bool = age > self.ttls[operation]
+            self._counters['stale_hits' if is_stale else 'hits'] += 1
+            return entry[1], is_stale
+
+    def set(self, operation: str, options: dict, response_data: Any) -> None:
+        """Save data of request to both tiers."""
+        key: str = cache_key(operation, options)
+        entry: tuple[float, Any] = (time.time(), response_data)
+        with self._lock:
+            self._remember(key, entry)
+            self._counters['writes'] += 1
+            if self._connection is None:
+                return
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, stored_at, data) VALUES (?, ?, ?)',
+                (key, entry[0], json.dumps(response_data)),
+            )
+            self._connection.commit()
+            if self._counters['writes'] % self.compact_every == 0 and self._compactor is None:
+                self._compactor = threading.Thread(target=self._compact_in_background, daemon=True)
+                self._compactor.start()
+
+    def compact(self) -> int:
+        """
+        Delete entries, which can't be served even as stale, and the oldest ones above max_disk_entries.
+
+        :return: int Number of deleted entries.
+        """
+        if self._connection is None:
+            return 0
+        oldest_usable: float = time.time() - max(self.ttls.values(), default=0) - self.stale_ttl
+        with self._lock:
+            deleted: int = self._connection.execute(
+                'DELETE FROM responses WHERE stored_at < ?',
+                (oldest_usable,),
+            ).rowcount
+            deleted += self._connection.execute(
+                'DELETE FROM responses WHERE key IN '
+                + '(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_disk_entries,),
+            ).rowcount
+            self._connection.commit()
+            self._counters['compactions'] += 1
+        return deleted
+
+    def metrics(self) -> dict:
+        """Get hits, stale hits, misses, writes, compactions and number of entries per tier."""
+        with self._lock:
+            disk_entries: int = 0
+            if self._connection is not None:
+                disk_entries = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return dict(self._counters, memory_entries=len(self._memory), disk_entries=disk_entries)
+
+    def close(self) -> None:
+        """Close SQLite file."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key: str, entry: tuple[float, Any]) -> None:
+        """Put entry to in-memory tier, evicting the least recently used ones, lock should be held."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _compact_in_background(self) -> None:
+        """Compact SQLite file in background thread."""
+        try:
+            self.compact()
+        finally:
+            with self._lock:
+                self._compactor = None
+
+
+def cache_key(operation: str, options: dict) -> str:
+    """Get cache key of request by operation, params and payload, api key and deadline are not the part of it."""
+    key_data: str = json.dumps(
+        [operation, options.get('param_dict', {}), options.get('payload')],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key_data.encode()).hexdigest()
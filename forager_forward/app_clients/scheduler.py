@@ -0,0 +1,202 @@
+"""Priority request scheduler sharing api rate budget between interactive and bulk traffic."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from forager_forward.common.exceptions import ArgumentValidationError
+
+priority_weights: dict[str, float] = {'interactive': 8, 'normal': 4, 'bulk': 1}
+current_priority: ContextVar[str] = ContextVar('forager_priority', default='normal')
+default_rate_per_key: float = 15.0
+
+
+@contextmanager
+def request_priority(priority_class: str) -> Iterator[None]:
+    """
+    Set priority class of requests performed in the context (thread or asyncio task).
+
+    :param priority_class: str One of 'interactive', 'normal' (default) or 'bulk'.
+    """
+    if priority_class not in priority_weights:
+        raise ArgumentValidationError('{name} is not allowed priority class'.format(name=priority_class))
+    token = current_priority.set(priority_class)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class _Waiter(object):
+    """Request waiting for rate budget."""
+
+    def __init__(self, tag: float, sequence: int, priority_class: str) -> None:
+        """Initialize waiter."""
+        self.tag: float = tag
+        self.sequence: int = sequence
+        self.priority_class: str = priority_class
+        self.enqueued_at: float = time.monotonic()
+        self.event: Optional[threading.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional[asyncio.Future] = None
+
+    def __lt__(self, other: _Waiter) -> bool:
+        """Compare waiters by virtual finish tag."""
+        return (self.tag, self.sequence) < (other.tag, other.sequence)
+
+    def wake(self) -> None:
+        """Wake waiting thread or task."""
+        if self.event is not None:
+            self.event.set()
+        elif self.loop is not None and self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+class RequestScheduler(object):
+    """
+    Token bucket of api rate budget with weighted fair queuing between priority classes.
+
+    Waiting requests are served in the order of virtual finish tags, each class advances its tag by 1 / weight
+    per request, so under contention classes share the rate in proportion to their weights and an interactive
+    request waits only for requests already granted, not for the whole bulk queue.
+    """
+
+    def __init__(self, rate: float = default_rate_per_key, burst: Optional[float] = None) -> None:
+        """
+        Initialize scheduler.
+
+        :param rate: float Requests per second.
+        :param burst: float Bucket size, rate by default.
+        """
+        self.rate: float = rate
+        self.burst: float = rate if burst is None else burst
+        self._tokens: float = self.burst
+        self._refilled_at: float = time.monotonic()
+        self._virtual_time: float = 0
+        self._last_tags: dict[str, float] = {}
+        self._queue: list[_Waiter] = []
+        self._sequence: Iterator[int] = itertools.count()
+        self._stats: dict[str, dict] = {
+            name: {'served': 0, 'wait_total': 0.0, 'wait_max': 0.0} for name in priority_weights
+        }
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait for rate budget in the current priority class, blocking the thread."""
+        waiter: Optional[_Waiter] = self._enqueue(current_priority.get())
+        if waiter is None:
+            return
+        waiter.event = threading.Event()
+        while True:
+            with self._lock:
+                delay: Optional[float] = self._try_serve(waiter)
+                if delay is not None and delay <= 0:
+                    return
+                waiter.event.clear()
+            waiter.event.wait(delay)
+
+    async def aacquire(self) -> None:
+        """Wait for rate budget in the current priority class."""
+        waiter: Optional[_Waiter] = self._enqueue(current_priority.get())
+        if waiter is None:
+            return
+        waiter.loop = asyncio.get_running_loop()
+        try:
+            while True:
+                with self._lock:
+                    delay: Optional[float] = self._try_serve(waiter)
+                    if delay is not None and delay <= 0:
+                        return
+                    waiter.future = waiter.loop.create_future()
+                try:
+                    await asyncio.wait_for(waiter.future, delay)
+                except asyncio.TimeoutError:
+                    continue
+        except asyncio.CancelledError:
+            self._cancel(waiter)
+            raise
+
+    def metrics(self) -> dict[str, dict]:
+        """Get queue depth, served requests, average and maximal wait time per priority class."""
+        with self._lock:
+            depths: dict[str, int] = dict.fromkeys(priority_weights, 0)
+            for waiter in self._queue:
+                depths[waiter.priority_class] += 1
+            return {
+                name: {
+                    'queued': depths[name],
+                    'served': stats['served'],
+                    'wait_avg': stats['wait_total'] / stats['served'] if stats['served'] else 0.0,
+                    'wait_max': stats['wait_max'],
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def _enqueue(self, priority_class: str) -> Optional[_Waiter]:
+        """Take token at once if nobody waits, otherwise put waiter to the queue."""
+        with self._lock:
+            self._refill()
+            tag: float = max(self._virtual_time, self._last_tags.get(priority_class, 0))
+            tag += 1 / priority_weights[priority_class]
+            self._last_tags[priority_class] = tag
+            waiter = _Waiter(tag, next(self._sequence), priority_class)
+            if not self._queue and self._tokens >= 1:
+                self._serve(waiter)
+                return None
+            heapq.heappush(self._queue, waiter)
+            return waiter
+
+    def _try_serve(self, waiter: _Waiter) -> Optional[float]:
+        """
+        Serve waiter if it is the first in the queue and there is a token, lock should be held.
+
+        :return: float 0 if waiter is served, time till the next token for the first waiter, None for the others.
+        """
+        self._refill()
+        if self._queue[0] is not waiter:
+            return None
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        heapq.heappop(self._queue)
+        self._serve(waiter)
+        if self._queue:
+            self._queue[0].wake()
+        return 0
+
+    def _serve(self, waiter: _Waiter) -> None:
+        """Take token for waiter and update statistics, lock should be held."""
+        self._tokens -= 1
+        self._virtual_time = waiter.tag
+        wait_time: float = time.monotonic() - waiter.enqueued_at
+        stats: dict = self._stats[waiter.priority_class]
+        stats['served'] += 1
+        stats['wait_total'] += wait_time
+        stats['wait_max'] = max(stats['wait_max'], wait_time)
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        """Remove cancelled waiter from the queue."""
+        with self._lock:
+            if waiter not in self._queue:
+                return
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+            if self._queue:
+                self._queue[0].wake()
+
+    def _refill(self) -> None:
+        """Add tokens for the elapsed time, lock should be held."""
+        now: float = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._refilled_at) * self.rate, self.burst)
+        self._refilled_at = now
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Resolve future, if it isn't done."""
+    if not future.done():
+        future.set_result(None)
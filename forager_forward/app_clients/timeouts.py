@@ -0,0 +1,80 @@
+"""Per-operation timeouts and latency tracking for hedged requests."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from forager_forward.common.exceptions import ForagerDeadlineError
+
+operation_timeouts: dict[str, float] = {
+    'account': 5.0,
+    'domain-search': 15.0,
+    'email-count': 3.0,
+    'email-verifier': 30.0,
+}
+default_timeout: float = 30.0
+default_max_duration: int = 10
+max_duration_margin: float = 5.0
+hedge_percentile: float = 0.95
+hedge_min_samples: int = 20
+latency_window: int = 200
+
+
+def operation_timeout(operation: str, param_dict: dict) -> float:
+    """
+    Get request timeout of the operation.
+
+    :param operation: str Name of request operation.
+    :param param_dict: dict Request params, 'email-finder' timeout is derived from its 'max_duration'.
+    :return: float Timeout in seconds.
+    """
+    if operation == 'email-finder':
+        return param_dict.get('max_duration', default_max_duration) + max_duration_margin
+    return operation_timeouts.get(operation, default_timeout)
+
+
+def remaining_time(deadline_at: Optional[float]) -> Optional[float]:
+    """
+    Get time left till monotonic deadline.
+
+    :param deadline_at: float Deadline as time.monotonic() value, None for call without deadline.
+    :return: float Seconds left or None if there is no deadline.
+    """
+    if deadline_at is None:
+        return None
+    time_left: float = deadline_at - time.monotonic()
+    if time_left <= 0:
+        raise ForagerDeadlineError('Deadline exceeded.')
+    return time_left
+
+
+class LatencyTracker(object):
+    """Thread safe sliding window of request latencies per operation."""
+
+    def __init__(self, window: int = latency_window) -> None:
+        """Initialize tracker."""
+        self.window: int = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, latency: float) -> None:
+        """Record latency of successful request."""
+        with self._lock:
+            self._latencies.setdefault(operation, deque(maxlen=self.window)).append(latency)
+
+    def percentile(self, operation: str, fraction: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get latency percentile of the operation.
+
+        :param operation: str Name of request operation.
+        :param fraction: float Percentile as a fraction, e.g. 0.95.
+        :param min_samples: int Minimal number of recorded latencies.
+        :return: float Latency or None if there are not enough samples.
+        """
+        with self._lock:
+            latencies: list[float] = sorted(self._latencies.get(operation, ()))
+        if not latencies or len(latencies) < min_samples:
+            return None
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
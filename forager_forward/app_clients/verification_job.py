@@ -0,0 +1,217 @@
+"""Background verification of many emails, polling ones, which verification is still in progress."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import math
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+import httpx
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.email_client import split_local_verdicts
+from forager_forward.app_clients.scheduler import request_priority
+from forager_forward.common.exceptions import (
+    ForagerAPIError,
+    ForagerError,
+    ForagerVerificationPendingError,
+)
+
+poll_backoff: float = 2.0
+
+
+class TimerWheel(object):
+    """Hashed timer wheel: items are put to slots by due tick, one slot is taken per tick."""
+
+    def __init__(self, tick: float = 0.5, slots: int = 256) -> None:
+        """
+        Initialize empty wheel.
+
+        :param tick: float Wheel resolution in seconds.
+        :param slots: int Number of slots, longer delays take several rounds.
+        """
+        self.tick: float = tick
+        self.slots: int = slots
+        self._wheel: list[list[tuple[int, Any]]] = [[] for _ in range(slots)]
+        self._current: int = 0
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        """Get number of scheduled items."""
+        return self._size
+
+    def schedule(self, item: Any, delay: float) -> None:
+        """Schedule item to be due after delay seconds, rounded up to whole ticks."""
+        ticks: int = max(math.ceil(delay / self.tick), 1)
+        slot: int = (self._current + ticks) % self.slots
+        self._wheel[slot].append(((ticks - 1) // self.slots, item))
+        self._size += 1
+
+    def advance(self) -> list:
+        """Move the wheel by one tick and get items, which are due."""
+        self._current = (self._current + 1) % self.slots
+        due: list = []
+        waiting: list[tuple[int, Any]] = []
+        for rounds, item in self._wheel[self._current]:
+            if rounds:
+                waiting.append((rounds - 1, item))
+            else:
+                due.append(item)
+        self._wheel[self._current] = waiting
+        self._size -= len(due)
+        return due
+
+
+class VerificationJob(object):
+    """
+    Verify many emails in background, polling ones, answered with 202 (verification is in progress).
+
+    Emails are submitted concurrently with 'bulk' priority, local verdicts of the domain index are completed
+    at once. Pending email is polled again on timer wheel with exponential backoff from initial_delay up to
+    max_delay, till it is completed or max_attempts are made, then the last pending payload is its result.
+    Completed results are given to callback and to async iterator over the job as (email, data) pairs.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        emails: Iterable[str],
+        callback: Optional[Callable[[str, dict], Any]] = None,
+        concurrency: int = 100,
+        initial_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_attempts: int = 10,
+        tick: float = 0.5,
+    ) -> None:
+        """
+        Initialize job.
+
+        :param client: Client Client to perform requests with.
+        :param emails: Iterable Emails to verify.
+        :param callback: Callable Function or coroutine function, called with email and its data on completion.
+        :param concurrency: int Maximum number of requests in flight.
+        :param initial_delay: float Delay before the first poll of pending email.
+        :param max_delay: float Maximal delay between polls.
+        :param max_attempts: int Maximal number of requests per email.
+        :param tick: float Resolution of polling schedule.
+        """
+        self.client: Client = client
+        self.callback: Optional[Callable[[str, dict], Any]] = callback
+        self.initial_delay: float = initial_delay
+        self.max_delay: float = max_delay
+        self.max_attempts: int = max_attempts
+        self.results, self._remote = split_local_verdicts(emails, client.domain_index)
+        self._attempts: dict[str, int] = dict.fromkeys(self._remote, 0)
+        self._wheel: TimerWheel = TimerWheel(tick)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._completed: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Get number of emails without result yet."""
+        return sum(1 for email_data in self.results.values() if email_data is None)
+
+    def start(self) -> asyncio.Task:
+        """Start job in background, if it isn't started yet, and get its task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def wait(self) -> dict[str, dict]:
+        """
+        Wait for all emails to be completed.
+
+        :return: dict Verification data per email, api error payload for failed ones.
+        """
+        await self.start()
+        return self.results
+
+    def cancel(self) -> None:
+        """Stop verification and polling."""
+        if self._task is not None:
+            self._task.cancel()
+
+    def __aiter__(self) -> AsyncIterator[tuple[str, dict]]:
+        """Iterate over (email, data) pairs as they are completed, starting the job."""
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[tuple[str, dict]]:
+        """Get completed results till the job is finished, raise its error if it has failed."""
+        task: asyncio.Task = self.start()
+        while True:
+            completed: Optional[tuple[str, dict]] = await self._completed.get()
+            if completed is None:
+                task.result()
+                return
+            yield completed
+
+    async def _run(self) -> None:
+        """Submit emails, then poll pending ones, when they are due."""
+        in_flight: set[asyncio.Task] = set()
+        try:
+            for email, email_data in self.results.items():
+                if email_data is not None:
+                    await self._complete([email], email_data)
+            await self.client.acheck_budget('email-verifier', len(self._remote))
+            with request_priority('bulk'):
+                in_flight.update(asyncio.create_task(self._verify(canonical)) for canonical in self._remote)
+                ticked_at: float = time.monotonic()
+                while in_flight or len(self._wheel):
+                    in_flight = await self._wait_tick(in_flight)
+                    while time.monotonic() - ticked_at >= self._wheel.tick:
+                        ticked_at += self._wheel.tick
+                        in_flight.update(asyncio.create_task(self._verify(email)) for email in self._wheel.advance())
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self._completed.put_nowait(None)
+
+    async def _wait_tick(self, in_flight: set[asyncio.Task]) -> set[asyncio.Task]:
+        """Wait for one tick, raise error of failed request, return requests still in flight."""
+        if not in_flight:
+            await asyncio.sleep(self._wheel.tick)
+            return in_flight
+        done, in_flight = await asyncio.wait(in_flight, timeout=self._wheel.tick)
+        for task in done:
+            task.result()
+        return in_flight
+
+    async def _verify(self, canonical: str) -> None:
+        """Verify canonical email, scheduling next poll if verification is in progress."""
+        self._attempts[canonical] += 1
+        async with self._semaphore:
+            try:
+                response_data: dict | httpx.Response = await self.client.averify_email(canonical)
+            except ForagerVerificationPendingError as error:
+                if self._attempts[canonical] < self.max_attempts:
+                    self._wheel.schedule(canonical, self._delay(self._attempts[canonical]))
+                    return
+                email_data: dict = error.args[0]
+            except ForagerAPIError as error:
+                email_data = error.args[0]
+            except (ForagerError, httpx.HTTPError) as error:
+                email_data = failure_data(error)
+            else:
+                email_data = response_data if isinstance(response_data, dict) else response_data.json()
+        await self._complete(self._remote[canonical], email_data)
+
+    async def _complete(self, originals: list[str], email_data: dict) -> None:
+        """Store result for original emails and deliver it to callback and iterator."""
+        for email in originals:
+            self.results[email] = email_data
+            self._completed.put_nowait((email, email_data))
+            if self.callback is not None:
+                callback_result: Any = self.callback(email, email_data)
+                if inspect.isawaitable(callback_result):
+                    await callback_result
+
+    def _delay(self, attempt: int) -> float:
+        """Get delay before the next poll after given number of attempts."""
+        return min(self.initial_delay * poll_backoff ** (attempt - 1), self.max_delay)
+
+
+def failure_data(error: Exception) -> dict:
+    """Get payload in api error format for request failed without api error."""
+    return {'errors': [{'id': type(error).__name__, 'details': str(error) or repr(error)}]}
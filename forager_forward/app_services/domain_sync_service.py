@@ -0,0 +1,174 @@
+"""Service for incremental sync of domain_search results, using email_count as change detector."""
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Iterable, Iterator, Optional
+
+import httpx
+
+from forager_forward.app_clients.client import Client
+from forager_forward.common.exceptions import ForagerAPIError
+from forager_forward.common.storage import Storage
+
+
+class DomainSyncService(object):
+    """
+    Keep domain_search results of domains in Storage up to date, producing diffs of their emails.
+
+    email_count of a domain is requested first, the domain is skipped if its counts haven't changed since
+    the previous sync. Otherwise number of domain_search pages is taken from email_count total, so no request
+    is spent on empty trailing page, and async pages are fetched concurrently. Replacement of emails, which
+    keeps all counts the same, isn't detected, so domains should be refreshed with force from time to time.
+    """
+
+    _storage: Storage = Storage()
+
+    def __init__(self, client: Client, page_size: int = 100) -> None:
+        """
+        Initialize service.
+
+        :param client: Client Client to perform requests with.
+        :param page_size: int domain_search limit per page.
+        """
+        self.client: Client = client
+        self.page_size: int = page_size
+        self.stats: dict[str, int] = {'checked': 0, 'skipped': 0, 'changed': 0, 'pages': 0, 'failed': 0}
+
+    def refresh_domain(self, domain: str, force: bool = False) -> dict:
+        """
+        Sync emails of the domain.
+
+        :param domain: str Domain to sync.
+        :param force: bool Fetch domain_search pages even if email counts haven't changed.
+        :return: dict Diff with 'domain', 'changed' flag and sorted 'added' and 'removed' emails.
+        """
+        domain_record: Optional[dict] = self.read_domain(domain)
+        count_data: dict = self.client.email_count(domain=domain)  # type: ignore
+        if not (force or self._is_changed(domain_record, count_data)):
+            return _diff(domain, None)
+        emails: dict[str, dict] = {}
+        for offset in self._offsets(count_data):
+            page: list[dict] = self._page_emails(self.client.domain_search(domain=domain, **self._page(offset)))
+            emails.update(_emails_by_value(page))
+            if len(page) < self.page_size:
+                break
+        return self._save(domain, domain_record, count_data, emails)
+
+    def refresh_domains(self, domains: Iterable[str]) -> Iterator[dict]:
+        """
+        Sync emails of many domains one by one.
+
+        :param domains: Iterable Domains to sync.
+        :return: Iterator Diffs, see refresh_domain, with api error payload as 'error' for failed domains.
+        """
+        for domain in domains:
+            try:
+                yield self.refresh_domain(domain)
+            except ForagerAPIError as error:
+                self.stats['failed'] += 1
+                yield {'domain': domain, 'error': error.args[0]}
+
+    async def arefresh_domain(self, domain: str, force: bool = False) -> dict:
+        """
+        Sync emails of the domain, fetching domain_search pages concurrently.
+
+        :param domain: str Domain to sync.
+        :param force: bool Fetch domain_search pages even if email counts haven't changed.
+        :return: dict Diff with 'domain', 'changed' flag and sorted 'added' and 'removed' emails.
+        """
+        domain_record: Optional[dict] = self.read_domain(domain)
+        count_data: dict = await self.client.aemail_count(domain=domain)  # type: ignore
+        if not (force or self._is_changed(domain_record, count_data)):
+            return _diff(domain, None)
+        pages: list = await asyncio.gather(
+            *(self.client.adomain_search(domain=domain, **self._page(offset)) for offset in self._offsets(count_data)),
+        )
+        emails: dict[str, dict] = {}
+        for page in pages:
+            emails.update(_emails_by_value(self._page_emails(page)))
+        return self._save(domain, domain_record, count_data, emails)
+
+    async def arefresh_domains(self, domains: Iterable[str], concurrency: int = 10) -> list[dict]:
+        """
+        Sync emails of many domains concurrently.
+
+        :param domains: Iterable Domains to sync.
+        :param concurrency: int Maximum number of domains synced at once.
+        :return: list Diffs in order of domains, see refresh_domains.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        return list(await asyncio.gather(*(self._arefresh_one(domain, semaphore) for domain in domains)))
+
+    def read_domain(self, domain: str) -> Optional[dict]:
+        """
+        Read domain record of the previous sync.
+
+        :param domain: str Synced domain.
+        :return: dict Record with 'count' data and 'emails' data by email or None.
+        """
+        return self._storage.read(_domain_key(domain))
+
+    async def _arefresh_one(self, domain: str, semaphore: asyncio.Semaphore) -> dict:
+        """Sync domain within concurrency limit, return error payload if it has failed."""
+        async with semaphore:
+            try:
+                return await self.arefresh_domain(domain)
+            except ForagerAPIError as error:
+                self.stats['failed'] += 1
+                return {'domain': domain, 'error': error.args[0]}
+
+    def _is_changed(self, domain_record: Optional[dict], count_data: dict) -> bool:
+        """Check email counts of the domain have changed since the previous sync."""
+        self.stats['checked'] += 1
+        if domain_record is not None and domain_record['count'] == count_data:
+            self.stats['skipped'] += 1
+            return False
+        return True
+
+    def _offsets(self, count_data: dict) -> range:
+        """Get offsets of domain_search pages, needed for total number of emails."""
+        return range(0, math.ceil(count_data.get('total', 0) / self.page_size) * self.page_size, self.page_size)
+
+    def _page(self, offset: int) -> dict:
+        """Get domain_search pagination arguments."""
+        self.stats['pages'] += 1
+        return {'limit': self.page_size, 'offset': offset}
+
+    def _page_emails(self, domain_data: dict | httpx.Response) -> list[dict]:
+        """Get emails of domain_search page."""
+        return domain_data.get('emails') or []  # type: ignore
+
+    def _save(self, domain: str, domain_record: Optional[dict], count_data: dict, emails: dict[str, dict]) -> dict:
+        """Save domain record and get diff with the previous one."""
+        self.stats['changed'] += 1
+        new_record: dict = {'count': count_data, 'emails': emails}
+        if domain_record is None:
+            self._storage.create(_domain_key(domain), new_record)
+        else:
+            self._storage.update(_domain_key(domain), new_record)
+        previous_emails: dict[str, dict] = {} if domain_record is None else domain_record['emails']
+        return _diff(domain, (previous_emails, emails))
+
+
+def _emails_by_value(emails: list[dict]) -> dict[str, dict]:
+    """Get email data by lowercased email address."""
+    return {email_data['value'].lower(): email_data for email_data in emails if email_data.get('value')}
+
+
+def _diff(domain: str, emails: Optional[tuple[dict, dict]]) -> dict:
+    """Get diff of previous and new emails, None for unchanged domain."""
+    if emails is None:
+        return {'domain': domain, 'changed': False, 'added': [], 'removed': []}
+    previous_emails, new_emails = emails
+    return {
+        'domain': domain,
+        'changed': True,
+        'added': sorted(new_emails.keys() - previous_emails.keys()),
+        'removed': sorted(previous_emails.keys() - new_emails.keys()),
+    }
+
+
+def _domain_key(domain: str) -> str:
+    """Get storage key of domain record."""
+    return 'domain_sync:{domain}'.format(domain=domain.strip().lower())
@@ -1,40 +1,113 @@
 """Service for email validation with result saving to storage."""
 from typing import Optional
 
-from forager_forward.common.exceptions import ArgumentValidationError
+from forager_forward.common.bloom_filter import BloomFilter
+from forager_forward.common.common_utilities import canonicalize_email
+from forager_forward.common.domain_index import DomainIndex, domain_index
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerKeyError
 from forager_forward.common.storage import Storage
 from forager_forward.common.validators import validators
 
 
 class EmailValidationService(object):
-    """Class email validation and crud result."""
+    """
+    Class email validation and crud result.
+
+    For bulk imports seen-set can be used as the only dedupe store: without store_records results are returned,
+    but new emails aren't saved as Storage keys, emails in seen-set, which have no stored record, are duplicates.
+    """
 
     _storage: Storage = Storage()
+    _domain_index: DomainIndex = domain_index
+    _provider_rules: bool = False
+    _seen_set: Optional[BloomFilter] = None
+    _store_records: bool = True
+
+    def __init__(self, seen_set: Optional[BloomFilter] = None, store_records: bool = True) -> None:
+        """
+        Initialize service.
+
+        :param seen_set: BloomFilter Canonical emails with records, Storage isn't read for emails, which aren't in it.
+        :param store_records: bool Save records to Storage, without it seen-set is required and dedupes emails alone.
+        :raises ArgumentValidationError: Records aren't stored and seen-set isn't given.
+        """
+        if seen_set is not None:
+            self._seen_set = seen_set
+        if not store_records:
+            if seen_set is None:
+                raise ArgumentValidationError('Seen-set should be given, if records are not stored')
+            self._store_records = False
 
     def create_email_record(self, email: str) -> Optional[bool]:
         """
         Create email record in storage.
 
+        Records are stored by canonical email, so different forms of one address are validated once.
+        Emails on blocked or disposable domains from the local domain index are stored as not valid.
+        With seen-set stored record is read only for emails in it, new emails are checked by Storage.create only.
+        Without store_records new emails are only added to seen-set.
+
         :param email: str Email to create record.
-        :return: bool True, if operation was successfull, otherwise False..
+        :return: bool True, if operation was successfull, otherwise False, None for duplicate without stored record.
         """
+        canonical: str = canonicalize_email(email, provider_rules=self._provider_rules)
+        if self._seen_set is None or canonical in self._seen_set:
+            email_record: Optional[dict] = self._storage.read(canonical)
+            if email_record is not None:
+                return email_record['is_valid']
+            if not self._store_records:
+                return None
         try:
             for validator in validators['email']:
-                validator('email', email)
+                validator('email', canonical)
         except ArgumentValidationError:
-            self._storage.create(email, some_data=False)
-            return False
-        self._storage.create(email, some_data=True)
-        return True
+            is_valid: bool = False
+        else:
+            verdict: Optional[dict] = self._domain_index.lookup(canonical)
+            is_valid = verdict is None or verdict['result'] != 'undeliverable'
+        if self._seen_set is not None:
+            self._seen_set.add(canonical)
+        if not self._store_records:
+            return is_valid
+        try:
+            self._storage.create(canonical, some_data={'email': email, 'canonical': canonical, 'is_valid': is_valid})
+        except ForagerKeyError:
+            return self._storage.read(canonical)['is_valid']
+        return is_valid
+
+    def save_verification_record(self, email: str, verification: dict) -> dict:
+        """
+        Create or update email record with api verification result.
+
+        :param email: str Verified email.
+        :param verification: dict verify_email data, email is valid unless its result is 'undeliverable'.
+        :return: dict Saved email record, without store_records it is only returned.
+        """
+        canonical: str = canonicalize_email(email, provider_rules=self._provider_rules)
+        email_record: dict = {
+            'email': email,
+            'canonical': canonical,
+            'is_valid': verification.get('result') != 'undeliverable',
+            'verification': verification,
+        }
+        if self._seen_set is not None:
+            self._seen_set.add(canonical)
+        if not self._store_records:
+            return email_record
+        if self._storage.read(canonical) is None:
+            self._storage.create(canonical, some_data=email_record)
+        else:
+            self._storage.update(canonical, some_data=email_record)
+        return email_record
 
     def read_email_record(self, email: str) -> Optional[dict]:
         """
         Read email record from storage.
 
-        :param email: str Email to retrieve info.
-        :return: dict Email validation info or None.
+        :param email: str Email to retrieve info, any form of the address.
+        :return: dict Email validation info with originally given email or None.
         """
-        return self._storage.read(email)
+        return self._storage.read(canonicalize_email(email, provider_rules=self._provider_rules))
 
     def delete_email_record(self, email: str) -> None:
         """
@@ -43,4 +116,4 @@ class EmailValidationService(object):
         :param email: str Email to delete.
         :return: None
         """
-        self._storage.delete(email)
+        self._storage.delete(canonicalize_email(email, provider_rules=self._provider_rules))
@@ -0,0 +1,240 @@
+"""Service for streaming enrichment of CSV/JSONL files with checkpoint journal."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+from typing import IO, Any, Iterator, Optional
+
+import httpx
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.scheduler import request_priority
+from forager_forward.common.exceptions import (
+    ArgumentValidationError,
+    ForagerAPIError,
+    ForagerBudgetError,
+    ForagerCircuitOpenError,
+    ForagerDeadlineError,
+    ForagerQuotaError,
+    ForagerVerificationPendingError,
+)
+from forager_forward.common.validators import operation_arguments
+
+operation_methods: dict[str, str] = {
+    'domain-search': 'adomain_search',
+    'email-finder': 'aemail_finder',
+    'email-verifier': 'averify_email',
+}
+int_fields: frozenset[str] = frozenset(('limit', 'offset', 'max_duration'))
+retry_errors: tuple[type[Exception], ...] = (
+    httpx.HTTPError,
+    ForagerBudgetError,
+    ForagerCircuitOpenError,
+    ForagerDeadlineError,
+    ForagerQuotaError,
+    ForagerVerificationPendingError,
+)
+tail_block_size: int = 65536
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """
+    Read rows from CSV or JSONL (.jsonl, .ndjson) file one by one.
+
+    :param path: str Path to the file.
+    :return: Iterator Rows as dicts.
+    """
+    with open(path, encoding='utf-8', newline='') as input_file:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line in input_file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(input_file)
+
+
+def row_arguments(operation: str, row: dict) -> dict:
+    """
+    Get operation arguments from row, skipping unknown columns and empty values.
+
+    :param operation: str Name of request operation.
+    :param row: dict Input row.
+    :return: dict Keyword arguments for the client method.
+    """
+    arguments: dict = {}
+    for key in operation_arguments[operation]:
+        row_value: Any = row.get(key)
+        if row_value is None or row_value == '':
+            continue
+        if key in int_fields and isinstance(row_value, str):
+            try:
+                row_value = int(row_value)
+            except ValueError:
+                raise ArgumentValidationError('{key} has wrong type.'.format(key=key))
+        arguments[key] = row_value
+    if operation == 'email-verifier' and 'email' not in arguments:
+        raise ArgumentValidationError('For email-verifier operation should be defined email')
+    return arguments
+
+
+class CheckpointJournal(object):
+    """Append-only journal of processed row numbers."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize journal, loading already processed rows."""
+        self.path: str = path
+        self._low: int = 0
+        self._ahead: set[int] = set()
+        if os.path.exists(path):
+            truncate_torn_line(path)
+            with open(path, encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    if line.strip():
+                        self._mark(int(line))
+        self._file: Optional[IO[str]] = None
+
+    def is_done(self, row_number: int) -> bool:
+        """Check row was processed in earlier run."""
+        return row_number < self._low or row_number in self._ahead
+
+    def record(self, row_number: int) -> None:
+        """Record row as processed."""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')  # noqa: WPS515
+        self._file.write('{row}\n'.format(row=row_number))
+        self._file.flush()
+        self._mark(row_number)
+
+    def close(self) -> None:
+        """Close journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _mark(self, row_number: int) -> None:
+        """Mark row as processed, keeping only rows above contiguous processed prefix in memory."""
+        self._ahead.add(row_number)
+        while self._low in self._ahead:
+            self._ahead.remove(self._low)
+            self._low += 1
+
+
+def truncate_torn_line(path: str) -> Optional[bytes]:
+    """
+    Truncate the last line of file, if it is torn (written without newline by interrupted run).
+
+    :param path: str Path to the file.
+    :return: bytes The last complete line without newline or None, if there is no complete line.
+    """
+    with open(path, 'rb+') as line_file:
+        end: int = line_file.seek(0, os.SEEK_END)
+        tail: bytes = b''
+        while end > 0 and tail.count(b'\n') < 2:
+            start: int = max(0, end - tail_block_size)
+            line_file.seek(start)
+            tail = line_file.read(end - start) + tail
+            end = start
+        if not tail.endswith(b'\n'):
+            complete_length: int = tail.rfind(b'\n') + 1
+            line_file.truncate(end + complete_length)
+            tail = tail[:complete_length]
+    lines: list[bytes] = tail.splitlines()
+    return lines[-1] if lines else None
+
+
+class EnrichmentService(object):
+    """Enrich rows of input file by api calls, writing results to JSONL output as soon as they are received."""
+
+    def __init__(self, client: Client, operation: str, concurrency: int = 10) -> None:
+        """Initialize service."""
+        if operation not in operation_methods:
+            raise ArgumentValidationError('{op} is not allowed operation'.format(op=operation))
+        self.client: Client = client
+        self.operation: str = operation
+        self.concurrency: int = concurrency
+        self.stats: dict[str, int] = {'processed': 0, 'skipped': 0, 'failed': 0, 'retry': 0}
+
+    async def run(self, input_path: str, output_path: str, checkpoint_path: Optional[str] = None) -> dict[str, int]:
+        """
+        Enrich input file, resuming from checkpoint journal.
+
+        Requests are performed with 'bulk' priority. Every output line is a JSON object with 'row' number,
+        'input' row and 'result' or 'error' payload. Rows failed with network errors, exhausted quota or budget,
+        open circuit or exceeded deadline are neither written nor journaled, so they are retried on the next run.
+        Unexpected errors stop the run and are raised.
+
+        :param input_path: str Path to CSV or JSONL input file.
+        :param output_path: str Path to JSONL output file, it is appended to.
+        :param checkpoint_path: str Path to journal file, output_path with '.checkpoint' suffix by default.
+        :return: dict Number of processed, skipped (done earlier), failed (api error) and retry rows.
+        """
+        journal = CheckpointJournal(checkpoint_path or '{path}.checkpoint'.format(path=output_path))
+        self._recover_output(output_path, journal)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        with open(output_path, 'a', encoding='utf-8') as output_file:
+            with request_priority('bulk'):
+                workers: list[asyncio.Task] = [
+                    asyncio.create_task(self._work(queue, output_file, journal)) for _ in range(self.concurrency)
+                ]
+            feeder: asyncio.Task = asyncio.create_task(self._feed(queue, input_path, journal))
+            try:
+                done, _ = await asyncio.wait([feeder, *workers], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            finally:
+                for task in (feeder, *workers):
+                    task.cancel()
+                await asyncio.gather(feeder, *workers, return_exceptions=True)
+                journal.close()
+        return self.stats
+
+    async def _feed(self, queue: asyncio.Queue, input_path: str, journal: CheckpointJournal) -> None:
+        """Put rows, not processed earlier, to queue and wait till they are processed."""
+        for row_number, row in enumerate(read_rows(input_path)):
+            if journal.is_done(row_number):
+                self.stats['skipped'] += 1
+                continue
+            await queue.put((row_number, row))
+        await queue.join()
+
+    async def _work(self, queue: asyncio.Queue, output_file: IO[str], journal: CheckpointJournal) -> None:
+        """Process rows from queue."""
+        while True:
+            row_number, row = await queue.get()
+            try:
+                output_row: Optional[dict] = await self._enrich(row_number, row)
+                if output_row is not None:
+                    output_file.write('{line}\n'.format(line=json.dumps(output_row, default=str)))
+                    output_file.flush()
+                    journal.record(row_number)
+            finally:
+                queue.task_done()
+
+    async def _enrich(self, row_number: int, row: dict) -> Optional[dict]:
+        """Perform api call for row, return None if it should be retried."""
+        output_row: dict = {'row': row_number, 'input': row}
+        try:
+            output_row['result'] = await getattr(self.client, operation_methods[self.operation])(
+                **row_arguments(self.operation, row),
+            )
+        except retry_errors:
+            self.stats['retry'] += 1
+            return None
+        except (ForagerAPIError, ArgumentValidationError) as error:
+            output_row['error'] = error.args[0] if error.args else repr(error)
+            self.stats['failed'] += 1
+        self.stats['processed'] += 1
+        return output_row
+
+    def _recover_output(self, output_path: str, journal: CheckpointJournal) -> None:
+        """Truncate torn output line and journal the last written row, if run was interrupted before journaling."""
+        if not os.path.exists(output_path):
+            return
+        last_line: Optional[bytes] = truncate_torn_line(output_path)
+        if last_line is None:
+            return
+        row_number: Any = json.loads(last_line).get('row')
+        if isinstance(row_number, int) and not journal.is_done(row_number):
+            journal.record(row_number)
@@ -0,0 +1,267 @@
+"""Service for finding emails by domain email pattern, calling email_finder only for low-confidence cases."""
+from __future__ import annotations
+
+import asyncio
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+import httpx
+
+from forager_forward.app_clients.client import Client
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerAPIError
+from forager_forward.common.storage import Storage
+
+pattern_placeholders: dict[str, slice] = {'first': slice(None), 'last': slice(None), 'f': slice(1), 'l': slice(1)}
+placeholder_regex = re.compile('{([a-z]+)}')
+name_regex = re.compile('[^a-z0-9-]')
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Get name as it is used in email address: lowercased, without accents, spaces and punctuation.
+
+    :param name: str Person's first or last name.
+    :return: str Normalized name, empty if nothing is left.
+    """
+    if not name:
+        return ''
+    ascii_name: str = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return name_regex.sub('', ascii_name.lower())
+
+
+def email_from_pattern(
+    pattern: str,
+    domain: str,
+    first_name: Optional[str],
+    last_name: Optional[str],
+) -> Optional[str]:
+    """
+    Generate email by domain pattern like '{first}.{last}' or '{f}{last}'.
+
+    :param pattern: str Email pattern of the domain, as given by domain_search.
+    :param domain: str Domain of the email.
+    :param first_name: str The person's first name.
+    :param last_name: str The person's last name.
+    :return: str Email or None if pattern is unknown or names are not enough for it.
+    """
+    names: dict[str, str] = {'first': normalize_name(first_name), 'last': normalize_name(last_name)}
+    local_parts: list[str] = []
+    position: int = 0
+    for placeholder in placeholder_regex.finditer(pattern):
+        key: str = placeholder.group(1)
+        if key not in pattern_placeholders:
+            return None
+        name_part: str = names['first' if key.startswith('f') else 'last'][pattern_placeholders[key]]
+        if not name_part:
+            return None
+        start, end = placeholder.span()
+        local_parts.extend((pattern[position:start], name_part))
+        position = end
+    local_parts.append(pattern[position:])
+    local_part: str = ''.join(local_parts)
+    if not local_part or '{' in local_part or '}' in local_part:
+        return None
+    return '{local_part}@{domain}'.format(local_part=local_part, domain=domain)
+
+
+def pattern_confidence(pattern: Optional[str], domain_data: dict) -> Optional[float]:
+    """
+    Get share of sample emails of domain_search data, which are generated correctly by the pattern.
+
+    :param pattern: str Email pattern of the domain.
+    :param domain_data: dict domain_search data.
+    :return: float Share of matched emails, None if no sample email has owner's names.
+    """
+    if not pattern:
+        return 0.0
+    checked: int = 0
+    matched: int = 0
+    for email_data in domain_data.get('emails') or ():
+        if not (email_data.get('first_name') and email_data.get('last_name') and email_data.get('value')):
+            continue
+        checked += 1
+        generated: Optional[str] = email_from_pattern(
+            pattern,
+            domain_data.get('domain', ''),
+            email_data['first_name'],
+            email_data['last_name'],
+        )
+        matched += generated == email_data['value'].lower()
+    return matched / checked if checked else None
+
+
+class PatternFinder(object):
+    """
+    Find emails of many people, generating them by email pattern of their domain.
+
+    Pattern of every domain is got once by domain_search and cached in Storage, domains, which domain_search
+    has failed for, are skipped by this finder only, so they are searched again later. Pattern is trusted if it
+    generates at least min_confidence share of the sample emails, given by domain_search, pattern without
+    sample emails of named owners isn't checked, it is trusted only with trust_unchecked. Email_finder is
+    called for people at domains without trusted pattern and for names, which can't be used in pattern.
+    """
+
+    _storage: Storage = Storage()
+
+    def __init__(self, client: Client, min_confidence: float = 0.5, trust_unchecked: bool = False) -> None:
+        """
+        Initialize finder.
+
+        :param client: Client Client for domain_search and email_finder calls.
+        :param min_confidence: float Minimum share of sample emails, generated correctly by trusted pattern.
+        :param trust_unchecked: bool Trust pattern, which can't be checked by sample emails.
+        """
+        self.client: Client = client
+        self.min_confidence: float = min_confidence
+        self.trust_unchecked: bool = trust_unchecked
+        self.stats: dict[str, int] = {'domain_searches': 0, 'generated': 0, 'fallbacks': 0, 'calls_saved': 0}
+        self._failed_domains: set[str] = set()
+
+    def find(self, people: Iterable[dict]) -> list[dict]:
+        """
+        Find emails of people.
+
+        :param people: Iterable Dicts with 'domain', 'first_name' and 'last_name' or 'full_name'.
+        :raises ArgumentValidationError: Person has no domain or blank full name.
+        :return: list Results in order of people: generated ones have 'email', 'pattern', 'confidence' and
+            'source' 'pattern', others are email_finder data (or api error payload) with 'source' 'api'.
+        """
+        results: list[dict] = []
+        for person in people:
+            domain, first_name, last_name = _person_names(person)
+            pattern_data: Optional[dict] = self._cached_pattern(domain) or self._fetch_pattern(domain)
+            email_data: Optional[dict] = self._generate(pattern_data, domain, first_name, last_name)
+            if email_data is None:
+                email_data = self._find(domain, first_name, last_name)
+            results.append(email_data)
+        return results
+
+    async def afind(self, people: Iterable[dict], concurrency: int = 10) -> list[dict]:
+        """
+        Find emails of people, performing requests concurrently, see find.
+
+        :param people: Iterable Dicts with 'domain', 'first_name' and 'last_name' or 'full_name'.
+        :param concurrency: int Maximum number of requests in flight.
+        :return: list Results in order of people.
+        """
+        names: list[tuple[str, str, str]] = [_person_names(person) for person in people]
+        semaphore = asyncio.Semaphore(concurrency)
+        domains: set[str] = {domain for domain, _, _ in names if self._cached_pattern(domain) is None}
+        await asyncio.gather(*(self._afetch_pattern(domain, semaphore) for domain in domains))
+        return list(await asyncio.gather(*(self._afind_one(semaphore, *person_names) for person_names in names)))
+
+    def _generate(self, pattern_data: Optional[dict], domain: str, first_name: str, last_name: str) -> Optional[dict]:
+        """Generate email by trusted pattern, None if it should be found by api."""
+        if pattern_data is None:
+            return None
+        confidence: Optional[float] = pattern_data['confidence']
+        if confidence is None and not self.trust_unchecked:
+            return None
+        if confidence is not None and confidence < self.min_confidence:
+            return None
+        email: Optional[str] = email_from_pattern(pattern_data['pattern'] or '', domain, first_name, last_name)
+        if email is None:
+            return None
+        self.stats['generated'] += 1
+        self.stats['calls_saved'] += 1
+        return {'email': email, 'pattern': pattern_data['pattern'], 'confidence': confidence, 'source': 'pattern'}
+
+    def _cached_pattern(self, domain: str) -> Optional[dict]:
+        """Get cached pattern data of the domain."""
+        return self._storage.read(_pattern_key(domain))
+
+    def _fetch_pattern(self, domain: str) -> Optional[dict]:
+        """Get domain pattern by domain_search and cache it, None if domain_search has failed."""
+        if domain in self._failed_domains:
+            return None
+        self._count_search()
+        try:
+            domain_data: dict | httpx.Response = self.client.domain_search(domain=domain)
+        except ForagerAPIError:
+            self._failed_domains.add(domain)
+            return None
+        return self._cache_pattern(domain, domain_data)
+
+    async def _afetch_pattern(self, domain: str, semaphore: asyncio.Semaphore) -> None:
+        """Get domain pattern by async domain_search and cache it, failed domain isn't cached."""
+        self._count_search()
+        async with semaphore:
+            try:
+                domain_data: dict | httpx.Response = await self.client.adomain_search(domain=domain)
+            except ForagerAPIError:
+                self._failed_domains.add(domain)
+                return
+        self._cache_pattern(domain, domain_data)
+
+    def _count_search(self) -> None:
+        """Count domain_search call, which isn't saved."""
+        self.stats['domain_searches'] += 1
+        self.stats['calls_saved'] -= 1
+
+    def _cache_pattern(self, domain: str, domain_data: dict | httpx.Response) -> dict:
+        """Save pattern and its confidence to storage."""
+        pattern_data: dict = {'pattern': None, 'confidence': 0.0}
+        if isinstance(domain_data, dict):
+            pattern: Optional[str] = domain_data.get('pattern')
+            pattern_data = {'pattern': pattern, 'confidence': pattern_confidence(pattern, domain_data)}
+        if self._cached_pattern(domain) is None:
+            self._storage.create(_pattern_key(domain), pattern_data)
+        return pattern_data
+
+    def _find(self, domain: str, first_name: str, last_name: str) -> dict:
+        """Find email by email_finder."""
+        self.stats['fallbacks'] += 1
+        try:
+            email_data: dict | httpx.Response = self.client.email_finder(
+                domain=domain,
+                first_name=first_name,
+                last_name=last_name,
+            )
+        except ForagerAPIError as error:
+            email_data = error.args[0]
+        return _api_result(email_data)
+
+    async def _afind_one(self, semaphore: asyncio.Semaphore, domain: str, first_name: str, last_name: str) -> dict:
+        """Generate email by cached pattern or find it by async email_finder."""
+        generated: Optional[dict] = self._generate(self._cached_pattern(domain), domain, first_name, last_name)
+        if generated is not None:
+            return generated
+        self.stats['fallbacks'] += 1
+        async with semaphore:
+            try:
+                email_data: dict | httpx.Response = await self.client.aemail_finder(
+                    domain=domain,
+                    first_name=first_name,
+                    last_name=last_name,
+                )
+            except ForagerAPIError as error:
+                email_data = error.args[0]
+        return _api_result(email_data)
+
+
+def _person_names(person: dict) -> tuple[str, str, str]:
+    """Get domain, first and last name of person, splitting full name if names are not given."""
+    first_name: str = person.get('first_name') or ''
+    last_name: str = person.get('last_name') or ''
+    if not (first_name and last_name) and person.get('full_name'):
+        full_name: list[str] = person['full_name'].split()
+        if not full_name:
+            raise ArgumentValidationError('For finding email full name should contain name')
+        first_name = first_name or full_name[0]
+        last_name = last_name or full_name[-1]
+    domain: object = person.get('domain')
+    if not isinstance(domain, str) or not domain.strip():
+        raise ArgumentValidationError('For finding email should be defined domain')
+    return domain.strip().lower(), first_name, last_name
+
+
+def _api_result(email_data: dict | httpx.Response) -> dict:
+    """Mark email_finder data or api error payload with 'api' source."""
+    response_data: dict = email_data.json() if isinstance(email_data, httpx.Response) else email_data
+    return dict(response_data, source='api')
+
+
+def _pattern_key(domain: str) -> str:
+    """Get storage key of domain pattern."""
+    return 'pattern:{domain}'.format(domain=domain)
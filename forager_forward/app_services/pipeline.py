@@ -0,0 +1,286 @@
+"""Async pipeline of client calls with bounded queues between stages."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+import httpx
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.email_validation_service import EmailValidationService
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerError
+
+_done: object = object()
+
+
+class Stage(object):
+    """Pipeline stage: coroutine function, applied to every item by concurrency workers."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        fan_out: bool = False,
+    ) -> None:
+        """
+        Initialize stage.
+
+        :param name: str Stage name.
+        :param handler: Callable Coroutine function, its result is passed to the next stage, None result is dropped.
+        :param concurrency: int Number of workers.
+        :param fan_out: bool Handler returns iterable of items, passed to the next stage one by one.
+        """
+        self.name: str = name
+        self.handler: Callable[[Any], Awaitable[Any]] = handler
+        self.concurrency: int = concurrency
+        self.fan_out: bool = fan_out
+        self.stats: dict[str, int] = {'processed': 0, 'failed': 0}
+
+
+class Pipeline(object):
+    """
+    Chain of stages, connected by bounded queues.
+
+    Upstream stage waits while the queue to the next stage is full, so memory is bounded by queue_size per
+    stage whatever the speed of stages is. Items failed with ForagerError or httpx.HTTPError are counted and
+    given to on_error, other errors stop the pipeline and are raised by stream/run.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100,
+        on_error: Optional[Callable[[str, Any, Exception], Any]] = None,
+    ) -> None:
+        """
+        Initialize empty pipeline.
+
+        :param queue_size: int Maximum number of items, waiting for every stage.
+        :param on_error: Callable Called with stage name, item and error for failed items.
+        """
+        self.queue_size: int = queue_size
+        self.on_error: Optional[Callable[[str, Any, Exception], Any]] = on_error
+        self.stages: list[Stage] = []
+        self._queues: list[asyncio.Queue] = []
+        self._tasks: list[asyncio.Task] = []
+        self._running: list[int] = []
+        self._draining: bool = False
+        self._error: Optional[BaseException] = None
+
+    def stage(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        fan_out: bool = False,
+    ) -> Pipeline:
+        """Add stage to the end of pipeline, see Stage, return the pipeline for chaining."""
+        self.stages.append(Stage(name, handler, concurrency, fan_out))
+        return self
+
+    async def stream(self, source: Iterable | AsyncIterable) -> AsyncIterator[Any]:
+        """
+        Run pipeline over source items, yielding results of the last stage as they are ready.
+
+        :param source: Iterable Sync or async iterable of items for the first stage.
+        :return: AsyncIterator Results of the last stage.
+        """
+        if self._tasks:
+            raise ArgumentValidationError('Pipeline has already been started.')
+        if not self.stages:
+            raise ArgumentValidationError('Pipeline has no stages.')
+        self._start(source)
+        try:
+            while True:
+                item: Any = await self._queues[-1].get()
+                if item is _done:
+                    break
+                yield item
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.cancel()
+
+    async def run(self, source: Iterable | AsyncIterable) -> dict[str, dict]:
+        """
+        Run pipeline over source items till all of them pass through, dropping results of the last stage.
+
+        :param source: Iterable Sync or async iterable of items for the first stage.
+        :return: dict Number of processed and failed items per stage.
+        """
+        async for _ in self.stream(source):
+            pass  # noqa: WPS420
+        return self.metrics()
+
+    def drain(self) -> None:
+        """Stop taking source items, items already taken pass through the pipeline."""
+        self._draining = True
+
+    def cancel(self) -> None:
+        """Stop all stages at once, dropping items in progress and results, which aren't taken yet."""
+        for task in self._tasks:
+            task.cancel()
+        if self._queues:
+            output: asyncio.Queue = self._queues[-1]
+            while not output.empty():
+                output.get_nowait()
+            output.put_nowait(_done)
+
+    def metrics(self) -> dict[str, dict]:
+        """Get number of queued, processed and failed items per stage."""
+        return {
+            stage.name: dict(stage.stats, queued=self._queues[index].qsize() if self._queues else 0)
+            for index, stage in enumerate(self.stages)
+        }
+
+    def _start(self, source: Iterable | AsyncIterable) -> None:
+        """Create queues and start feeder and stage workers."""
+        self._queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._running = [stage.concurrency for stage in self.stages]
+        self._tasks = [asyncio.create_task(self._feed(source))]
+        for index, stage in enumerate(self.stages):
+            self._tasks.extend(asyncio.create_task(self._work(index)) for _ in range(stage.concurrency))
+
+    async def _feed(self, source: Iterable | AsyncIterable) -> None:
+        """Put source items to the first queue till source is exhausted or pipeline is drained."""
+        try:
+            if isinstance(source, AsyncIterable):
+                async for item in source:
+                    if self._draining:
+                        break
+                    await self._queues[0].put(item)
+            else:
+                for item in source:
+                    if self._draining:
+                        break
+                    await self._queues[0].put(item)
+        except Exception as error:
+            self._fail(error)
+            return
+        for _ in range(self.stages[0].concurrency):
+            await self._queues[0].put(_done)
+
+    async def _work(self, index: int) -> None:
+        """Process items of the stage queue till end of the stream."""
+        stage: Stage = self.stages[index]
+        while True:
+            item: Any = await self._queues[index].get()
+            if item is _done:
+                break
+            try:
+                await self._process(stage, index, item)
+            except Exception as error:
+                self._fail(error)
+                return
+        self._running[index] -= 1
+        if self._running[index]:
+            return
+        next_workers: int = self.stages[index + 1].concurrency if index + 1 < len(self.stages) else 1
+        for _ in range(next_workers):
+            await self._queues[index + 1].put(_done)
+
+    async def _process(self, stage: Stage, index: int, item: Any) -> None:
+        """Apply stage handler to item and put its results to the next queue."""
+        try:
+            stage_result: Any = await stage.handler(item)
+        except (ForagerError, httpx.HTTPError) as error:
+            stage.stats['failed'] += 1
+            if self.on_error is not None:
+                error_result: Any = self.on_error(stage.name, item, error)
+                if inspect.isawaitable(error_result):
+                    await error_result
+            return
+        stage.stats['processed'] += 1
+        if stage_result is None:
+            return
+        for next_item in stage_result if stage.fan_out else (stage_result,):
+            await self._queues[index + 1].put(next_item)
+
+    def _fail(self, error: BaseException) -> None:
+        """Stop pipeline on unexpected error, which is raised by stream."""
+        if self._error is None:
+            self._error = error
+        self.cancel()
+
+
+class EmailStages(object):
+    """Stages of email pipeline: domain_search -> email_finder -> verify_email -> EmailValidationService."""
+
+    def __init__(self, client: Client) -> None:
+        """Initialize stages with client."""
+        self.client: Client = client
+        self.validation_service: EmailValidationService = EmailValidationService()
+
+    async def search(self, source_item: str | dict) -> list[dict]:
+        """Expand domain to people by domain_search, pass person dict as it is."""
+        if isinstance(source_item, dict):
+            return [source_item]
+        domain_data: dict = await self.client.adomain_search(domain=source_item)  # type: ignore
+        return [
+            {
+                'domain': source_item,
+                'first_name': email_data.get('first_name'),
+                'last_name': email_data.get('last_name'),
+                'email': email_data.get('value'),
+            }
+            for email_data in domain_data.get('emails') or ()
+        ]
+
+    async def find(self, person: dict) -> Optional[dict]:
+        """Find email of person without it by email_finder, drop person if it isn't found."""
+        if person.get('email'):
+            return person
+        finder_data: dict = await self.client.aemail_finder(  # type: ignore
+            domain=person['domain'],
+            first_name=person.get('first_name'),
+            last_name=person.get('last_name'),
+        )
+        return dict(person, email=finder_data['email']) if finder_data.get('email') else None
+
+    async def verify(self, person: dict) -> dict:
+        """Add verify_email data to person."""
+        return dict(person, verification=await self.client.averify_email(person['email']))
+
+    async def store(self, person: dict) -> dict:
+        """Save verification result of person email."""
+        return self.validation_service.save_verification_record(person['email'], person['verification'])
+
+
+def email_pipeline(
+    client: Client,
+    queue_size: int = 100,
+    search_concurrency: int = 5,
+    find_concurrency: int = 10,
+    verify_concurrency: int = 20,
+) -> Pipeline:
+    """
+    Create pipeline: domain_search -> email_finder -> verify_email -> EmailValidationService.
+
+    Source items are domains or person dicts with 'domain', 'first_name', 'last_name' and optionally 'email'.
+    Domains are expanded to people by domain_search, email is found by email_finder for people without it,
+    then it is verified and verification result is saved by EmailValidationService.
+
+    :param client: Client Client to perform requests with.
+    :param queue_size: int Maximum number of items, waiting for every stage.
+    :param search_concurrency: int Number of concurrent domain_search requests.
+    :param find_concurrency: int Number of concurrent email_finder requests.
+    :param verify_concurrency: int Number of concurrent verify_email requests.
+    :return: Pipeline Pipeline, yielding saved email records.
+    """
+    stages = EmailStages(client)
+    return (
+        Pipeline(queue_size)
+        .stage('search', stages.search, search_concurrency, fan_out=True)
+        .stage('find', stages.find, find_concurrency)
+        .stage('verify', stages.verify, verify_concurrency)
+        .stage('store', stages.store)
+    )
@@ -0,0 +1,74 @@
+"""Command line interface for Forager project."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Optional, Sequence
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.enrichment_service import (
+    EnrichmentService,
+    operation_methods,
+)
+from forager_forward.client_initializer import ClientInitializer
+
+api_keys_variable: str = 'FORAGER_API_KEYS'
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create parser for command line arguments."""
+    parser = argparse.ArgumentParser(prog='forager', description='Hunter.io v2 api client.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    enrich_parser = subparsers.add_parser(
+        'enrich',
+        help='Enrich CSV/JSONL file rows by api calls, resuming interrupted runs.',
+    )
+    enrich_parser.add_argument('operation', choices=sorted(operation_methods))
+    enrich_parser.add_argument('input', help='CSV or JSONL (.jsonl, .ndjson) file with operation arguments.')
+    enrich_parser.add_argument('output', help='JSONL file, results are appended to.')
+    enrich_parser.add_argument(
+        '--api-key',
+        action='append',
+        dest='api_keys',
+        help='Api key, can be repeated. Comma delimited {var} variable is used by default.'.format(
+            var=api_keys_variable,
+        ),
+    )
+    enrich_parser.add_argument('--concurrency', type=int, default=10, help='Number of requests in flight.')
+    enrich_parser.add_argument('--checkpoint', help='Journal file, OUTPUT.checkpoint by default.')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run command line interface."""
+    parser = create_parser()
+    arguments = parser.parse_args(argv)
+    api_keys: list[str] = arguments.api_keys or [
+        api_key for api_key in os.environ.get(api_keys_variable, '').split(',') if api_key
+    ]
+    if not api_keys:
+        parser.error('api key should be given with --api-key or {var}'.format(var=api_keys_variable))
+    ClientInitializer().initialize_client(api_keys)
+    client: Optional[Client] = ClientInitializer().client
+    if client is None:
+        parser.error('client is not initialized')
+    stats: dict[str, int] = asyncio.run(enrich(client, arguments))
+    client.close()
+    sys.stderr.write('{stats}\n'.format(stats=json.dumps(stats)))
+    return 0
+
+
+async def enrich(client: Client, arguments: argparse.Namespace) -> dict[str, int]:
+    """Run enrichment service, closing async http client of the event loop after it."""
+    service = EnrichmentService(client, arguments.operation, arguments.concurrency)
+    try:
+        return await service.run(arguments.input, arguments.output, arguments.checkpoint)
+    finally:
+        await client.aclose()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
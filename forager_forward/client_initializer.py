@@ -1,13 +1,21 @@
 """Forager client initializer."""
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
-from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.key_pool import default_cooldown
+
+if TYPE_CHECKING:
+    from forager_forward.app_clients.client import Client
 
 
 class ClientInitializer(object):
-    """Singleton class for client initialization and retrieving."""
+    """
+    Singleton class for client initialization and retrieving.
+
+    Client module (with httpx and asyncio) is imported by the first initialize_client, so importing the
+    initializer is cheap for short-lived jobs.
+    """
 
     _client: Optional[Client] = None
 
@@ -17,9 +25,17 @@ class ClientInitializer(object):
             cls.instance = super().__new__(cls, *args, **kwargs)
         return cls.instance
 
-    def initialize_client(self, api_key: str) -> None:
-        """Initialize client instance."""
-        self._client = Client(api_key)
+    def initialize_client(
+        self,
+        api_key: str | Iterable[str],
+        http2: bool = False,
+        transport: Optional[Any] = None,
+        key_cooldown: float = default_cooldown,
+    ) -> None:
+        """Initialize client instance with one api key or a pool of keys, optionally in HTTP/2 mode or on transport."""
+        from forager_forward.app_clients.client import Client  # noqa: WPS433
+
+        self._client = Client(api_key, http2=http2, transport=transport, key_cooldown=key_cooldown)
 
     @property
     def client(self) -> Optional[Client]:
@@ -0,0 +1,131 @@
+"""Bloom filter seen-set for deduplication of huge email streams."""
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable
+
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerError
+
+bloom_magic: bytes = b'FGBLOOM1'
+bloom_header_format: struct.Struct = struct.Struct('<8sQdQQQ')
+
+
+class BloomFilter(object):
+    """
+    Probabilistic set of strings with fixed memory: about 1.2 bytes per item for 1% false positive rate.
+
+    Item, which was added, is always found, item, which wasn't added, is found with false positive rate,
+    while number of added items doesn't exceed capacity. Items are hashed by blake2b, so filters, saved by
+    different processes with the same capacity and error rate, can be merged.
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.01) -> None:
+        """
+        Initialize empty filter.
+
+        :param capacity: int Expected number of items.
+        :param error_rate: float False positive rate at capacity, between 0 and 1.
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ArgumentValidationError('Capacity should be positive and error rate should be between 0 and 1.')
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.bit_count: int = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count: int = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.count: int = 0
+        self._bits: bytearray = bytearray((self.bit_count + 7) // 8)
+
+    def __contains__(self, item: object) -> bool:
+        """Check item was probably added."""
+        if not isinstance(item, str):
+            return False
+        return all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._positions(item))
+
+    def __len__(self) -> int:
+        """Get number of added items, counted by add, merged filters add their counts."""
+        return self.count
+
+    def add(self, item: str) -> bool:
+        """
+        Add item.
+
+        :param item: str Item to add.
+        :return: bool True, if item is new, False if it was probably added before.
+        """
+        is_new: bool = False
+        for bit in self._positions(item):
+            mask: int = 1 << (bit & 7)
+            if not self._bits[bit >> 3] & mask:
+                self._bits[bit >> 3] |= mask
+                is_new = True
+        self.count += is_new
+        return is_new
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add many items."""
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: BloomFilter) -> None:
+        """
+        Add all items of other filter, created with the same capacity and error rate.
+
+        :param other: BloomFilter Filter, e.g. of another worker.
+        """
+        if (other.bit_count, other.hash_count) != (self.bit_count, self.hash_count):
+            raise ArgumentValidationError('Only filters with the same capacity and error rate can be merged.')
+        merged: int = int.from_bytes(self._bits, 'little') | int.from_bytes(other._bits, 'little')
+        self._bits = bytearray(merged.to_bytes(len(self._bits), 'little'))
+        self.count += other.count
+
+    def save(self, path: str) -> None:
+        """Write filter to file."""
+        temporary_path: str = '{path}.tmp'.format(path=path)
+        with open(temporary_path, 'wb') as filter_file:
+            filter_file.write(
+                bloom_header_format.pack(
+                    bloom_magic,
+                    self.capacity,
+                    self.error_rate,
+                    self.bit_count,
+                    self.hash_count,
+                    self.count,
+                ),
+            )
+            filter_file.write(self._bits)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> BloomFilter:
+        """
+        Read filter from file.
+
+        :param path: str Path to file, written by save.
+        :return: BloomFilter Filter.
+        """
+        with open(path, 'rb') as filter_file:
+            header: bytes = filter_file.read(bloom_header_format.size)
+            bits: bytes = filter_file.read()
+        if len(header) < bloom_header_format.size:
+            raise ForagerError('{path} is not a bloom filter.'.format(path=path))
+        magic, capacity, error_rate, bit_count, hash_count, count = bloom_header_format.unpack(header)
+        bloom_filter = cls(capacity, error_rate)
+        if magic != bloom_magic or (bit_count, hash_count, len(bits)) != (
+            bloom_filter.bit_count,
+            bloom_filter.hash_count,
+            len(bloom_filter._bits),
+        ):
+            raise ForagerError('{path} is not a bloom filter.'.format(path=path))
+        bloom_filter._bits = bytearray(bits)
+        bloom_filter.count = count
+        return bloom_filter
+
+    def _positions(self, item: str) -> list[int]:
+        """Get bit positions of item by double hashing."""
+        digest: bytes = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first_hash: int = int.from_bytes(digest[:8], 'little')
+        second_hash: int = int.from_bytes(digest[8:], 'little') | 1
+        return [(first_hash + index * second_hash) % self.bit_count for index in range(self.hash_count)]
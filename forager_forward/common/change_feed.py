@@ -0,0 +1,70 @@
+"""In-order feed of Storage changes for downstream mirrors."""
+from __future__ import annotations
+
+import queue
+from typing import Any, Iterator, NamedTuple, Optional
+
+
+class StorageChange(NamedTuple):
+    """Applied change of Storage record: sequence number, 'create', 'update' or 'delete', key and data."""
+
+    sequence: int
+    operation: str
+    key: str
+    some_data: Any
+
+
+class ChangeFeed(object):
+    """
+    Buffer of Storage changes, subscribed to Storage, iterated by consumer.
+
+    Changes come in order of their sequence numbers. Feed is bounded: if consumer falls behind by max_size
+    changes, the oldest ones are dropped and counted, so consumer should resync from snapshot.
+    """
+
+    def __init__(self, max_size: int = 100000) -> None:
+        """
+        Initialize empty feed.
+
+        :param max_size: int Maximum number of buffered changes.
+        """
+        self.dropped: int = 0
+        self._changes: queue.Queue[StorageChange] = queue.Queue(max_size)
+
+    def __call__(self, change: StorageChange) -> None:
+        """Buffer applied change, it is called by Storage."""
+        while True:
+            try:
+                self._changes.put_nowait(change)
+            except queue.Full:
+                self._drop_oldest()
+            else:
+                return
+
+    def __iter__(self) -> Iterator[StorageChange]:
+        """Iterate over buffered changes without waiting for new ones."""
+        while True:
+            try:
+                yield self._changes.get_nowait()
+            except queue.Empty:
+                return
+
+    def get(self, timeout: Optional[float] = None) -> Optional[StorageChange]:
+        """
+        Wait for the next change.
+
+        :param timeout: float Seconds to wait, forever if it isn't given.
+        :return: StorageChange Change or None on timeout.
+        """
+        try:
+            return self._changes.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _drop_oldest(self) -> None:
+        """Drop the oldest buffered change."""
+        try:
+            self._changes.get_nowait()
+        except queue.Empty:
+            return
+        self.dropped += 1
@@ -1,9 +1,29 @@
 """Utilities for Forager project."""
 from __future__ import annotations
 
+from contextlib import suppress
 from typing import Any
 
-from forager_forward.common.validators import special_validators, validators
+from forager_forward.common.validators import (
+    common_validators,
+    special_validators,
+    validators,
+)
+
+provider_domain_aliases: dict[str, str] = {'googlemail.com': 'gmail.com'}
+dotless_providers: frozenset[str] = frozenset(('gmail.com',))
+plus_tag_providers: frozenset[str] = frozenset(
+    (
+        'fastmail.com',
+        'gmail.com',
+        'hotmail.com',
+        'icloud.com',
+        'live.com',
+        'outlook.com',
+        'proton.me',
+        'protonmail.com',
+    ),
+)
 
 
 def create_and_validate_params(operation_type: str, **kwargs: Any) -> dict:
@@ -24,3 +44,30 @@ def create_and_validate_params(operation_type: str, **kwargs: Any) -> dict:
     for validation_handler in validators['required_arguments']:
         validation_handler(operation_type, param_dict)
     return param_dict
+
+
+def canonicalize_email(email: str, provider_rules: bool = False) -> str:
+    """
+    Get canonical form of email for deduplication and lookup.
+
+    Whitespaces are trimmed, email is lowercased and domain is converted to its IDNA (punycode) form.
+
+    :param email: str Email to canonicalize.
+    :param provider_rules: bool Apply provider-specific rules: googlemail.com alias, dots in gmail.com local part
+        and '+tag' suffixes are removed.
+    :return: str Canonical email.
+    """
+    common_validators.validate_str('email', email)
+    local_part, separator, domain = email.strip().lower().rpartition('@')
+    if not separator:
+        return domain
+    domain = domain.rstrip('.')
+    with suppress(UnicodeError):
+        domain = domain.encode('idna').decode('ascii')
+    if provider_rules:
+        domain = provider_domain_aliases.get(domain, domain)
+        if domain in plus_tag_providers:
+            local_part = local_part.split('+', 1)[0]
+        if domain in dotless_providers:
+            local_part = local_part.replace('.', '')
+    return '{local_part}@{domain}'.format(local_part=local_part, domain=domain)
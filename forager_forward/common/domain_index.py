@@ -0,0 +1,132 @@
+"""Local index of disposable and blocked domains and role addresses."""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from forager_forward.common.exceptions import ArgumentValidationError
+
+default_disposable_domains: frozenset[str] = frozenset(
+    (
+        '10minutemail.com',
+        'discard.email',
+        'dispostable.com',
+        'fakeinbox.com',
+        'getnada.com',
+        'guerrillamail.com',
+        'maildrop.cc',
+        'mailinator.com',
+        'mailnesia.com',
+        'mintemail.com',
+        'sharklasers.com',
+        'temp-mail.org',
+        'tempmail.com',
+        'throwawaymail.com',
+        'trashmail.com',
+        'yopmail.com',
+    ),
+)
+default_role_local_parts: frozenset[str] = frozenset(
+    (
+        'abuse',
+        'admin',
+        'billing',
+        'contact',
+        'help',
+        'hostmaster',
+        'info',
+        'mailer-daemon',
+        'no-reply',
+        'noc',
+        'noreply',
+        'postmaster',
+        'sales',
+        'security',
+        'support',
+        'webmaster',
+    ),
+)
+verdicts: dict[str, dict] = {
+    'blocked': {'status': 'invalid', 'result': 'undeliverable', 'disposable': False},
+    'disposable': {'status': 'disposable', 'result': 'undeliverable', 'disposable': True},
+    'role': {'status': 'unknown', 'result': 'risky', 'disposable': False},
+    'syntax': {'status': 'invalid', 'result': 'undeliverable', 'disposable': False},
+}
+
+
+class DomainIndex(object):
+    """Hashed sets of domains and local parts, giving verdict for addresses without api call."""
+
+    def __init__(
+        self,
+        disposable: Iterable[str] = default_disposable_domains,
+        blocked: Iterable[str] = (),
+        role: Iterable[str] = default_role_local_parts,
+    ) -> None:
+        """Initialize index."""
+        self._entries: dict[str, set[str]] = {
+            'blocked': {domain.lower() for domain in blocked},
+            'disposable': {domain.lower() for domain in disposable},
+            'role': {local_part.lower() for local_part in role},
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> DomainIndex:
+        """Create index with entries from file only, see load for the format."""
+        index = cls(disposable=(), role=())
+        index.load(path)
+        return index
+
+    def load(self, path: str) -> None:
+        """
+        Add entries from file.
+
+        File contains one entry per line, optionally prefixed with its kind: 'blocked:', 'disposable:' or 'role:'.
+        Entries without prefix are disposable domains, empty lines and lines starting with '#' are skipped.
+
+        :param path: str Path to the file.
+        """
+        with open(path, encoding='utf-8') as index_file:
+            for line in index_file:
+                entry: str = line.strip().lower()
+                if not entry or entry.startswith('#'):
+                    continue
+                kind, _, entry_value = entry.rpartition(':')
+                self.add(kind or 'disposable', entry_value.strip())
+
+    def add(self, kind: str, entry_value: str) -> None:
+        """Add domain ('blocked', 'disposable') or local part ('role') to the index."""
+        if kind not in self._entries:
+            raise ArgumentValidationError('{kind} is not allowed index entry kind.'.format(kind=kind))
+        self._entries[kind].add(entry_value.lower())
+
+    def lookup(self, email: str) -> Optional[dict]:
+        """
+        Get local verdict for email.
+
+        :param email: str Email to check.
+        :return: dict Verdict in the shape of 'email-verifier' data, or None if address should be verified by api.
+        """
+        local_part, _, domain = email.strip().lower().rpartition('@')
+        kind: Optional[str] = self._domain_kind(domain)
+        if kind is None and local_part in self._entries['role']:
+            kind = 'role'
+        if kind is None:
+            return None
+        return self.verdict(email, kind)
+
+    def verdict(self, email: str, reason: str) -> dict:
+        """Create local verdict for email."""
+        return dict(verdicts[reason], email=email, reason=reason, source='local')
+
+    def _domain_kind(self, domain: str) -> Optional[str]:
+        """Find kind of the domain or one of its parent domains."""
+        labels: list[str] = domain.split('.')
+        for index in range(len(labels) - 1):
+            parent: str = '.'.join(labels[index:])
+            for kind in ('blocked', 'disposable'):
+                if parent in self._entries[kind]:
+                    return kind
+        return None
+
+
+domain_index = DomainIndex()
@@ -19,3 +19,31 @@ class ForagerAPIError(ForagerError):
 
 class ForagerKeyError(ForagerError):
     """Error, if key presents in storage."""
+
+
+class ForagerQuotaError(ForagerAPIError):
+    """Error, if all api keys have exhausted their quota."""
+
+
+class ForagerBudgetError(ForagerError):
+    """Error, if remaining credits can't cover requested operations."""
+
+
+class ForagerCircuitOpenError(ForagerError):
+    """Error, if call is rejected because api is considered degraded."""
+
+
+class ForagerDeadlineError(ForagerError):
+    """Error, if call deadline is exceeded."""
+
+
+class ForagerVerificationPendingError(ForagerAPIError):
+    """Error, if email verification is still in progress (202 response), it should be polled later."""
+
+
+class ForagerReplayError(ForagerError):
+    """Error, if replayed request has no recorded response."""
+
+
+class ForagerStorageFullError(ForagerError):
+    """Error, if record doesn't fit bounded shared storage."""
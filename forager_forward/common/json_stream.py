@@ -0,0 +1,172 @@
+"""Incremental decoding of JSON array items from streamed document."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Optional, Sequence
+
+from forager_forward.common.exceptions import ForagerError
+
+whitespace_regex: re.Pattern = re.compile(r'[ \t\n\r]*')
+number_tail_regex: re.Pattern = re.compile(r'[0-9.eE+-]*')
+number_start_chars: str = '-0123456789'
+
+
+class JsonArrayStream(object):
+    """
+    Push parser, giving items of JSON array at path of keys in document, fed by chunks of bytes.
+
+    Only one item (or one skipped value before the array) is buffered: items are decoded by C decoder as soon
+    as they are complete, values of other keys are skipped, the rest of document after the array is ignored.
+    """
+
+    def __init__(self, path: Sequence[str]) -> None:
+        """
+        Initialize parser.
+
+        :param path: Sequence Keys of nested objects, leading to the array, e.g. ('data', 'emails').
+        """
+        self.path: tuple[str, ...] = tuple(path)
+        self._matched: int = 0
+        self._state: str = 'value'
+        self._buffer: str = ''
+        self._position: int = 0
+        self._finished: bool = False
+        self._utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+
+    @property
+    def done(self) -> bool:
+        """Check the whole array is given or document has no array at path."""
+        return self._state == 'done'
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        Parse next chunk of document.
+
+        :param chunk: bytes Chunk of UTF-8 encoded document.
+        :return: list Items, completed by the chunk.
+        """
+        return self._parse(self._utf8_decoder.decode(chunk))
+
+    def close(self) -> list[Any]:
+        """
+        Parse the rest of document after the last chunk.
+
+        :return: list The last items.
+        :raises ForagerError: Document is truncated or malformed.
+        """
+        self._finished = True
+        return self._parse(self._utf8_decoder.decode(b'', final=True))
+
+    def _parse(self, text: str) -> list[Any]:
+        """Add text to buffer, dropping its parsed part, and parse all complete items."""
+        if self.done:
+            return []
+        parsed: int = self._position
+        self._buffer = self._buffer[parsed:] + text
+        self._position = 0
+        items: list[Any] = []
+        while self._step(items):
+            continue  # noqa: WPS328
+        return items
+
+    def _step(self, items: list[Any]) -> bool:
+        """Make one parsing step, False if more data is needed or parsing is done."""
+        if self.done:
+            return False
+        char: Optional[str] = self._next_char()
+        if char is None:
+            return False
+        if self._state == 'value':
+            return self._enter(char)
+        if self._state == 'skip':
+            return self._decode() is not None
+        if char == ',':
+            self._position += 1
+            return True
+        if self._state == 'key':
+            return self._key(char)
+        if char == ']':
+            self._state = 'done'
+            return False
+        decoded: Optional[tuple[Any]] = self._decode()
+        if decoded is None:
+            return False
+        items.append(decoded[0])
+        return True
+
+    def _enter(self, char: str) -> bool:
+        """Enter object or, at the end of path, array of the value, documents without them have no items."""
+        expected: str = '[' if self._matched == len(self.path) else '{'
+        if char != expected:
+            self._state = 'done'
+            return False
+        self._position += 1
+        self._state = 'item' if expected == '[' else 'key'
+        return True
+
+    def _key(self, char: str) -> bool:
+        """Decode key of object with colon after it, following the path key or skipping value of other one."""
+        if char == '}':
+            self._state = 'done'
+            return False
+        try:
+            key, key_end = self._json_decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            self._check_finished()
+            return False
+        colon_position: int = match_end(whitespace_regex, self._buffer, key_end)
+        if colon_position >= len(self._buffer):
+            self._check_finished()
+            return False
+        if self._buffer[colon_position] != ':':
+            raise ForagerError('Colon is expected after key {key} of JSON object.'.format(key=key))
+        self._position = colon_position + 1
+        if key == self.path[self._matched]:
+            self._matched += 1
+            self._state = 'value'
+        else:
+            self._state = 'skip'
+        return True
+
+    def _decode(self) -> Optional[tuple[Any]]:
+        """Decode complete value at position, None if more data is needed, e.g. number can go on in next chunk."""
+        try:
+            some_value, value_end = self._json_decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            self._check_finished()
+            return None
+        if not self._finished and self._buffer[self._position] in number_start_chars:
+            if match_end(number_tail_regex, self._buffer, value_end) == len(self._buffer):
+                return None
+        self._position = value_end
+        if self._state == 'skip':
+            self._state = 'key'
+        return (some_value,)
+
+    def _next_char(self) -> Optional[str]:
+        """Skip whitespace and get the next char, None if more data is needed."""
+        self._position = match_end(whitespace_regex, self._buffer, self._position)
+        if self._position >= len(self._buffer):
+            self._check_finished()
+            return None
+        return self._buffer[self._position]
+
+    def _check_finished(self) -> None:
+        """Raise ForagerError, if more data is needed after the last chunk."""
+        if self._finished:
+            text_start: int = self._position
+            text_end: int = text_start + 50
+            raise ForagerError(
+                'JSON document is truncated or malformed near: {text}'.format(
+                    text=self._buffer[text_start:text_end],
+                ),
+            )
+
+
+def match_end(pattern: re.Pattern, text: str, position: int) -> int:
+    """Get end of pattern match at position, pattern should match empty string."""
+    match: Optional[re.Match] = pattern.match(text, position)
+    return position if match is None else match.end()
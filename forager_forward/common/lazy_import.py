@@ -0,0 +1,37 @@
+"""Lazy import of optional modules of the package, which are executed on the first attribute access."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+_import_lock = threading.RLock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import module lazily: it is registered at once, but executed on the first access to its attribute.
+
+    Imported module is returned as it is. Module, imported lazily, is bound to its parent package as
+    regular import does, so later 'import package.module' gets the same module. Standard library and third
+    party modules should be imported regularly: LazyLoader isn't thread-safe before Python 3.12.
+
+    :param name: str Full name of module.
+    :return: ModuleType Module.
+    """
+    with _import_lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            raise ModuleNotFoundError('No module named {name}'.format(name=name), name=name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        parent_name, _, child_name = name.rpartition('.')
+        if parent_name:
+            setattr(sys.modules[parent_name], child_name, module)
+        return module
@@ -0,0 +1,263 @@
+"""Storage records in memory-mapped file, shared by processes of a host."""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import weakref
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
+
+from forager_forward.common.exceptions import ForagerError, ForagerStorageFullError
+
+shared_magic: bytes = b'FGSHM001'
+shared_header_format: struct.Struct = struct.Struct('<8sQQQ')
+slot_header_format: struct.Struct = struct.Struct('<BHI')
+empty_slot: int = 0
+used_slot: int = 1
+deleted_slot: int = 2
+_open_stores: weakref.WeakValueDictionary[int, SharedStore] = weakref.WeakValueDictionary()
+
+
+class SharedStore(MutableMapping):
+    """
+    Dict-like hash table of JSON records in memory-mapped file, shared by all processes, which open it.
+
+    File has fixed number of fixed size slots, so its size is bounded: record, which doesn't fit the slot,
+    and new record in full table raise ForagerStorageFullError. Reads hold shared flock and writes hold
+    exclusive one, so processes see only complete records. Store is reopened in forked child, so it doesn't
+    share lock of the parent.
+    """
+
+    def __init__(self, path: str, capacity: int = 65536, slot_size: int = 512) -> None:
+        """
+        Open shared file, creating it, if it doesn't exist.
+
+        :param path: str Path to the file, on Linux /dev/shm/... keeps it in shared memory.
+        :param capacity: int Number of slots of new file, at most 3/4 of them are filled.
+        :param slot_size: int Maximum size of record (key and JSON value) in bytes, including 7 bytes header.
+        """
+        self.path: str = path
+        self.capacity: int = capacity
+        self.slot_size: int = slot_size
+        self._thread_lock = threading.Lock()
+        self._open()
+        _open_stores[id(self)] = self
+
+    def __getitem__(self, key: str) -> Any:
+        """Get record of the key or raise KeyError."""
+        with self._locked(fcntl.LOCK_SH):
+            value: Optional[bytes] = self._value(key.encode())
+        if value is None:
+            raise KeyError(key)
+        return json.loads(value)
+
+    def __setitem__(self, key: str, record_data: Any) -> None:
+        """Save record of the key."""
+        record: tuple[bytes, bytes] = self._encode(key, record_data)
+        with self._locked(fcntl.LOCK_EX):
+            self._write(*record)
+
+    def __delitem__(self, key: str) -> None:
+        """Delete record of the key or raise KeyError."""
+        with self._locked(fcntl.LOCK_EX):
+            slot: Optional[int] = self._find(key.encode())
+            if slot is None:
+                raise KeyError(key)
+            slot_header_format.pack_into(self._buffer, self._offset(slot), deleted_slot, 0, 0)
+            self._set_count(self._count() - 1)
+
+    def __contains__(self, key: object) -> bool:
+        """Check record of the key exists."""
+        if not isinstance(key, str):
+            return False
+        with self._locked(fcntl.LOCK_SH):
+            return self._find(key.encode()) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over keys, taken at once."""
+        keys: list[str] = []
+        with self._locked(fcntl.LOCK_SH):
+            for slot in range(self.capacity):
+                state, key_length, _ = slot_header_format.unpack_from(self._buffer, self._offset(slot))
+                if state == used_slot:
+                    key_offset: int = self._offset(slot) + slot_header_format.size
+                    key_end: int = key_offset + key_length
+                    keys.append(self._buffer[key_offset:key_end].decode())
+        return iter(keys)
+
+    def __len__(self) -> int:
+        """Get number of records."""
+        with self._locked(fcntl.LOCK_SH):
+            return self._count()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get record of the key or default, checking and reading it under one lock."""
+        with self._locked(fcntl.LOCK_SH):
+            value: Optional[bytes] = self._value(key.encode())
+        return default if value is None else json.loads(value)
+
+    def insert(self, key: str, record_data: Any) -> bool:
+        """
+        Save record of new key, checking and writing it under one lock, so only one process creates the key.
+
+        :return: bool Record is saved, it is False, if the key exists.
+        :raises ForagerStorageFullError: Record is bigger than slot size or the store is full.
+        """
+        record: tuple[bytes, bytes] = self._encode(key, record_data)
+        with self._locked(fcntl.LOCK_EX):
+            if self._find(record[0]) is not None:
+                return False
+            self._write(*record)
+        return True
+
+    def update_many(self, records: Iterable[tuple[str, Any]]) -> None:
+        """
+        Save many records under one lock, none of them is saved, if they don't fit.
+
+        :param records: Iterable Pairs of key and record.
+        :raises ForagerStorageFullError: Record is bigger than slot size or new records don't fit the store.
+        """
+        encoded: list[tuple[bytes, bytes]] = [self._encode(key, record_data) for key, record_data in records]
+        with self._locked(fcntl.LOCK_EX):
+            new_records: int = sum(self._find(encoded_key) is None for encoded_key, _ in encoded)
+            if self._count() + new_records > self.capacity * 3 // 4:
+                raise ForagerStorageFullError('Shared storage {path} is full.'.format(path=self.path))
+            for record in encoded:
+                self._write(*record)
+
+    def validate_record(self, key: str, record_data: Any) -> None:
+        """Raise ForagerStorageFullError, if record is bigger than slot size."""
+        self._encode(key, record_data)
+
+    def clear(self) -> None:
+        """Delete all records."""
+        with self._locked(fcntl.LOCK_EX):
+            slots_offset: int = shared_header_format.size
+            self._buffer[slots_offset:] = bytes(self.capacity * self.slot_size)
+            self._set_count(0)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._buffer.close()
+        os.close(self._descriptor)
+
+    def reopen(self) -> None:
+        """Open the file again, it is called in forked child, so its lock is separate from the parent one."""
+        self._thread_lock = threading.Lock()
+        self.close()
+        self._open()
+
+    def _open(self) -> None:
+        """Open and map the file, writing header of the new one."""
+        self._descriptor: int = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._descriptor, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._descriptor).st_size == 0:
+                os.ftruncate(self._descriptor, shared_header_format.size + self.capacity * self.slot_size)
+                os.pwrite(
+                    self._descriptor,
+                    shared_header_format.pack(shared_magic, self.capacity, self.slot_size, 0),
+                    0,
+                )
+            header: bytes = os.pread(self._descriptor, shared_header_format.size, 0)
+        finally:
+            fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+        magic, self.capacity, self.slot_size, _ = shared_header_format.unpack(header)
+        if magic != shared_magic:
+            os.close(self._descriptor)
+            raise ForagerError('{path} is not a shared storage file.'.format(path=self.path))
+        self._buffer: mmap.mmap = mmap.mmap(self._descriptor, 0)
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        """Hold thread lock and file lock of given kind."""
+        with self._thread_lock:
+            fcntl.flock(self._descriptor, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+
+    def _encode(self, key: str, record_data: Any) -> tuple[bytes, bytes]:
+        """Encode key and JSON record, checking they fit the slot."""
+        encoded_key: bytes = key.encode()
+        value: bytes = json.dumps(record_data, separators=(',', ':')).encode()
+        if slot_header_format.size + len(encoded_key) + len(value) > self.slot_size:
+            raise ForagerStorageFullError('Record of {key} is bigger than slot size.'.format(key=key))
+        return encoded_key, value
+
+    def _write(self, encoded_key: bytes, value: bytes) -> None:
+        """Write encoded record to its slot, exclusive file lock should be held."""
+        slot: Optional[int] = self._find(encoded_key)
+        if slot is None:
+            if self._count() >= self.capacity * 3 // 4:
+                raise ForagerStorageFullError('Shared storage {path} is full.'.format(path=self.path))
+            slot = self._free_slot(encoded_key)
+            self._set_count(self._count() + 1)
+        slot_offset: int = self._offset(slot)
+        record_offset: int = slot_offset + slot_header_format.size
+        slot_end: int = slot_offset + self.slot_size
+        self._buffer[record_offset:slot_end] = (encoded_key + value).ljust(slot_end - record_offset, b'\0')
+        slot_header_format.pack_into(self._buffer, slot_offset, used_slot, len(encoded_key), len(value))
+
+    def _value(self, key: bytes) -> Optional[bytes]:
+        """Get encoded record of the key, file lock should be held."""
+        slot: Optional[int] = self._find(key)
+        if slot is None:
+            return None
+        _, key_length, value_length = slot_header_format.unpack_from(self._buffer, self._offset(slot))
+        value_offset: int = self._offset(slot) + slot_header_format.size + key_length
+        value_end: int = value_offset + value_length
+        return self._buffer[value_offset:value_end]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        """Find slot of the key by linear probing, file lock should be held."""
+        for slot in self._probe(key):
+            state, key_length, _ = slot_header_format.unpack_from(self._buffer, self._offset(slot))
+            if state == empty_slot:
+                return None
+            key_offset: int = self._offset(slot) + slot_header_format.size
+            key_end: int = key_offset + key_length
+            if state == used_slot and self._buffer[key_offset:key_end] == key:
+                return slot
+        return None
+
+    def _free_slot(self, key: bytes) -> int:
+        """Find the first empty or deleted slot for new key, exclusive file lock should be held."""
+        for slot in self._probe(key):
+            if self._buffer[self._offset(slot)] != used_slot:
+                return slot
+        raise ForagerStorageFullError('Shared storage {path} is full.'.format(path=self.path))
+
+    def _probe(self, key: bytes) -> Iterator[int]:
+        """Iterate over slots of the key, starting from its hash, stable across processes."""
+        start: int = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little') % self.capacity
+        for step in range(self.capacity):
+            yield (start + step) % self.capacity
+
+    def _offset(self, slot: int) -> int:
+        """Get offset of the slot in the file."""
+        return shared_header_format.size + slot * self.slot_size
+
+    def _count(self) -> int:
+        """Get number of records from header."""
+        return shared_header_format.unpack_from(self._buffer)[3]
+
+    def _set_count(self, count: int) -> None:
+        """Write number of records to header."""
+        struct.pack_into('<Q', self._buffer, shared_header_format.size - 8, count)
+
+
+def _reopen_stores() -> None:
+    """Reopen shared stores in forked child."""
+    for store in list(_open_stores.values()):
+        store.reopen()
+
+
+os.register_at_fork(after_in_child=_reopen_stores)
@@ -0,0 +1,124 @@
+"""Memory-mapped binary snapshot of storage records with sorted key index."""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Iterable, Iterator, Optional
+
+from forager_forward.common.exceptions import ForagerError
+
+snapshot_magic: bytes = b'FGSNAP01'
+header_format: struct.Struct = struct.Struct('<8sQQ')
+index_format: struct.Struct = struct.Struct('<QIQI')
+
+
+def write_snapshot(path: str, records: Iterable[tuple[str, Any]]) -> int:
+    """
+    Write records to snapshot file.
+
+    File is header (magic, number of records, index offset), keys and JSON values of records, then index
+    of fixed size entries (key offset and length, value offset and length), sorted by UTF-8 key.
+    File is written to temporary path and renamed, so readers of the previous snapshot aren't broken.
+
+    :param path: str Path to snapshot file.
+    :param records: Iterable Key and JSON serializable value pairs.
+    :return: int Number of written records.
+    """
+    encoded: list[tuple[bytes, Any]] = sorted((key.encode(), record_data) for key, record_data in records)
+    temporary_path: str = '{path}.tmp'.format(path=path)
+    index: bytearray = bytearray()
+    with open(temporary_path, 'wb') as snapshot_file:
+        snapshot_file.write(header_format.pack(snapshot_magic, 0, 0))
+        for key, record_data in encoded:
+            key_offset: int = snapshot_file.tell()
+            snapshot_file.write(key)
+            value: bytes = json.dumps(record_data, separators=(',', ':')).encode()
+            value_offset: int = snapshot_file.tell()
+            snapshot_file.write(value)
+            index += index_format.pack(key_offset, len(key), value_offset, len(value))
+        index_offset: int = snapshot_file.tell()
+        snapshot_file.write(index)
+        snapshot_file.seek(0)
+        snapshot_file.write(header_format.pack(snapshot_magic, len(encoded), index_offset))
+    os.replace(temporary_path, path)
+    return len(encoded)
+
+
+class Snapshot(object):
+    """
+    Read-only snapshot file, mapped to memory.
+
+    Nothing is loaded on open: key is found by binary search over the index, only its value is decoded,
+    pages of the file are read by OS on demand and are shared between processes, mapping the same file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open snapshot file.
+
+        :param path: str Path to snapshot file, written by write_snapshot.
+        """
+        self.path: str = path
+        with open(path, 'rb') as snapshot_file:
+            self._buffer: mmap.mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < header_format.size:
+            raise ForagerError('{path} is not a storage snapshot.'.format(path=path))
+        magic, self._count, self._index_offset = header_format.unpack_from(self._buffer)
+        if magic != snapshot_magic:
+            raise ForagerError('{path} is not a storage snapshot.'.format(path=path))
+
+    def __len__(self) -> int:
+        """Get number of records."""
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        """Check snapshot has record of the key."""
+        return isinstance(key, str) and self._find(key.encode()) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get record of the key.
+
+        :param key: str Record key.
+        :return: Any Decoded record or None.
+        """
+        position: Optional[int] = self._find(key.encode())
+        if position is None:
+            return None
+        _, _, value_offset, value_length = self._entry(position)
+        value_end: int = value_offset + value_length
+        return json.loads(self._buffer[value_offset:value_end])
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over keys in sorted order."""
+        for position in range(self._count):
+            key_offset, key_length, _, _ = self._entry(position)
+            key_end: int = key_offset + key_length
+            yield self._buffer[key_offset:key_end].decode()
+
+    def close(self) -> None:
+        """Unmap snapshot file."""
+        self._buffer.close()
+
+    def _find(self, key: bytes) -> Optional[int]:
+        """Find index position of the key by binary search."""
+        low: int = 0
+        high: int = self._count
+        while low < high:
+            middle: int = (low + high) // 2
+            key_offset, key_length, _, _ = self._entry(middle)
+            key_end: int = key_offset + key_length
+            middle_key: bytes = self._buffer[key_offset:key_end]
+            if middle_key == key:
+                return middle
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _entry(self, position: int) -> tuple[int, int, int, int]:
+        """Get index entry at position."""
+        return index_format.unpack_from(self._buffer, self._index_offset + position * index_format.size)
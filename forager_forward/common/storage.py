@@ -1,16 +1,54 @@
 """Storage for Forager project."""
 from __future__ import annotations
 
-from typing import Any
+import atexit
+import os
+import threading
+import warnings
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from forager_forward.common.exceptions import ForagerKeyError
+from forager_forward.common.change_feed import ChangeFeed, StorageChange
+from forager_forward.common.exceptions import ForagerKeyError, ForagerStorageFullError
+from forager_forward.common.lazy_import import lazy_import
+from forager_forward.common.snapshot import Snapshot, write_snapshot
 from forager_forward.common.validators import common_validators
 
+if TYPE_CHECKING:
+    from forager_forward.common import shared_storage
+else:
+    shared_storage = lazy_import('forager_forward.common.shared_storage')
+
+_removed: object = object()
+_absent: object = object()
+
 
 class Storage(object):
-    """Storage with methods to perform CRUD operations, Singlton."""
+    """
+    Storage with methods to perform CRUD operations, Singlton.
+
+    Records of loaded snapshot are read from memory-mapped file on demand, created and updated records are kept
+    in memory over them, deleted snapshot records are hidden. After share records are kept in shared file,
+    used by all processes of the host, instead of process memory, and new records are created at once, key is
+    checked under the same file lock, so processes don't create the same key. In write-behind mode changes are buffered
+    and applied in batches, batch, which fails to apply, is kept buffered and retried by the next flush, while
+    write-through change, which fails, is rolled back. Applied changes are given to subscribers
+    in order. Forked child doesn't inherit buffered changes of the parent, its flusher is started again.
+    """
 
-    _storage: dict = {}
+    _storage: MutableMapping = {}
+    _shared_store: Optional[shared_storage.SharedStore] = None
+    _snapshot: Optional[Snapshot] = None
+    _deleted: set[str] = set()
+    _pending: dict[str, Any] = {}
+    _changes: list[StorageChange] = []
+    _subscribers: list[Callable[[StorageChange], Any]] = []
+    _sequence: int = 0
+    _batch_size: Optional[int] = None
+    _interval: float = 1.0
+    _flusher: Optional[threading.Thread] = None
+    _stop_flusher: threading.Event = threading.Event()
+    _lock = threading.RLock()
 
     def __new__(cls, *args: Any, **kwargs: Any) -> Storage:
         """Create new instance, if it's None, otherwise use earlier created one."""
@@ -19,34 +57,278 @@ class Storage(object):
         return cls.instance
 
     @property
-    def storage(self) -> dict:
-        """Get local storage."""
+    def storage(self) -> MutableMapping:
+        """Get local storage, records of loaded snapshot aren't in it until they are updated."""
         return self._storage
 
     def create(self, key: str, some_data: Any) -> None:
         """Save arbitrary some_data to storage."""
         common_validators.validate_str('storage_key', key)
-        if key in self._storage:
+        with self._lock:
+            if self._shared_store is not None:
+                created: bool = self._insert_shared(self._shared_store, key, some_data)
+            else:
+                created = not self._contains(key)
+                if created:
+                    self._change('create', key, some_data)
+        if not created:
             raise ForagerKeyError(
                 'Key {key} already presents in storage. Use "update" to modify some_data.'.format(key=key),
             )
-        self._storage[key] = some_data
 
     def read(self, key: str) -> Any:
         """Read value from storage by key."""
         common_validators.validate_str('storage_key', key)
-        return self._storage.get(key)
+        some_data: Any = self._pending.get(key, _absent)
+        if some_data is not _absent:
+            return None if some_data is _removed else some_data
+        some_data = self._storage.get(key, _absent)
+        if some_data is not _absent:
+            return some_data
+        if self._snapshot is None or key in self._deleted:
+            return None
+        return self._snapshot.get(key)
 
     def update(self, key: str, some_data: Any) -> None:
         """Update key some_data."""
         common_validators.validate_str('storage_key', key)
-        if key not in self._storage:
-            raise ForagerKeyError(
-                'key {key} is not in storage. Use "create" operation.'.format(key=key),
-            )
-        self._storage[key] = some_data
+        with self._lock:
+            if not self._contains(key):
+                raise ForagerKeyError(
+                    'key {key} is not in storage. Use "create" operation.'.format(key=key),
+                )
+            self._change('update', key, some_data)
 
     def delete(self, key: str) -> Any:
         """Delete key some_data pair and return some_data."""
-        common_validators.validate_str('storage_key', key)
-        return self._storage.pop(key, None)
+        with self._lock:
+            some_data: Any = self.read(key)
+            if self._contains(key):
+                self._change('delete', key, _removed)
+        return some_data
+
+    def enable_write_behind(self, batch_size: int = 500, interval: float = 1.0) -> None:
+        """
+        Buffer changes and apply them in batches, when batch_size changes are buffered or every interval seconds.
+
+        Buffered changes are visible to reads at once and are applied on exit.
+
+        :param batch_size: int Number of buffered changes, applied at once.
+        :param interval: float Seconds between flushes by background thread.
+        """
+        with self._lock:
+            self._batch_size = batch_size
+            self._interval = interval
+            if self._flusher is None:
+                self._start_flusher()
+                atexit.register(self.flush)
+
+    def disable_write_behind(self) -> None:
+        """Apply buffered changes and apply next changes at once."""
+        with self._lock:
+            self._batch_size = None
+            flusher, self._flusher = self._flusher, None
+        self._stop_flusher.set()
+        if flusher is not None:
+            flusher.join()
+            atexit.unregister(self.flush)
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Apply buffered changes in one batch and give them to subscribers in order, lock is held meanwhile.
+
+        :return: int Number of applied changes.
+        :raises ForagerStorageFullError: Records don't fit shared storage, the batch is kept buffered.
+        """
+        with self._lock:
+            changes: list[StorageChange] = self._changes
+            if not changes:
+                return 0
+            self._apply(self._pending)
+            self._changes = []
+            self._pending = {}
+            self._feed(changes)
+        return len(changes)
+
+    def subscribe(self, subscriber: Optional[Callable[[StorageChange], Any]] = None) -> Callable[[StorageChange], Any]:
+        """
+        Subscribe to applied changes.
+
+        :param subscriber: Callable Called with every StorageChange in order, new ChangeFeed if it isn't given.
+        :return: Callable Subscriber, ChangeFeed can be iterated over.
+        """
+        subscriber = ChangeFeed() if subscriber is None else subscriber
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Callable[[StorageChange], Any]) -> None:
+        """Stop giving changes to subscriber."""
+        self._subscribers.remove(subscriber)
+
+    def share(self, path: str, capacity: int = 65536, slot_size: int = 512) -> None:
+        """
+        Keep records in shared file instead of process memory, records in memory are moved to it.
+
+        Every process of the host should share the same path, before or after fork. Size of the file is
+        bounded, record, which doesn't fit, raises ForagerStorageFullError.
+
+        :param path: str Path to shared file, on Linux /dev/shm/... keeps it in shared memory.
+        :param capacity: int Number of record slots, if the file is created.
+        :param slot_size: int Maximum size of record (key and JSON value) in bytes, if the file is created.
+        """
+        self.flush()
+        shared_store = shared_storage.SharedStore(path, capacity, slot_size)
+        for key, some_data in self._storage.items():
+            if key not in shared_store:
+                shared_store[key] = some_data
+        self._storage = shared_store
+        self._shared_store = shared_store
+
+    def snapshot(self, path: str) -> int:
+        """
+        Write all records, including ones of loaded snapshot, to binary snapshot file.
+
+        :param path: str Path to snapshot file.
+        :return: int Number of written records, they should be JSON serializable.
+        """
+        self.flush()
+        keys: set[str] = set(self._storage)
+        if self._snapshot is not None:
+            keys.update(key for key in self._snapshot.keys() if key not in self._deleted)
+        return write_snapshot(path, ((key, self.read(key)) for key in keys))
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Use snapshot file as records base: they are read on demand, records in memory are kept over them.
+
+        :param path: str Path to snapshot file, written by snapshot.
+        :return: int Number of records in snapshot.
+        """
+        self.flush()
+        self._snapshot = Snapshot(path)
+        self._deleted.clear()
+        return len(self._snapshot)
+
+    def _contains(self, key: str) -> bool:
+        """Check key has record in buffered changes, in memory or in loaded snapshot."""
+        if key in self._pending:
+            return self._pending[key] is not _removed
+        if key in self._storage:
+            return True
+        return self._snapshot is not None and key not in self._deleted and key in self._snapshot
+
+    def _insert_shared(self, store: shared_storage.SharedStore, key: str, some_data: Any) -> bool:
+        """
+        Create record in shared storage, checking its key under the same file lock, lock should be held.
+
+        Buffered changes are flushed before, so changes are applied and fed in order.
+
+        :return: bool Record is created, it is False, if the key exists.
+        """
+        self.flush()
+        if self._snapshot is not None and key not in self._deleted and key in self._snapshot:
+            return False
+        if not store.insert(key, some_data):
+            return False
+        self._sequence += 1
+        self._feed([StorageChange(self._sequence, 'create', key, some_data)])
+        return True
+
+    def _feed(self, changes: list[StorageChange]) -> None:
+        """Give applied changes to subscribers in order, lock should be held."""
+        for subscriber in list(self._subscribers):
+            for change in changes:
+                subscriber(change)
+
+    def _change(self, operation: str, key: str, some_data: Any) -> None:
+        """
+        Buffer change, flushing it at once unless write-behind mode is on, lock should be held.
+
+        Write-through change, which doesn't fit shared storage, is rolled back and error is raised, buffered one
+        is kept for the next flush and warning is given.
+        """
+        if self._shared_store is not None and some_data is not _removed:
+            self._shared_store.validate_record(key, some_data)
+        previous: Any = self._pending.get(key, _absent)
+        self._sequence += 1
+        self._pending[key] = some_data
+        self._changes.append(
+            StorageChange(self._sequence, operation, key, None if some_data is _removed else some_data),
+        )
+        if self._batch_size is None:
+            try:
+                self.flush()
+            except ForagerStorageFullError:
+                self._rollback(key, previous)
+                raise
+        elif len(self._changes) >= self._batch_size:
+            self._flush_buffered()
+
+    def _rollback(self, key: str, previous: Any) -> None:
+        """Remove the last buffered change of key, restoring its previous buffered state, lock should be held."""
+        self._changes.pop()
+        self._sequence -= 1
+        if previous is _absent:
+            self._pending.pop(key, None)
+        else:
+            self._pending[key] = previous
+
+    def _apply(self, records: dict[str, Any]) -> None:
+        """
+        Apply the last states of changed records, removals first to free space, written ones by one update.
+
+        Applying is repeatable, so failed batch can be applied again.
+        """
+        written: list[tuple[str, Any]] = []
+        for key, some_data in records.items():
+            if some_data is _removed:
+                self._storage.pop(key, None)
+                if self._snapshot is not None and key in self._snapshot:
+                    self._deleted.add(key)
+            else:
+                written.append((key, some_data))
+        if self._shared_store is not None:
+            self._shared_store.update_many(written)
+        else:
+            self._storage.update(written)
+        for key, _ in written:
+            self._deleted.discard(key)
+
+    def _start_flusher(self) -> None:
+        """Start background thread, flushing buffered changes, lock should be held."""
+        self._stop_flusher.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(self._interval,), daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self, interval: float) -> None:
+        """Flush buffered changes every interval seconds till write-behind mode is disabled."""
+        while not self._stop_flusher.wait(interval):
+            self._flush_buffered()
+
+    def _flush_buffered(self) -> None:
+        """Flush buffered changes, warning if they don't fit shared storage, they are kept for the next flush."""
+        try:
+            self.flush()
+        except ForagerStorageFullError as error:
+            warnings.warn(str(error), RuntimeWarning)
+
+    def _reset_after_fork(self) -> None:
+        """Replace lock, buffered changes and flusher of the parent in forked child, parent applies the changes."""
+        self._lock = threading.RLock()
+        self._stop_flusher = threading.Event()
+        self._pending = {}
+        self._changes = []
+        self._flusher = None
+        if self._batch_size is not None:
+            self._start_flusher()
+
+
+def _reset_storage() -> None:
+    """Reset write-behind state of storage in forked child."""
+    storage: Optional[Storage] = getattr(Storage, 'instance', None)
+    if storage is not None:
+        storage._reset_after_fork()  # noqa: WPS437
+
+
+os.register_at_fork(after_in_child=_reset_storage)
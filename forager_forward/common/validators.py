@@ -1,17 +1,38 @@
 """Forager project validators."""
+import functools
 import re
 
 from forager_forward.common.exceptions import ArgumentValidationError
 from forager_forward.common.project_types import ValidatorTypeDict
 
-operation_arguments = {
+operation_arguments: dict[str, set[str]] = {
     'domain-search': {'domain', 'company', 'limit', 'offset', 'type', 'seniority', 'department', 'required_field'},
     'email-finder': {'domain', 'company', 'first_name', 'last_name', 'full_name', 'max_duration'},
     'email-verifier': {'email'},
     'email-count': {'domain', 'company', 'type'},
+    'account': set(),
 }
 
 
+@functools.cache
+def email_regex() -> re.Pattern:
+    """Get email regex, compiled on the first call."""
+    specials = re.escape("!#$%&'*+-/=?^_`{|?.")
+    return re.compile(
+        '^(?!['
+        + specials
+        + '])(?!.*['
+        + specials
+        + ']{2})(?!.*['
+        + specials
+        + ']$)[A-Za-z0-9'
+        + specials
+        + ']+(?<!['
+        + specials
+        + '])@[A-Za-z0-9.-]+[.][A-Za-z]{2,4}$',
+    )
+
+
 class CommonValidators(object):
     """General type validators."""
 
@@ -27,22 +48,7 @@ class CommonValidators(object):
 
     def validate_email(self, key: str, param_value: str) -> None:
         """Validate email."""
-        specials = "!#$%&'*+-/=?^_`{|?."
-        specials = re.escape(specials)
-        regex = re.compile(
-            '^(?!['
-            + specials
-            + '])(?!.*['
-            + specials
-            + ']{2})(?!.*['
-            + specials
-            + ']$)[A-Za-z0-9'
-            + specials
-            + ']+(?<!['
-            + specials
-            + '])@[A-Za-z0-9.-]+[.][A-Za-z]{2,4}$',
-        )
-        if not re.fullmatch(regex, param_value):
+        if not email_regex().fullmatch(param_value):
             raise ArgumentValidationError('{key} has invalid value.'.format(key=key))
 
 
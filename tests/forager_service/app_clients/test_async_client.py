@@ -5,7 +5,9 @@ from asgiref.sync import async_to_sync
 from faker import Faker
 
 from forager_forward.client_initializer import ClientInitializer
-from tests.forager_service.conftest import get_query
+from forager_forward.common.bloom_filter import BloomFilter
+from forager_forward.common.exceptions import ForagerAPIError
+from tests.forager_service.conftest import get_api_data, get_query
 
 
 class TestAsyncClientDomainSearch(object):
@@ -96,3 +98,68 @@ class TestAsyncClientEmailCount(object):
         assert operation == 'email-count'
         assert kwargs_dict.get('param_dict')['domain'] == domain
         assert kwargs_dict['raw'] is False
+
+
+class TestAsyncClientVerifyEmails(object):
+    """Class for testing AsyncClient averify_emails method."""
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_averify_emails(
+        self,
+        mock_request: AsyncMock,
+        faker: Faker,
+    ) -> None:
+        """Test averify_emails sends to api only emails without local verdict."""
+        emails: list = [faker.unique.email() for _ in range(5)]
+        role: str = 'info@{domain}'.format(domain=faker.domain_name())
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = get_api_data
+        received_data = async_to_sync(ClientInitializer().client.averify_emails)(emails + [role], concurrency=2)
+        assert list(received_data) == emails + [role]
+        assert received_data[role]['reason'] == 'role'
+        for email in emails:
+            assert received_data[email]['email'] == email
+        assert mock_request.await_count == len(emails) + 1
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_averify_emails_seen(
+        self,
+        mock_request: AsyncMock,
+        faker: Faker,
+    ) -> None:
+        """Test averify_emails gives 'seen' verdict to seen emails and adds verified ones to seen-set."""
+        emails: list = [faker.unique.email() for _ in range(4)]
+        seen = BloomFilter(1000)
+        seen.update(emails[:2])
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = get_api_data
+        received_data = async_to_sync(ClientInitializer().client.averify_emails)(emails, seen=seen)
+        assert list(received_data) == emails
+        assert [received_data[email]['result'] for email in emails[:2]] == ['seen', 'seen']
+        assert mock_request.await_count == 3
+        assert all(email in seen for email in emails)
+        assert len(seen) == 4
+
+
+class TestAsyncClientEmailCountMany(object):
+    """Class for testing AsyncClient aemail_count_many method."""
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_aemail_count_many(
+        self,
+        mock_request: AsyncMock,
+        faker: Faker,
+    ) -> None:
+        """Test aemail_count_many fills table row per domain, keeping errors of failed ones."""
+        domains: list = [faker.unique.domain_name() for _ in range(10)]
+        ClientInitializer().initialize_client('api_key')
+
+        async def count(operation: str, **kwargs: dict) -> dict:
+            if kwargs['param_dict']['domain'] == domains[3]:
+                raise ForagerAPIError({'errors': [{'code': 400}]})
+            return {'total': 7}
+
+        mock_request.side_effect = count
+        table = async_to_sync(ClientInitializer().client.aemail_count_many)(domains, concurrency=4)
+        assert table.columns['total'].tolist() == [7, 7, 7, -1, 7, 7, 7, 7, 7, 7]
+        assert table.errors == {3: {'errors': [{'code': 400}]}}
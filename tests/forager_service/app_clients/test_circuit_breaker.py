@@ -0,0 +1,91 @@
+"""Module for testing CircuitBreaker."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.circuit_breaker import CircuitBreaker, CircuitBreakers
+from forager_forward.app_clients.client import Client
+from forager_forward.common.exceptions import ForagerCircuitOpenError
+
+
+class TestCircuitBreaker(object):
+    """Class for testing CircuitBreaker."""
+
+    def test_open_after_failures(self, faker: Faker) -> None:
+        """Test breaker opens after threshold of consecutive failures."""
+        threshold: int = faker.random_int(min=2, max=5)
+        breaker = CircuitBreaker(failure_threshold=threshold)
+        for _ in range(threshold - 1):
+            breaker.before_call()
+            breaker.record(failed=True)
+        breaker.record(failed=False)
+        assert breaker.state == 'closed'
+        for _ in range(threshold):
+            breaker.record(failed=True)
+        assert breaker.state == 'open'
+        with pytest.raises(ForagerCircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_probe(self) -> None:
+        """Test half-open breaker lets one probe through and is closed by its success."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record(failed=True)
+        assert breaker.state == 'half_open'
+        breaker.before_call()
+        with pytest.raises(ForagerCircuitOpenError):
+            breaker.before_call()
+        breaker.record(failed=False)
+        assert breaker.state == 'closed'
+
+    def test_half_open_probe_failure(self) -> None:
+        """Test failed probe opens breaker again."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0)
+        for _ in range(3):
+            breaker.record(failed=True)
+        breaker.before_call()
+        breaker.recovery_timeout = 60
+        breaker.record(failed=True)
+        assert breaker.state == 'open'
+
+
+class TestClientCircuitBreaker(object):
+    """Class for testing Client circuit breakers."""
+
+    @patch('httpx.AsyncClient.send', new_callable=AsyncMock)
+    @patch('httpx.Client.send')
+    def test_shared_breaker(self, mock_send: MagicMock, mock_asend: AsyncMock, faker: Faker) -> None:
+        """Test sync failures open breaker for async calls of the same operation only."""
+        client = Client('api_key')
+        client.circuit_breakers = CircuitBreakers(failure_threshold=2)
+        mock_send.side_effect = httpx.ConnectError('error')
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                client.email_count(faker.domain_name())
+        with pytest.raises(ForagerCircuitOpenError):
+            async_to_sync(client.aemail_count)(faker.domain_name())
+        assert mock_asend.await_count == 0
+        mock_asend.return_value = httpx.Response(200, json={'data': {}})
+        assert async_to_sync(client.averify_email)(faker.email()) == {}
+        assert client.circuit_breakers.states() == {'email-count': 'open', 'email-verifier': 'closed'}
+
+    @patch('httpx.AsyncClient.send', new_callable=AsyncMock)
+    @patch('httpx.Client.send')
+    def test_open_breaker_skips_scheduler(self, mock_send: MagicMock, mock_asend: AsyncMock, faker: Faker) -> None:
+        """Test open breaker rejects requests before they wait for and spend rate budget."""
+        client = Client('api_key')
+        client.circuit_breakers = CircuitBreakers(failure_threshold=1)
+        mock_send.side_effect = httpx.ConnectError('error')
+        with pytest.raises(httpx.ConnectError):
+            client.email_count(faker.domain_name())
+        with patch.object(client.scheduler, 'acquire') as mock_acquire:
+            with patch.object(client.scheduler, 'aacquire', new_callable=AsyncMock) as mock_aacquire:
+                with pytest.raises(ForagerCircuitOpenError):
+                    client.email_count(faker.domain_name())
+                with pytest.raises(ForagerCircuitOpenError):
+                    async_to_sync(client.aemail_count)(faker.domain_name())
+        mock_acquire.assert_not_called()
+        mock_aacquire.assert_not_awaited()
+        assert mock_asend.await_count == 0
@@ -0,0 +1,71 @@
+"""Module for testing AdaptiveConcurrencyLimiter."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.concurrency import AdaptiveConcurrencyLimiter
+
+
+async def hold_slots(limiter: AdaptiveConcurrencyLimiter, number: int) -> int:
+    """Acquire slots concurrently, return maximal number of slots in flight."""
+    max_in_flight: int = 0
+
+    async def hold() -> None:
+        nonlocal max_in_flight
+        acquired_at: float = await limiter.acquire()
+        max_in_flight = max(max_in_flight, limiter.metrics()['in_flight'])
+        await asyncio.sleep(0)
+        limiter.release(acquired_at, overloaded=False)
+
+    await asyncio.gather(*(hold() for _ in range(number)))
+    return max_in_flight
+
+
+class TestAdaptiveConcurrencyLimiter(object):
+    """Class for testing AdaptiveConcurrencyLimiter."""
+
+    def test_limit_in_flight(self, faker: Faker) -> None:
+        """Test number of requests in flight doesn't exceed the limit."""
+        initial_limit: int = faker.random_int(min=2, max=5)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=initial_limit, max_limit=initial_limit)
+        assert async_to_sync(hold_slots)(limiter, 20) == initial_limit
+        assert limiter.metrics()['in_flight'] == 0
+
+    def test_additive_increase(self) -> None:
+        """Test limit grows by about one per limit of healthy responses."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        for _ in range(5):
+            limiter.release(limiter_acquire(limiter) - 0.05, overloaded=False)  # steady latency, not timer jitter
+        assert limiter.limit == 5
+
+    def test_multiplicative_decrease(self) -> None:
+        """Test limit is halved once per window of overloaded responses."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16)
+        acquired: list = [limiter_acquire(limiter) for _ in range(3)]
+        for acquired_at in acquired:
+            limiter.release(acquired_at, overloaded=True)
+        assert limiter.limit == 8
+        assert limiter.metrics()['decreases'] == 1
+        limiter.release(limiter_acquire(limiter), overloaded=True)
+        assert limiter.limit == 4
+
+
+class TestClientConcurrency(object):
+    """Class for testing Client adaptive concurrency."""
+
+    @patch('httpx.AsyncClient.send', new_callable=AsyncMock)
+    def test_backoff(self, mock_send: AsyncMock, faker: Faker) -> None:
+        """Test 429 response decreases the limit."""
+        client = Client([faker.pystr(min_chars=5) for _ in range(2)])
+        mock_send.side_effect = [httpx.Response(429, json={}), httpx.Response(200, json={'data': {}})]
+        async_to_sync(client.aemail_count)(faker.domain_name())
+        assert client.concurrency_limiter.limit == 5
+
+
+def limiter_acquire(limiter: AdaptiveConcurrencyLimiter) -> float:
+    """Acquire slot synchronously."""
+    return async_to_sync(limiter.acquire)()
@@ -0,0 +1,31 @@
+"""Module for testing EmailCountTable."""
+import io
+
+from forager_forward.app_clients.count_table import EmailCountTable
+
+
+class TestEmailCountTable(object):
+    """Class for testing EmailCountTable."""
+
+    def test_fill(self) -> None:
+        """Test email_count data is flattened to columns, missing rows keep -1."""
+        table = EmailCountTable(['a.com', 'b.com', 'c.com'])
+        table.fill(0, {'total': 5, 'personal_emails': 3, 'generic_emails': 2, 'department': {'it': 2, 'ops': 1}})
+        table.fail(2, {'errors': [{'code': 400}]})
+        assert table.columns['total'].tolist() == [5, -1, -1]
+        assert table.row(0)['department_it'] == 2
+        assert table.row(0)['seniority_junior'] == -1
+        assert [row['domain'] for row in table.rows()] == ['a.com', 'b.com', 'c.com']
+
+    def test_to_csv(self) -> None:
+        """Test CSV export with empty cells for missing counts."""
+        table = EmailCountTable(['a.com', 'b.com'])
+        table.fill(0, {'total': 5, 'seniority': {'senior': 4}})
+        table.fail(1, {'errors': []})
+        output = io.StringIO()
+        table.to_csv(output)
+        lines: list[str] = output.getvalue().splitlines()
+        assert lines[0].startswith('domain,total,personal_emails,generic_emails,department_executive')
+        assert lines[1].startswith('a.com,5,,,')
+        assert ',4,,' in lines[1]
+        assert lines[2].endswith(',"{""errors"": []}"')
@@ -0,0 +1,71 @@
+"""Module for testing CreditLedger functionality."""
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.credit_ledger import CreditLedger
+from forager_forward.common.exceptions import ForagerBudgetError
+from tests.forager_service.conftest import get_query
+
+
+def make_account(searches: int, verifications: int) -> dict:
+    """Create 'account' operation data with given available requests."""
+    return {
+        'requests': {
+            'searches': {'used': 0, 'available': searches},
+            'verifications': {'used': 0, 'available': verifications},
+        },
+    }
+
+
+class TestCreditLedger(object):
+    """Class for testing CreditLedger."""
+
+    def test_charge(self, faker: Faker) -> None:
+        """Test balance is decremented per operation type."""
+        searches: int = faker.random_int(min=5, max=50)
+        ledger = CreditLedger()
+        ledger.refresh([make_account(searches, 0), make_account(searches, 0)])
+        ledger.charge('email-finder')
+        ledger.charge('email-count')
+        assert ledger.remaining('domain-search') == searches * 2 - 1
+        assert ledger.remaining('email-count') is None
+        assert ledger.spent() == {'email-finder': 1}
+
+    def test_check_budget(self, faker: Faker) -> None:
+        """Test batch is refused or cut to affordable size."""
+        verifications: int = faker.random_int(min=1, max=50)
+        ledger = CreditLedger()
+        assert ledger.needs_refresh() is True
+        ledger.refresh([make_account(0, verifications)])
+        assert ledger.needs_refresh() is False
+        assert ledger.check_budget('email-verifier', verifications + 10, strict=False) == verifications
+        with pytest.raises(ForagerBudgetError):
+            ledger.check_budget('email-verifier', verifications + 1)
+
+
+class TestClientBudget(object):
+    """Class for testing Client credit accounting."""
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_account(self, mock_request: MagicMock) -> None:
+        """Test account method."""
+        mock_request.side_effect = get_query
+        operation, kwargs = Client('api_key').account()
+        assert operation == 'account'
+        assert kwargs['param_dict'] == {}
+
+    @patch('httpx.Client.send')
+    def test_check_budget(self, mock_send: MagicMock, faker: Faker) -> None:
+        """Test balance is refreshed from the api and charged after requests."""
+        client = Client('api_key')
+        mock_send.side_effect = [
+            httpx.Response(200, json={'data': make_account(3, 0)}),
+            httpx.Response(200, json={'data': {'email': faker.email()}}),
+        ]
+        assert client.check_budget('domain-search', 3) == 3
+        client.domain_search(faker.domain_name())
+        assert client.check_budget('domain-search', 3, strict=False) == 2
@@ -0,0 +1,51 @@
+"""Module for testing pooled http clients and HTTP/2 mode."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+
+from forager_forward.app_clients.client import Client
+
+
+async def get_async_http_clients(client: Client) -> tuple:
+    """Get async http client of the running loop twice, then close it."""
+    async_http_clients: tuple = (client.async_http_client, client.async_http_client)
+    await client.aclose()
+    return async_http_clients
+
+
+class TestHttpClients(object):
+    """Class for testing pooled http clients."""
+
+    def test_async_http_client(self) -> None:
+        """Test async http client is shared within event loop and isn't shared between loops."""
+        client = Client('api_key')
+        first_clients: tuple = async_to_sync(get_async_http_clients)(client)
+        second_clients: tuple = async_to_sync(get_async_http_clients)(client)
+        assert first_clients[0] is first_clients[1]
+        assert first_clients[0].is_closed
+        assert second_clients[0] is not first_clients[0]
+
+    @patch('httpx.AsyncClient')
+    @patch('httpx.Client')
+    @patch('forager_forward.app_clients.base.http2_available', return_value=True)
+    def test_http2(self, mock_available: MagicMock, mock_client: MagicMock, mock_async_client: MagicMock) -> None:
+        """Test HTTP/2 mode and the same pool limits are passed to sync and async http clients."""
+        client = Client('api_key', http2=True)
+        assert client.http2 is True
+        assert client.http_client is mock_client.return_value
+        assert mock_client.call_args.kwargs['http2'] is True
+        mock_async_client.return_value.aclose = AsyncMock()
+        async_to_sync(get_async_http_clients)(client)
+        assert mock_async_client.call_args.kwargs['http2'] is True
+        assert mock_async_client.call_args.kwargs['limits'] == mock_client.call_args.kwargs['limits']
+
+    @patch('forager_forward.app_clients.base.http2_available', return_value=False)
+    def test_http2_fallback(self, mock_available: MagicMock) -> None:
+        """Test HTTP/1.1 is used with warning if 'h2' package isn't installed."""
+        with pytest.warns(RuntimeWarning):
+            client = Client('api_key', http2=True)
+        assert client.http2 is False
+        assert isinstance(client.http_client, httpx.Client)
+        client.close()
@@ -0,0 +1,75 @@
+"""Module for testing ApiKeyPool functionality."""
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.key_pool import ApiKeyPool, default_cooldown
+from forager_forward.common.exceptions import ArgumentError, ForagerQuotaError
+
+
+def make_response(status_code: int, remaining: int | None = None) -> httpx.Response:
+    """Create response with rate limit headers."""
+    headers: dict = {} if remaining is None else {'X-RateLimit-Remaining': str(remaining)}
+    return httpx.Response(status_code, headers=headers, json={'data': {'status': status_code}})
+
+
+class TestApiKeyPool(object):
+    """Class for testing ApiKeyPool."""
+
+    def test_acquire_most_remaining(self, faker: Faker) -> None:
+        """Test acquire chooses key with the biggest remaining budget."""
+        keys: list = [faker.pystr(min_chars=5) for _ in range(3)]
+        pool = ApiKeyPool(keys)
+        for index, api_key in enumerate(keys):
+            pool.record_response(api_key, make_response(200, remaining=index * 10))
+        assert pool.acquire() == keys[2]
+        assert pool.usage()[keys[2]]['requests'] == 1
+
+    def test_quota_exhaustion(self, faker: Faker) -> None:
+        """Test exhausted key is skipped until cooldown ends."""
+        keys: list = [faker.pystr(min_chars=5) for _ in range(2)]
+        pool = ApiKeyPool(keys)
+        assert pool.record_response(keys[0], make_response(429)) is True
+        assert pool.acquire() == keys[1]
+        assert pool.usage()[keys[0]]['exhausted'] is True
+        with pytest.raises(ForagerQuotaError):
+            pool.acquire(exclude={keys[1]})
+
+    def test_cooldown(self, faker: Faker) -> None:
+        """Test key without reset header is skipped for configured cooldown only."""
+        api_key: str = faker.pystr(min_chars=5)
+        pool = ApiKeyPool([api_key], cooldown=0.01)
+        pool.record_response(api_key, make_response(429))
+        with pytest.raises(ForagerQuotaError):
+            pool.acquire()
+        time.sleep(0.02)
+        assert pool.acquire() == api_key
+
+    def test_empty_pool(self) -> None:
+        """Test pool without keys raises error."""
+        with pytest.raises(ArgumentError):
+            ApiKeyPool([])
+
+
+class TestClientKeyFailover(object):
+    """Class for testing Client api key failover."""
+
+    @patch('httpx.Client.send')
+    def test_failover(self, mock_send: MagicMock, faker: Faker) -> None:
+        """Test request is repeated with another key after quota exhaustion."""
+        keys: list = [faker.pystr(min_chars=5) for _ in range(2)]
+        client = Client(keys)
+        mock_send.side_effect = [make_response(429), make_response(200, remaining=5)]
+        assert client.email_count(faker.domain_name()) == {'status': 200}
+        used_keys: list = [call.args[0].url.params['api_key'] for call in mock_send.call_args_list]
+        assert sorted(used_keys) == sorted(keys)
+        assert client.key_usage()[used_keys[1]]['remaining'] == 5
+
+    def test_key_cooldown(self) -> None:
+        """Test client passes key cooldown to its key pool."""
+        assert Client('api_key').key_pool.cooldown == default_cooldown
+        assert Client('api_key', key_cooldown=5).key_pool.cooldown == 5
@@ -0,0 +1,76 @@
+"""Module for testing negative cache of api errors."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.negative_cache import NegativeCache, error_status
+from forager_forward.common.exceptions import (
+    ForagerAPIError,
+    ForagerQuotaError,
+    ForagerVerificationPendingError,
+)
+
+not_found: dict = {'errors': [{'id': 'not_found', 'code': 404, 'details': 'No result.'}]}
+server_error: dict = {'errors': [{'id': 'server_error', 'code': 503}]}
+
+
+class TestNegativeCache(object):
+    """Class for testing NegativeCache."""
+
+    def test_error_status(self) -> None:
+        """Test status is read from api error payload."""
+        assert error_status(not_found) == 404
+        assert error_status({'errors': []}) is None
+        assert error_status('error') is None
+
+    @patch('time.monotonic')
+    def test_ttls(self, mock_monotonic: MagicMock) -> None:
+        """Test permanent errors are re-raised longer than transient ones, domain case doesn't matter."""
+        cache = NegativeCache(permanent_ttl=100, transient_ttl=10)
+        mock_monotonic.return_value = 0
+        assert cache.remember('email-count', {'domain': 'Company.com'}, ForagerAPIError(not_found))
+        assert cache.remember('email-count', {'domain': 'other.com'}, ForagerAPIError(server_error))
+        mock_monotonic.return_value = 50
+        with pytest.raises(ForagerAPIError) as error_info:
+            cache.check('email-count', {'domain': 'company.com '})
+        assert error_info.value.args[0] == not_found
+        cache.check('email-count', {'domain': 'other.com'})
+        assert cache.metrics() == {'hits': 1, 'permanent': 1, 'transient': 1, 'entries': 1}
+
+    def test_uncached(self) -> None:
+        """Test key, quota and pending errors aren't cached, the least recently used errors are evicted."""
+        cache = NegativeCache(max_entries=1)
+        assert not cache.remember('email-count', {}, ForagerAPIError({'errors': [{'code': 429}]}))
+        assert not cache.remember('email-count', {}, ForagerQuotaError(server_error))
+        assert not cache.remember('email-verifier', {}, ForagerVerificationPendingError({}))
+        cache.remember('email-count', {'domain': 'a.com'}, ForagerAPIError(not_found))
+        cache.remember('email-count', {'domain': 'b.com'}, ForagerAPIError(not_found))
+        cache.check('email-count', {'domain': 'a.com'})
+        assert cache.metrics()['entries'] == 1
+
+
+class TestClientNegativeCache(object):
+    """Class for testing client requests with negative cache."""
+
+    @patch('forager_forward.app_clients.base.BaseClient._request', side_effect=ForagerAPIError(not_found))
+    def test_cached_error(self, mock_request: MagicMock) -> None:
+        """Test cached error is re-raised without request."""
+        client = Client('api_key')
+        client.negative_cache = NegativeCache()
+        for _ in range(2):
+            with pytest.raises(ForagerAPIError):
+                client.email_finder(domain='company.com', full_name='John Doe')
+        mock_request.assert_called_once()
+
+    @patch('forager_forward.app_clients.base.BaseClient._arequest', new_callable=AsyncMock)
+    def test_async_cached_error(self, mock_request: AsyncMock) -> None:
+        """Test cached error is re-raised by async call without request."""
+        mock_request.side_effect = ForagerAPIError(not_found)
+        client = Client('api_key')
+        client.negative_cache = NegativeCache()
+        for _ in range(2):
+            with pytest.raises(ForagerAPIError):
+                async_to_sync(client.aemail_count)(domain='company.com')
+        mock_request.assert_awaited_once()
@@ -0,0 +1,76 @@
+"""Module for testing record/replay transport."""
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.replay_transport import ReplayTransport, request_key
+from forager_forward.common.exceptions import (
+    ArgumentValidationError,
+    ForagerReplayError,
+)
+
+
+def api_response(request: httpx.Request) -> httpx.Response:
+    """Answer request with its domain param as api would."""
+    return httpx.Response(200, json={'data': {'domain': request.url.params['domain'], 'total': 5}})
+
+
+async def count_and_close(client: Client, domain: str) -> dict:
+    """Get async email_count, then close async http client."""
+    count_data: dict = await client.aemail_count(domain=domain)  # type: ignore
+    await client.aclose()
+    return count_data
+
+
+class TestReplayTransport(object):
+    """Class for testing ReplayTransport."""
+
+    def test_request_key(self) -> None:
+        """Test request key doesn't depend on api key and order of params."""
+        url: str = 'https://api.hunter.io/v2/email-count'
+        first_request = httpx.Request('GET', url, params={'domain': 'a.com', 'type': 'personal', 'api_key': '1'})
+        second_request = httpx.Request('GET', url, params={'api_key': '2', 'type': 'personal', 'domain': 'a.com'})
+        expected_key: str = 'GET /v2/email-count?domain=a.com&type=personal'
+        assert request_key(first_request) == request_key(second_request) == expected_key
+
+    def test_record_replay(self, tmp_path: Path) -> None:
+        """Test responses, recorded by sync and async clients, are replayed offline with another api key."""
+        path: str = str(tmp_path / 'fixtures.json.gz')
+        recording_transport = ReplayTransport(path, 'record', upstream=httpx.MockTransport(api_response))
+        recording_client = Client('api_key', transport=recording_transport)
+        assert recording_client.email_count(domain='a.com') == {'domain': 'a.com', 'total': 5}
+        assert async_to_sync(count_and_close)(recording_client, 'b.com') == {'domain': 'b.com', 'total': 5}
+        recording_client.close()
+        transport = ReplayTransport(path)
+        assert len(transport) == 2
+        client = Client('another_api_key', transport=transport)
+        assert client.email_count(domain='a.com') == {'domain': 'a.com', 'total': 5}
+        assert async_to_sync(count_and_close)(client, 'b.com') == {'domain': 'b.com', 'total': 5}
+        assert transport.stats == {'replayed': 2, 'recorded': 0, 'missing': 0}
+
+    def test_missing(self, tmp_path: Path) -> None:
+        """Test request without recorded response raises ForagerReplayError."""
+        client = Client('api_key', transport=ReplayTransport(str(tmp_path / 'fixtures.json.gz')))
+        with pytest.raises(ForagerReplayError):
+            client.email_count(domain='a.com')
+
+    @patch('time.sleep')
+    def test_latency(self, mock_sleep: MagicMock, tmp_path: Path) -> None:
+        """Test replayed response is delayed."""
+        path: str = str(tmp_path / 'fixtures.json.gz')
+        recording_transport = ReplayTransport(path, 'record', upstream=httpx.MockTransport(api_response))
+        with httpx.Client(transport=recording_transport) as http_client:
+            http_client.get('https://api.hunter.io/v2/email-count', params={'domain': 'a.com'})
+        with httpx.Client(transport=ReplayTransport(path, latency=0.2)) as http_client:
+            response: httpx.Response = http_client.get('https://api.hunter.io/v2/email-count?domain=a.com')
+        assert response.json()['data']['domain'] == 'a.com'
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_wrong_mode(self, tmp_path: Path) -> None:
+        """Test unknown mode raises ArgumentValidationError."""
+        with pytest.raises(ArgumentValidationError):
+            ReplayTransport(str(tmp_path / 'fixtures.json.gz'), 'live')
@@ -0,0 +1,127 @@
+"""Module for testing two-tier response cache."""
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from asgiref.sync import async_to_sync
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.response_cache import ResponseCache
+
+count_options: dict = {'param_dict': {'domain': 'company.com'}, 'deadline': None}
+
+
+async def count_twice(client: Client) -> tuple[Any, Any]:
+    """Get email_count twice and let refresh tasks finish."""
+    first_data: Any = await client.aemail_count(domain='company.com')
+    second_data: Any = await client.aemail_count(domain='company.com')
+    await asyncio.gather(*client._refresh_tasks)
+    return first_data, second_data
+
+
+class TestResponseCache(object):
+    """Class for testing ResponseCache."""
+
+    def test_memory_tier(self) -> None:
+        """Test cached data is returned fresh and key doesn't depend on deadline."""
+        cache = ResponseCache()
+        assert cache.get('email-count', count_options) is None
+        cache.set('email-count', count_options, {'total': 5})
+        assert cache.get('email-count', {'param_dict': {'domain': 'company.com'}, 'deadline': 3}) == (
+            {'total': 5},
+            False,
+        )
+        assert cache.metrics()['hits'] == 1
+        assert cache.metrics()['misses'] == 1
+
+    def test_disk_tier(self, tmp_path: Path) -> None:
+        """Test entries are kept in SQLite file across cache instances."""
+        path: str = str(tmp_path / 'cache.sqlite')
+        first_cache = ResponseCache(path)
+        first_cache.set('domain-search', count_options, {'emails': []})
+        first_cache.close()
+        second_cache = ResponseCache(path)
+        assert second_cache.get('domain-search', count_options) == ({'emails': []}, False)
+        assert second_cache.metrics()['memory_entries'] == 1
+        second_cache.close()
+
+    def test_stale(self) -> None:
+        """Test entry is stale after ttl and missing after stale_ttl."""
+        cache = ResponseCache(ttls={'email-count': 10}, stale_ttl=10)
+        with patch('time.time', return_value=100):
+            cache.set('email-count', count_options, {'total': 5})
+        with patch('time.time', return_value=115):
+            assert cache.get('email-count', count_options) == ({'total': 5}, True)
+        with patch('time.time', return_value=125):
+            assert cache.get('email-count', count_options) is None
+
+    def test_memory_eviction(self, tmp_path: Path) -> None:
+        """Test least recently used entries are evicted from memory, but are read from disk."""
+        cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+        for domain in ('a.com', 'b.com', 'c.com'):
+            cache.set('email-count', {'param_dict': {'domain': domain}}, {'domain': domain})
+        assert cache.metrics()['memory_entries'] == 2
+        assert cache.get('email-count', {'param_dict': {'domain': 'a.com'}}) == ({'domain': 'a.com'}, False)
+        cache.close()
+
+    def test_compact(self, tmp_path: Path) -> None:
+        """Test compaction deletes unusable entries and the oldest ones above the bound."""
+        cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_disk_entries=2, ttls={'email-count': 10}, stale_ttl=0)
+        with patch('time.time', return_value=time.time() - 20):
+            cache.set('email-count', {'param_dict': {'domain': 'old.com'}}, {})
+        for domain in ('a.com', 'b.com', 'c.com'):
+            cache.set('email-count', {'param_dict': {'domain': domain}}, {})
+        assert cache.compact() == 2
+        assert cache.metrics()['disk_entries'] == 2
+        cache.close()
+
+    def test_background_compaction(self, tmp_path: Path) -> None:
+        """Test compaction is started in background after compact_every writes."""
+        cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_disk_entries=1, compact_every=2)
+        with patch('threading.Thread') as mock_thread:
+            cache.set('email-count', {'param_dict': {'domain': 'a.com'}}, {})
+            mock_thread.assert_not_called()
+            cache.set('email-count', {'param_dict': {'domain': 'b.com'}}, {})
+        mock_thread.return_value.start.assert_called_once()
+        cache.close()
+
+
+class TestClientResponseCache(object):
+    """Class for testing client requests with response cache."""
+
+    @patch('forager_forward.app_clients.base.BaseClient._request', return_value={'total': 5})
+    def test_cached_request(self, mock_request: MagicMock) -> None:
+        """Test cacheable request is performed once, raw and not cacheable ones aren't cached."""
+        client = Client('api_key')
+        client.response_cache = ResponseCache()
+        assert client.email_count(domain='company.com') == {'total': 5}
+        assert client.email_count(domain='company.com') == {'total': 5}
+        assert mock_request.call_count == 1
+        client.email_count(domain='company.com', raw=True)
+        client.verify_email('test@company.com')
+        client.verify_email('test@company.com')
+        assert mock_request.call_count == 4
+
+    @patch('forager_forward.app_clients.base.BaseClient._request', return_value={'total': 6})
+    def test_stale_refresh(self, mock_request: MagicMock) -> None:
+        """Test stale data is returned at once and refreshed in the thread pool."""
+        client = Client('api_key')
+        client.response_cache = ResponseCache(ttls={'email-count': 0})
+        client.response_cache.set('email-count', count_options, {'total': 5})
+        assert client.email_count(domain='company.com') == {'total': 5}
+        client.executor.shutdown(wait=True)
+        mock_request.assert_called_once()
+        assert client.response_cache.get('email-count', count_options)[0] == {'total': 6}
+        assert not client._refreshing
+
+    @patch('forager_forward.app_clients.base.BaseClient._arequest', new_callable=AsyncMock, return_value={'total': 6})
+    def test_async_stale_refresh(self, mock_request: AsyncMock) -> None:
+        """Test stale data is returned at once and refreshed once by a task."""
+        client = Client('api_key')
+        client.response_cache = ResponseCache(ttls={'email-count': 0})
+        client.response_cache.set('email-count', count_options, {'total': 5})
+        assert async_to_sync(count_twice)(client) == ({'total': 5}, {'total': 5})
+        mock_request.assert_awaited_once()
+        assert client.response_cache.get('email-count', count_options)[0] == {'total': 6}
@@ -0,0 +1,94 @@
+"""Module for testing RequestScheduler."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.scheduler import (
+    RequestScheduler,
+    current_priority,
+    request_priority,
+)
+from forager_forward.common.exceptions import ArgumentValidationError
+from tests.forager_service.conftest import get_api_data
+
+
+async def serve_order(scheduler: RequestScheduler, classes: list) -> list:
+    """Queue requests of given priority classes, return order they were served in."""
+    order: list = []
+
+    async def request(priority_class: str) -> None:
+        with request_priority(priority_class):
+            await scheduler.aacquire()
+        order.append(priority_class)
+
+    tasks: list = []
+    for priority_class in classes:
+        tasks.append(asyncio.create_task(request(priority_class)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestRequestScheduler(object):
+    """Class for testing RequestScheduler."""
+
+    def test_rate(self) -> None:
+        """Test requests above burst wait for tokens."""
+        scheduler = RequestScheduler(rate=100, burst=1)
+        started_at: float = time.monotonic()
+        for _ in range(6):
+            scheduler.acquire()
+        assert time.monotonic() - started_at >= 0.04
+        assert scheduler.metrics()['normal']['served'] == 6
+
+    def test_weighted_fair_queuing(self) -> None:
+        """Test interactive request overtakes queued bulk requests."""
+        scheduler = RequestScheduler(rate=200, burst=1)
+        order: list = async_to_sync(serve_order)(scheduler, ['bulk'] * 5 + ['interactive'])
+        assert order.index('interactive') <= 2
+        metrics: dict = scheduler.metrics()
+        assert metrics['bulk']['served'] == 5
+        assert metrics['bulk']['queued'] == 0
+        assert metrics['bulk']['wait_max'] >= metrics['interactive']['wait_max']
+
+    def test_threads(self) -> None:
+        """Test blocked threads are served."""
+        scheduler = RequestScheduler(rate=200, burst=1)
+        threads: list = [threading.Thread(target=scheduler.acquire) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+        assert scheduler.metrics()['normal']['served'] == 5
+
+    def test_priority_error(self) -> None:
+        """Test unknown priority class."""
+        with pytest.raises(ArgumentValidationError):
+            with request_priority('urgent'):
+                pass  # noqa: WPS420
+
+
+class TestClientPriority(object):
+    """Class for testing Client priority classes."""
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_bulk_priority(self, mock_request: MagicMock, faker: Faker) -> None:
+        """Test verify_emails requests are performed with bulk priority."""
+        priorities: list = []
+
+        def perform_request(operation: str, **kwargs: dict) -> dict:
+            priorities.append(current_priority.get())
+            return get_api_data(operation, **kwargs)
+
+        mock_request.side_effect = perform_request
+        client = Client('api_key')
+        with client.priority('interactive'):
+            client.verify_email(faker.email())
+            client.verify_emails([faker.email()])
+        assert priorities == ['interactive', 'interactive', 'bulk']
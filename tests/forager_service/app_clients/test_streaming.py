@@ -0,0 +1,103 @@
+"""Module for testing streamed domain search."""
+import json
+from typing import AsyncIterator, Iterator
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.negative_cache import NegativeCache
+from forager_forward.app_clients.response_cache import ResponseCache
+from forager_forward.common.exceptions import ForagerAPIError
+
+
+class ChunkedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body, given by chunks, counting read ones."""
+
+    def __init__(self, body: bytes, chunk_size: int = 100) -> None:
+        """Split body into chunks."""
+        self.chunks: list = [body[start:][:chunk_size] for start in range(0, len(body), chunk_size)]
+        self.read_chunks: int = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Give chunks."""
+        for chunk in self.chunks:
+            self.read_chunks += 1
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Give chunks to async client."""
+        for chunk in self.chunks:
+            self.read_chunks += 1
+            yield chunk
+
+
+def domain_search_body(faker: Faker, count: int) -> tuple[list, bytes]:
+    """Get email records and domain-search response body with them."""
+    emails: list = [{'value': faker.unique.email(), 'sources': [{'uri': faker.uri()}] * 10} for _ in range(count)]
+    return emails, json.dumps({'data': {'domain': faker.domain_name(), 'emails': emails}, 'meta': {}}).encode()
+
+
+async def collect(client: Client, domain: str) -> list:
+    """Get all records of async streamed domain search, then close async http client."""
+    emails: list = [email async for email in client.adomain_search_stream(domain=domain, limit=100)]
+    await client.aclose()
+    return emails
+
+
+class TestDomainSearchStream(object):
+    """Class for testing domain_search_stream and adomain_search_stream."""
+
+    def test_domain_search_stream(self, faker: Faker) -> None:
+        """Test records are given before the whole body is read."""
+        emails, body = domain_search_body(faker, 50)
+        stream = ChunkedStream(body)
+        client = Client('api_key', transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=stream)))
+        records = client.domain_search_stream(domain=faker.domain_name(), limit=100)
+        assert next(records) == emails[0]
+        assert stream.read_chunks < len(stream.chunks)
+        assert [emails[0], *records] == emails
+        assert client.credit_ledger.spent() == {'domain-search': 1}
+
+    def test_adomain_search_stream(self, faker: Faker) -> None:
+        """Test async records are the same as in body."""
+        emails, body = domain_search_body(faker, 50)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=ChunkedStream(body)))
+        assert async_to_sync(collect)(Client('api_key', transport=transport), faker.domain_name()) == emails
+
+    def test_domain_search_stream_error(self, faker: Faker) -> None:
+        """Test api error is raised and remembered by negative cache."""
+        calls: list = []
+        error_data: dict = {'errors': [{'id': 'wrong_params', 'code': 400, 'details': 'Wrong domain'}]}
+        transport = httpx.MockTransport(lambda request: calls.append(request) or httpx.Response(400, json=error_data))
+        client = Client('api_key', transport=transport)
+        client.negative_cache = NegativeCache()
+        domain: str = faker.domain_name()
+        for _ in range(2):
+            with pytest.raises(ForagerAPIError) as error:
+                list(client.domain_search_stream(domain=domain))
+            assert error.value.args[0] == error_data
+        assert len(calls) == 1
+
+    def test_domain_search_stream_not_json_error(self, faker: Faker) -> None:
+        """Test error response, which body isn't JSON, raises ForagerAPIError with its status."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(502, text='<html>Bad Gateway</html>'))
+        client = Client('api_key', transport=transport)
+        with pytest.raises(ForagerAPIError) as error:
+            list(client.domain_search_stream(domain=faker.domain_name()))
+        assert error.value.args[0]['errors'][0]['code'] == 502
+
+    def test_domain_search_stream_cached(self, faker: Faker) -> None:
+        """Test records of page, cached by response_cache, are given without request by sync and async streams."""
+        calls: list = []
+        emails, body = domain_search_body(faker, 5)
+        transport = httpx.MockTransport(lambda request: calls.append(request) or httpx.Response(200, content=body))
+        client = Client('api_key', transport=transport)
+        client.response_cache = ResponseCache()
+        domain: str = faker.domain_name()
+        client.domain_search(domain=domain, limit=100)
+        assert list(client.domain_search_stream(domain=domain, limit=100)) == emails
+        assert async_to_sync(collect)(client, domain) == emails
+        assert len(calls) == 1
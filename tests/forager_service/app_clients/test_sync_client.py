@@ -1,12 +1,22 @@
 """Module for testing Client functionality."""
+import threading
+from functools import partial
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 from faker import Faker
 
 from forager_forward.client_initializer import ClientInitializer
-from forager_forward.common.exceptions import ArgumentValidationError
-from tests.forager_service.conftest import get_query
+from forager_forward.common.bloom_filter import BloomFilter
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerAPIError
+from tests.forager_service.conftest import get_api_data, get_query
+
+
+def thread_name_after_barrier(barrier: threading.Barrier, operation: str, **kwargs: Any) -> str:
+    """Wait till all calls are in flight together, get name of the thread of the call."""
+    barrier.wait()
+    return threading.current_thread().name
 
 
 class TestClientDomainSearch(object):
@@ -103,3 +113,130 @@ class TestClientEmailCount(object):
         assert param_dict['domain'] == domain
         assert param_dict['type'] == email_type
         assert rec_data[1]['raw'] is False
+
+
+class TestClientVerifyEmails(object):
+    """Class for testing Client verify_emails method."""
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_verify_emails(
+        self,
+        mock_request: MagicMock,
+        faker: Faker,
+    ) -> None:
+        """Test verify_emails sends to api only emails without local verdict."""
+        email: str = faker.email()
+        disposable: str = '{name}@mailinator.com'.format(name=faker.user_name())
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = get_api_data
+        received_data = ClientInitializer().client.verify_emails([email, disposable, email.upper(), 'wrong'])
+        assert list(received_data) == [email, disposable, email.upper(), 'wrong']
+        assert received_data[email] == {'email': email, 'operation': 'email-verifier'}
+        assert received_data[email.upper()] is received_data[email]
+        assert received_data[disposable]['reason'] == 'disposable'
+        assert received_data['wrong']['reason'] == 'syntax'
+        assert [call.args[0] for call in mock_request.call_args_list] == ['account', 'email-verifier']
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_verify_emails_seen(
+        self,
+        mock_request: MagicMock,
+        faker: Faker,
+    ) -> None:
+        """Test verify_emails gives 'seen' verdict to seen emails and adds verified ones to seen-set."""
+        seen_email: str = faker.unique.email()
+        email: str = faker.unique.email()
+        seen = BloomFilter(1000)
+        seen.add(seen_email)
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = get_api_data
+        received_data = ClientInitializer().client.verify_emails([seen_email, email], seen=seen)
+        assert list(received_data) == [seen_email, email]
+        assert received_data[seen_email]['result'] == 'seen'
+        assert email in seen
+        received_data = ClientInitializer().client.verify_emails([email.upper()], seen=seen)
+        assert received_data == {email.upper(): {'email': email.upper(), 'result': 'seen', 'source': 'seen-set'}}
+        assert [call.args[0] for call in mock_request.call_args_list].count('email-verifier') == 1
+
+
+class TestClientEmailCountMany(object):
+    """Class for testing Client email_count_many method."""
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_email_count_many(
+        self,
+        mock_request: MagicMock,
+        faker: Faker,
+    ) -> None:
+        """Test email_count_many fills table row per domain."""
+        domains: list = [faker.unique.domain_name() for _ in range(10)]
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = lambda operation, **kwargs: {'total': len(kwargs['param_dict']['domain'])}
+        table = ClientInitializer().client.email_count_many(domains, workers=3)
+        assert table.columns['total'].tolist() == [len(domain) for domain in domains]
+        assert mock_request.call_count == len(domains)
+
+
+class TestClientMap(object):
+    """Class for testing Client map and submit methods."""
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_map(
+        self,
+        mock_request: MagicMock,
+        faker: Faker,
+    ) -> None:
+        """Test map keeps order of arguments and gives errors in place of results if asked."""
+        emails: list = [faker.unique.email() for _ in range(30)]
+        ClientInitializer().initialize_client('api_key')
+
+        def perform_request(operation: str, **kwargs: dict) -> dict:
+            if kwargs['param_dict']['email'] == emails[5]:
+                raise ForagerAPIError({'errors': []})
+            return get_api_data(operation, **kwargs)
+
+        mock_request.side_effect = perform_request
+        client = ClientInitializer().client
+        received_data: list = list(client.map('email-verifier', emails, workers=4, return_exceptions=True))
+        assert isinstance(received_data[5], ForagerAPIError)
+        assert [email_data['email'] for email_data in received_data[6:]] == emails[6:]
+        unordered: list = list(client.map('email-verifier', emails[6:], workers=4, ordered=False))
+        assert sorted(email_data['email'] for email_data in unordered) == sorted(emails[6:])
+        with pytest.raises(ForagerAPIError):
+            list(client.map('email-verifier', emails, workers=4))
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_map_workers(self, mock_request: MagicMock) -> None:
+        """Test map runs as many calls concurrently as workers are asked, more than threads of client pool."""
+        workers: int = 12
+        barrier = threading.Barrier(workers, timeout=5)
+        mock_request.side_effect = partial(thread_name_after_barrier, barrier)
+        ClientInitializer().initialize_client('api_key')
+        thread_names: list = list(ClientInitializer().client.map('account', [{}] * workers, workers=workers))
+        assert len(set(thread_names)) == workers
+        assert all(thread_name.startswith('forager-map') for thread_name in thread_names)
+
+    @patch('forager_forward.app_clients.client.Client._perform_request')
+    def test_submit(
+        self,
+        mock_request: MagicMock,
+        faker: Faker,
+    ) -> None:
+        """Test submit performs call with keyword arguments in thread pool."""
+        domain: str = faker.domain_name()
+        ClientInitializer().initialize_client('api_key')
+        mock_request.side_effect = get_api_data
+        future = ClientInitializer().client.submit('domain-search', {'domain': domain, 'limit': 5})
+        assert future.result() == {'domain': domain, 'limit': 5, 'operation': 'domain-search'}
+        with pytest.raises(ArgumentValidationError):
+            ClientInitializer().client.submit('wrong', domain)
+
+    def test_http_client(self) -> None:
+        """Test sync requests share one pooled http client till it is closed."""
+        ClientInitializer().initialize_client('api_key')
+        client = ClientInitializer().client
+        http_client = client.http_client
+        assert client.http_client is http_client
+        client.close()
+        assert http_client.is_closed
+        assert client.http_client is not http_client
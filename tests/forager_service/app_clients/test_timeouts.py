@@ -0,0 +1,104 @@
+"""Module for testing timeouts, deadlines and hedged requests."""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.timeouts import LatencyTracker, operation_timeout
+from forager_forward.common.exceptions import ForagerDeadlineError
+
+
+def make_client(operation: str, latency: float) -> Client:
+    """Create client with hedged operation and its latencies recorded."""
+    client = Client('api_key')
+    client.hedged_operations = frozenset((operation,))
+    for _ in range(20):
+        client.latency_tracker.record(operation, latency)
+    return client
+
+
+class TestOperationTimeout(object):
+    """Class for testing operation_timeout and LatencyTracker."""
+
+    def test_operation_timeout(self, faker: Faker) -> None:
+        """Test email-finder timeout is derived from max_duration."""
+        max_duration: int = faker.random_int(min=3, max=20)
+        assert operation_timeout('email-finder', {'max_duration': max_duration}) == max_duration + 5
+        assert operation_timeout('email-finder', {}) == 15
+        assert operation_timeout('email-count', {}) < operation_timeout('domain-search', {})
+
+    def test_percentile(self) -> None:
+        """Test latency percentile."""
+        tracker = LatencyTracker()
+        for latency in range(100):
+            tracker.record('email-count', latency)
+        assert tracker.percentile('email-count', 0.95) == 95
+        assert tracker.percentile('email-count', 0.95, min_samples=101) is None
+        assert tracker.percentile('domain-search', 0.95) is None
+
+
+class TestClientDeadline(object):
+    """Class for testing Client deadline argument."""
+
+    @patch('httpx.Client.send')
+    def test_timeout_extension(self, mock_send: MagicMock, faker: Faker) -> None:
+        """Test request timeout is cut to the deadline."""
+        mock_send.return_value = httpx.Response(200, json={'data': {}})
+        client = Client('api_key')
+        client.email_finder(faker.domain_name(), full_name=faker.name(), max_duration=20)
+        assert mock_send.call_args.args[0].extensions['timeout']['read'] == 25
+        client.email_finder(faker.domain_name(), full_name=faker.name(), deadline=2)
+        assert mock_send.call_args.args[0].extensions['timeout']['read'] <= 2
+
+    @patch('httpx.Client.send')
+    def test_deadline_exceeded(self, mock_send: MagicMock, faker: Faker) -> None:
+        """Test timeout after deadline raises ForagerDeadlineError."""
+
+        def send(request: httpx.Request) -> httpx.Response:
+            time.sleep(0.02)
+            raise httpx.ReadTimeout('timeout', request=request)
+
+        mock_send.side_effect = send
+        with pytest.raises(ForagerDeadlineError):
+            Client('api_key').email_count(faker.domain_name(), deadline=0.01)
+
+
+class TestClientHedging(object):
+    """Class for testing Client hedged requests."""
+
+    @patch('httpx.Client.send')
+    def test_hedged_send(self, mock_send: MagicMock, faker: Faker) -> None:
+        """Test slow request is hedged by second one and the faster response is taken."""
+        delays: list = [0.5, 0]
+
+        def send(request: httpx.Request) -> httpx.Response:
+            delay: float = delays.pop(0)
+            time.sleep(delay)
+            return httpx.Response(200, json={'data': {'delay': delay}})
+
+        mock_send.side_effect = send
+        client = make_client('email-count', 0.01)
+        assert client.email_count(faker.domain_name()) == {'delay': 0}
+        assert mock_send.call_count == 2
+
+    @patch('httpx.AsyncClient.send', new_callable=AsyncMock)
+    def test_ahedged_send(self, mock_send: AsyncMock, faker: Faker) -> None:
+        """Test slow async request is hedged by second one and the first is cancelled."""
+        delays: list = [5, 0]
+
+        async def send(request: httpx.Request) -> httpx.Response:
+            delay: float = delays.pop(0)
+            await asyncio.sleep(delay)
+            return httpx.Response(200, json={'data': {'delay': delay}})
+
+        mock_send.side_effect = send
+        client = make_client('email-count', 0.01)
+        started_at: float = time.monotonic()
+        assert async_to_sync(client.aemail_count)(faker.domain_name()) == {'delay': 0}
+        assert time.monotonic() - started_at < 1
+        assert client.concurrency_limiter.metrics()['in_flight'] == 0
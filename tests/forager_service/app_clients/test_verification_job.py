@@ -0,0 +1,111 @@
+"""Module for testing VerificationJob."""
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_clients.verification_job import TimerWheel, VerificationJob
+from forager_forward.common.exceptions import ForagerVerificationPendingError
+from tests.forager_service.conftest import get_api_data
+
+
+def pending_api(polls: int) -> Any:
+    """Get fake request, answering email verification with 202 for given number of polls."""
+    calls: dict[str, int] = {}
+
+    async def perform_request(operation: str, **kwargs: Any) -> dict:
+        if operation == 'email-verifier':
+            email: str = kwargs['param_dict']['email']
+            calls[email] = calls.get(email, 0) + 1
+            if calls[email] <= polls:
+                raise ForagerVerificationPendingError({'errors': [{'id': 'verification_in_progress'}]})
+        return get_api_data(operation, **kwargs)
+
+    return perform_request
+
+
+async def collect(job: VerificationJob) -> list:
+    """Collect results of async iteration over job."""
+    return [completed async for completed in job]
+
+
+class TestTimerWheel(object):
+    """Class for testing TimerWheel."""
+
+    def test_advance(self) -> None:
+        """Test items are due after their delay, including delays longer than one round."""
+        wheel = TimerWheel(tick=1, slots=4)
+        wheel.schedule('near', 2)
+        wheel.schedule('far', 6)
+        due: list = [wheel.advance() for _ in range(6)]
+        assert due == [[], ['near'], [], [], [], ['far']]
+        assert not len(wheel)
+
+
+class TestVerificationJob(object):
+    """Class for testing VerificationJob."""
+
+    def test_pending_response(self) -> None:
+        """Test 202 response raises ForagerVerificationPendingError."""
+        response = httpx.Response(httpx.codes.ACCEPTED, json={'errors': []})
+        with pytest.raises(ForagerVerificationPendingError):
+            Client('api_key')._process_response('email-verifier', response, raw=False)
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_polling(self, mock_request: AsyncMock, faker: Faker) -> None:
+        """Test pending emails are polled till completed, local verdicts are given at once."""
+        mock_request.side_effect = pending_api(polls=2)
+        emails: list[str] = [faker.email() for _ in range(3)]
+        completed_emails: list[str] = []
+        job = VerificationJob(
+            Client('api_key'),
+            emails + ['info@mailinator.com'],
+            callback=lambda email, email_data: completed_emails.append(email),
+            initial_delay=0.01,
+            tick=0.01,
+        )
+        completed: list = async_to_sync(collect)(job)
+        assert completed[0][0] == 'info@mailinator.com'
+        assert sorted(completed_emails) == sorted(email for email, _ in completed)
+        for email in emails:
+            assert job.results[email]['email'] == email.lower()
+        assert job.pending == 0
+        verifier_calls: list = [call for call in mock_request.call_args_list if call.args[0] == 'email-verifier']
+        assert len(verifier_calls) == 9
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_max_attempts(self, mock_request: AsyncMock, faker: Faker) -> None:
+        """Test email still pending after max_attempts gets the last pending payload."""
+        mock_request.side_effect = pending_api(polls=10)
+        email: str = faker.email()
+        job = VerificationJob(Client('api_key'), [email], max_attempts=3, initial_delay=0.01, tick=0.01)
+        results: dict = async_to_sync(job.wait)()
+        assert results[email] == {'errors': [{'id': 'verification_in_progress'}]}
+        assert mock_request.await_count == 4
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_failed_request(self, mock_request: AsyncMock, faker: Faker) -> None:
+        """Test network error of one email is its result, other emails are completed."""
+        failed_email: str = faker.unique.email()
+        emails: list[str] = [faker.unique.email() for _ in range(3)]
+
+        async def perform_request(operation: str, **kwargs: Any) -> dict:
+            if kwargs.get('param_dict', {}).get('email') == failed_email.lower():
+                raise httpx.ConnectError('Connection refused')
+            return get_api_data(operation, **kwargs)
+
+        mock_request.side_effect = perform_request
+        results: dict = async_to_sync(VerificationJob(Client('api_key'), [failed_email, *emails]).wait)()
+        assert results[failed_email] == {'errors': [{'id': 'ConnectError', 'details': 'Connection refused'}]}
+        assert all(results[email]['email'] == email.lower() for email in emails)
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_programming_error(self, mock_request: AsyncMock, faker: Faker) -> None:
+        """Test error, which isn't network or Forager error, is raised instead of being email result."""
+        mock_request.side_effect = TypeError('unexpected argument')
+        with pytest.raises(TypeError):
+            async_to_sync(VerificationJob(Client('api_key'), [faker.unique.email()]).wait)()
@@ -0,0 +1 @@
+"""Init module for testing app_services package."""
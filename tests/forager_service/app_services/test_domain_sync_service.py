@@ -0,0 +1,59 @@
+"""Module for testing DomainSyncService."""
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.domain_sync_service import DomainSyncService
+
+
+def fake_domain(emails: list[str]) -> tuple[Any, Any]:
+    """Get fake email_count and domain_search of domain with given emails."""
+
+    def email_count(domain: str) -> dict:
+        return {'total': len(emails), 'personal_emails': len(emails)}
+
+    def domain_search(domain: str, limit: int, offset: int) -> dict:
+        page: list[str] = emails[offset:][:limit]
+        return {'domain': domain, 'emails': [{'value': email} for email in page]}
+
+    return email_count, domain_search
+
+
+class TestDomainSyncService(object):
+    """Class for testing DomainSyncService."""
+
+    @patch('forager_forward.app_clients.client.Client.domain_search')
+    @patch('forager_forward.app_clients.client.Client.email_count')
+    def test_refresh_domain(self, mock_count: MagicMock, mock_search: MagicMock, faker: Faker) -> None:
+        """Test unchanged domain is skipped, changed one is fetched by pages and diff is given."""
+        domain: str = faker.unique.domain_name()
+        emails: list[str] = ['{name}@{domain}'.format(name=name, domain=domain) for name in 'abcdef']
+        mock_count.side_effect, mock_search.side_effect = fake_domain(emails[:4])
+        service = DomainSyncService(Client('api_key'), page_size=2)
+        first_diff: dict = service.refresh_domain(domain)
+        assert first_diff == {'domain': domain, 'changed': True, 'added': emails[:4], 'removed': []}
+        assert mock_search.call_count == 2
+        assert service.refresh_domain(domain)['changed'] is False
+        assert mock_search.call_count == 2
+        mock_count.side_effect, mock_search.side_effect = fake_domain(emails[1:])
+        assert list(service.refresh_domains([domain])) == [
+            {'domain': domain, 'changed': True, 'added': emails[4:], 'removed': [emails[0]]},
+        ]
+        assert service.stats == {'checked': 3, 'skipped': 1, 'changed': 2, 'pages': 5, 'failed': 0}
+        assert sorted(service.read_domain(domain)['emails']) == emails[1:]
+        assert service.refresh_domain(domain, force=True)['changed'] is True
+
+    @patch('forager_forward.app_clients.client.Client.adomain_search', new_callable=AsyncMock)
+    @patch('forager_forward.app_clients.client.Client.aemail_count', new_callable=AsyncMock)
+    def test_arefresh_domains(self, mock_count: AsyncMock, mock_search: AsyncMock, faker: Faker) -> None:
+        """Test async sync of many domains."""
+        domains: list[str] = [faker.unique.domain_name() for _ in range(3)]
+        mock_count.side_effect, mock_search.side_effect = fake_domain(['a@a.com', 'b@a.com', 'c@a.com'])
+        service = DomainSyncService(Client('api_key'), page_size=2)
+        diffs: list[dict] = async_to_sync(service.arefresh_domains)(domains)
+        assert [diff['domain'] for diff in diffs] == domains
+        assert diffs[0]['added'] == ['a@a.com', 'b@a.com', 'c@a.com']
+        assert mock_search.await_count == 6
@@ -0,0 +1,72 @@
+"""Module for testing EmailValidationService."""
+from unittest.mock import patch
+
+import pytest
+from faker import Faker
+
+from forager_forward.app_services.email_validation_service import EmailValidationService
+from forager_forward.common.bloom_filter import BloomFilter
+from forager_forward.common.exceptions import ArgumentValidationError
+from forager_forward.common.storage import Storage
+
+
+class TestEmailValidationServiceCreate(object):
+    """Class for testing EmailValidationService create_email_record method."""
+
+    def test_create_email_record(self, faker: Faker) -> None:
+        """Test valid email record."""
+        email: str = faker.unique.email()
+        service = EmailValidationService()
+        assert service.create_email_record(email) is True
+        assert service.read_email_record(email) == {'email': email, 'canonical': email, 'is_valid': True}
+        service.delete_email_record(email)
+        assert service.read_email_record(email) is None
+
+    def test_create_email_record_disposable(self, faker: Faker) -> None:
+        """Test email on disposable domain is not valid."""
+        email: str = '{name}@yopmail.com'.format(name=faker.unique.user_name())
+        service = EmailValidationService()
+        assert service.create_email_record(email) is False
+        assert service.read_email_record(email)['is_valid'] is False
+        service.delete_email_record(email)
+
+    def test_create_email_record_canonical(self, faker: Faker) -> None:
+        """Test different forms of one address share the record with original input preserved."""
+        email: str = faker.unique.email()
+        service = EmailValidationService()
+        assert service.create_email_record(' {email} '.format(email=email.upper())) is True
+        assert service.create_email_record(email) is True
+        email_record: dict = service.read_email_record(email.title())
+        assert email_record['email'] == ' {email} '.format(email=email.upper())
+        assert email_record['canonical'] == email
+        service.delete_email_record(email)
+
+    def test_create_email_record_seen_set(self, faker: Faker) -> None:
+        """Test storage is read only for emails in seen-set."""
+        email: str = faker.unique.email()
+        seen_set = BloomFilter(1000)
+        service = EmailValidationService(seen_set=seen_set)
+        with patch.object(Storage, 'read', wraps=Storage().read) as mock_read:
+            assert service.create_email_record(email) is True
+            assert mock_read.call_count == 0
+            assert email in seen_set
+            assert service.create_email_record(email.upper()) is True
+            assert mock_read.call_count == 1
+        assert EmailValidationService()._seen_set is None
+        service.delete_email_record(email)
+
+    def test_create_email_record_without_storage(self, faker: Faker) -> None:
+        """Test seen-set dedupes bulk import alone, records aren't saved to storage."""
+        email: str = faker.unique.email()
+        seen_set = BloomFilter(1000)
+        service = EmailValidationService(seen_set=seen_set, store_records=False)
+        with patch.object(Storage, 'create') as mock_create:
+            assert service.create_email_record(email) is True
+            assert service.create_email_record(email.upper()) is None
+            verification: dict = {'result': 'deliverable'}
+            assert service.save_verification_record(email, verification)['verification'] == verification
+        mock_create.assert_not_called()
+        assert email in seen_set
+        assert service.read_email_record(email) is None
+        with pytest.raises(ArgumentValidationError):
+            EmailValidationService(store_records=False)
@@ -0,0 +1,95 @@
+"""Module for testing EnrichmentService."""
+import json
+import pathlib
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.enrichment_service import (
+    CheckpointJournal,
+    EnrichmentService,
+)
+from forager_forward.common.exceptions import ForagerCircuitOpenError
+from tests.forager_service.conftest import get_api_data
+
+
+class TestEnrichmentServiceRun(object):
+    """Class for testing EnrichmentService run method."""
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_run(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test rows are enriched and journaled, processed rows are skipped on resume."""
+        domains: list = [faker.unique.domain_name() for _ in range(6)]
+        input_path: pathlib.Path = tmp_path / 'input.csv'
+        input_path.write_text('domain,limit,extra\n' + ''.join('{d},5,x\n'.format(d=domain) for domain in domains))
+        output_path: pathlib.Path = tmp_path / 'output.jsonl'
+        (tmp_path / 'output.jsonl.checkpoint').write_text('0\n2\n')
+        mock_request.side_effect = get_api_data
+        service = EnrichmentService(Client('api_key'), 'domain-search', concurrency=2)
+        stats: dict = async_to_sync(service.run)(str(input_path), str(output_path))
+        assert stats == {'processed': 4, 'skipped': 2, 'failed': 0, 'retry': 0}
+        output_rows: list = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert sorted(output_row['row'] for output_row in output_rows) == [1, 3, 4, 5]
+        for output_row in output_rows:
+            assert output_row['result']['domain'] == domains[output_row['row']]
+            assert output_row['result']['limit'] == 5
+        assert CheckpointJournal(str(tmp_path / 'output.jsonl.checkpoint')).is_done(5) is True
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_run_errors(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test api errors are written, network errors are left for the next run."""
+        input_path: pathlib.Path = tmp_path / 'input.jsonl'
+        input_path.write_text('{"email": "wrong"}\n' + json.dumps({'email': faker.email()}))
+        output_path: pathlib.Path = tmp_path / 'output.jsonl'
+        mock_request.side_effect = httpx.ConnectError('error')
+        service = EnrichmentService(Client('api_key'), 'email-verifier')
+        stats: dict = async_to_sync(service.run)(str(input_path), str(output_path))
+        assert stats == {'processed': 1, 'skipped': 0, 'failed': 1, 'retry': 1}
+        assert 'error' in json.loads(output_path.read_text())
+        journal = CheckpointJournal(str(tmp_path / 'output.jsonl.checkpoint'))
+        assert journal.is_done(0) is True
+        assert journal.is_done(1) is False
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_run_transient_errors(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test rows, rejected by open circuit, are left for the next run."""
+        input_path: pathlib.Path = tmp_path / 'input.jsonl'
+        input_path.write_text(''.join(json.dumps({'email': faker.email()}) + '\n' for _ in range(3)))
+        output_path: pathlib.Path = tmp_path / 'output.jsonl'
+        mock_request.side_effect = ForagerCircuitOpenError('Circuit is open.')
+        service = EnrichmentService(Client('api_key'), 'email-verifier')
+        stats: dict = async_to_sync(service.run)(str(input_path), str(output_path))
+        assert stats == {'processed': 0, 'skipped': 0, 'failed': 0, 'retry': 3}
+        assert output_path.read_text() == ''
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_run_unexpected_error(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test unexpected error of worker is raised instead of hanging the run."""
+        input_path: pathlib.Path = tmp_path / 'input.jsonl'
+        input_path.write_text(''.join(json.dumps({'email': faker.email()}) + '\n' for _ in range(10)))
+        mock_request.side_effect = json.JSONDecodeError('Expecting value', '<html>', 0)
+        service = EnrichmentService(Client('api_key'), 'email-verifier', concurrency=2)
+        with pytest.raises(json.JSONDecodeError):
+            async_to_sync(service.run)(str(input_path), str(tmp_path / 'output.jsonl'))
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_run_interrupted(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test row, written but not journaled, isn't repeated, torn output and journal lines are dropped."""
+        domains: list = [faker.unique.domain_name() for _ in range(4)]
+        input_path: pathlib.Path = tmp_path / 'input.csv'
+        input_path.write_text('domain\n' + ''.join('{d}\n'.format(d=domain) for domain in domains))
+        output_path: pathlib.Path = tmp_path / 'output.jsonl'
+        output_path.write_text('{"row": 0, "result": {}}\n{"row": 1, "result": {}}\n{"row": 2, "res')
+        (tmp_path / 'output.jsonl.checkpoint').write_text('0\n1')
+        mock_request.side_effect = get_api_data
+        service = EnrichmentService(Client('api_key'), 'domain-search')
+        stats: dict = async_to_sync(service.run)(str(input_path), str(output_path))
+        assert stats == {'processed': 2, 'skipped': 2, 'failed': 0, 'retry': 0}
+        output_rows: list = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert sorted(output_row['row'] for output_row in output_rows) == [0, 1, 2, 3]
+        journal = CheckpointJournal(str(tmp_path / 'output.jsonl.checkpoint'))
+        assert all(journal.is_done(row_number) for row_number in range(4))
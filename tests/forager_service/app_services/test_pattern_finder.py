@@ -0,0 +1,144 @@
+"""Module for testing PatternFinder."""
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.pattern_finder import (
+    PatternFinder,
+    email_from_pattern,
+    normalize_name,
+)
+from forager_forward.common.exceptions import (
+    ArgumentValidationError,
+    ForagerAPIError,
+    ForagerQuotaError,
+)
+
+
+def domain_data(domain: str, **kwargs: Any) -> dict:
+    """Get fake domain_search data with '{first}.{last}' pattern and given sample emails."""
+    sample_email: dict = {'value': 'john.doe@{domain}'.format(domain=domain), 'first_name': 'John', 'last_name': 'Doe'}
+    return {'domain': domain, 'pattern': '{first}.{last}', 'emails': kwargs.get('emails', [sample_email])}
+
+
+class TestEmailFromPattern(object):
+    """Class for testing email_from_pattern function."""
+
+    def test_email_from_pattern(self) -> None:
+        """Test placeholders are replaced with normalized names."""
+        assert normalize_name(" Zoë O'Neil") == 'zoeoneil'
+        assert email_from_pattern('{first}.{last}', 'a.com', 'Zoë', "O'Neil") == 'zoe.oneil@a.com'
+        assert email_from_pattern('{f}{last}', 'a.com', 'John', 'Doe') == 'jdoe@a.com'
+        assert email_from_pattern('{first}_{l}', 'a.com', 'John', 'Doe') == 'john_d@a.com'
+
+    def test_email_from_pattern_none(self) -> None:
+        """Test unknown placeholders and names, which can't be used in pattern."""
+        assert email_from_pattern('{first}.{middle}', 'a.com', 'John', 'Doe') is None
+        assert email_from_pattern('{first}.{last}', 'a.com', 'Иван', 'Doe') is None
+        assert email_from_pattern('', 'a.com', 'John', 'Doe') is None
+
+
+class TestPatternFinder(object):
+    """Class for testing PatternFinder."""
+
+    @patch('forager_forward.app_clients.client.Client.email_finder')
+    @patch('forager_forward.app_clients.client.Client.domain_search')
+    def test_find(self, mock_search: MagicMock, mock_finder: MagicMock, faker: Faker) -> None:
+        """Test pattern is fetched once per domain, email_finder is called for unusable names only."""
+        domain: str = faker.unique.domain_name()
+        mock_search.side_effect = lambda domain: domain_data(domain)
+        mock_finder.return_value = {'email': 'ivan@{domain}'.format(domain=domain), 'score': 90}
+        finder = PatternFinder(Client('api_key'))
+        results: list[dict] = finder.find(
+            [
+                {'domain': domain, 'first_name': 'Jane', 'last_name': 'Roe'},
+                {'domain': domain, 'full_name': 'Richard Roe'},
+                {'domain': domain, 'first_name': 'Иван', 'last_name': 'Петров'},
+            ],
+        )
+        assert [email_data['email'] for email_data in results[:2]] == [
+            'jane.roe@{domain}'.format(domain=domain),
+            'richard.roe@{domain}'.format(domain=domain),
+        ]
+        assert results[0]['source'] == 'pattern' and results[2]['source'] == 'api'
+        mock_search.assert_called_once_with(domain=domain)
+        assert finder.stats == {'domain_searches': 1, 'generated': 2, 'fallbacks': 1, 'calls_saved': 1}
+
+    @patch('forager_forward.app_clients.client.Client.aemail_finder', new_callable=AsyncMock)
+    @patch('forager_forward.app_clients.client.Client.adomain_search', new_callable=AsyncMock)
+    def test_afind_low_confidence(self, mock_search: AsyncMock, mock_finder: AsyncMock, faker: Faker) -> None:
+        """Test pattern, not matching sample emails, is not trusted."""
+        domain: str = faker.unique.domain_name()
+        mock_search.return_value = domain_data(
+            domain,
+            emails=[{'value': 'jdoe@{domain}'.format(domain=domain), 'first_name': 'John', 'last_name': 'Doe'}],
+        )
+        mock_finder.return_value = {'email': 'jroe@{domain}'.format(domain=domain)}
+        finder = PatternFinder(Client('api_key'))
+        person: dict = {'domain': domain, 'first_name': 'Jane', 'last_name': 'Roe'}
+        results: list[dict] = async_to_sync(finder.afind)([person])
+        assert results == [{'email': 'jroe@{domain}'.format(domain=domain), 'source': 'api'}]
+        assert finder.stats['calls_saved'] == -1
+
+    @patch('forager_forward.app_clients.client.Client.email_finder')
+    @patch('forager_forward.app_clients.client.Client.domain_search')
+    def test_find_search_failed(self, mock_search: MagicMock, mock_finder: MagicMock, faker: Faker) -> None:
+        """Test failed domain_search is not cached, it is repeated by the next finder only."""
+        domain: str = 'search-failed.{domain}'.format(domain=faker.unique.domain_name())
+        mock_search.side_effect = ForagerQuotaError('Api key has exhausted its quota.')
+        mock_finder.return_value = {'email': 'jane.roe@{domain}'.format(domain=domain)}
+        people: list[dict] = [{'domain': domain, 'first_name': 'Jane', 'last_name': 'Roe'}] * 2
+        results: list[dict] = PatternFinder(Client('api_key')).find(people)
+        assert [email_data['source'] for email_data in results] == ['api', 'api']
+        assert mock_search.call_count == 1
+        mock_search.side_effect = lambda domain: domain_data(domain)
+        results = PatternFinder(Client('api_key')).find(people)
+        assert [email_data['source'] for email_data in results] == ['pattern', 'pattern']
+        assert mock_search.call_count == 2
+
+    @patch('forager_forward.app_clients.client.Client.aemail_finder', new_callable=AsyncMock)
+    @patch('forager_forward.app_clients.client.Client.adomain_search', new_callable=AsyncMock)
+    def test_afind_search_failed(self, mock_search: AsyncMock, mock_finder: AsyncMock, faker: Faker) -> None:
+        """Test failed async domain_search is not cached."""
+        domain: str = 'async-search-failed.{domain}'.format(domain=faker.unique.domain_name())
+        mock_search.side_effect = ForagerAPIError({'errors': [{'code': 500}]})
+        mock_finder.return_value = {'email': 'jane.roe@{domain}'.format(domain=domain)}
+        finder = PatternFinder(Client('api_key'))
+        results: list[dict] = async_to_sync(finder.afind)([{'domain': domain, 'full_name': 'Jane Roe'}])
+        assert results[0]['source'] == 'api'
+        assert finder._cached_pattern(domain) is None
+
+    def test_find_without_domain(self) -> None:
+        """Test person without domain raises ArgumentValidationError."""
+        with pytest.raises(ArgumentValidationError):
+            PatternFinder(Client('api_key')).find([{'first_name': 'Jane', 'last_name': 'Roe'}])
+
+    def test_find_blank_full_name(self, faker: Faker) -> None:
+        """Test person with blank full name raises ArgumentValidationError."""
+        with pytest.raises(ArgumentValidationError):
+            PatternFinder(Client('api_key')).find([{'domain': faker.domain_name(), 'full_name': ' \t'}])
+
+    @patch('forager_forward.app_clients.client.Client.email_finder')
+    @patch('forager_forward.app_clients.client.Client.domain_search')
+    def test_find_unchecked(self, mock_search: MagicMock, mock_finder: MagicMock, faker: Faker) -> None:
+        """Test pattern without sample emails is trusted only with trust_unchecked."""
+        domain: str = 'unchecked.{domain}'.format(domain=faker.unique.domain_name())
+        mock_search.side_effect = lambda domain: domain_data(domain, emails=[])
+        mock_finder.return_value = {'email': 'jroe@{domain}'.format(domain=domain)}
+        people: list[dict] = [{'domain': domain, 'first_name': 'Jane', 'last_name': 'Roe'}]
+        results: list[dict] = PatternFinder(Client('api_key')).find(people)
+        assert results == [{'email': 'jroe@{domain}'.format(domain=domain), 'source': 'api'}]
+        results = PatternFinder(Client('api_key'), trust_unchecked=True).find(people)
+        assert results == [
+            {
+                'email': 'jane.roe@{domain}'.format(domain=domain),
+                'pattern': '{first}.{last}',
+                'confidence': None,
+                'source': 'pattern',
+            },
+        ]
+        assert mock_search.call_count == 1
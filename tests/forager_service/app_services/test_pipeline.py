@@ -0,0 +1,111 @@
+"""Module for testing Pipeline."""
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+
+from forager_forward.app_clients.client import Client
+from forager_forward.app_services.email_validation_service import EmailValidationService
+from forager_forward.app_services.pipeline import Pipeline, email_pipeline
+from forager_forward.common.exceptions import ForagerAPIError
+
+
+class SlowSink(object):
+    """Stage handlers, recording the largest number of items between fast and slow stages."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.produced: int = 0
+        self.consumed: int = 0
+        self.max_backlog: int = 0
+
+    async def produce(self, item: int) -> int:
+        """Pass item at once."""
+        self.produced += 1
+        self.max_backlog = max(self.max_backlog, self.produced - self.consumed)
+        return item
+
+    async def consume(self, item: int) -> int:
+        """Pass item slowly."""
+        await asyncio.sleep(0.001)
+        self.consumed += 1
+        if item == 3:
+            raise ForagerAPIError({'errors': []})
+        return item * 2
+
+
+async def collect(pipeline: Pipeline, source: Any) -> list:
+    """Collect results of the pipeline."""
+    return [item async for item in pipeline.stream(source)]
+
+
+class TestPipeline(object):
+    """Class for testing Pipeline."""
+
+    def test_backpressure(self) -> None:
+        """Test fast stage waits for slow one, failed items are counted and dropped."""
+        sink = SlowSink()
+        errors: list = []
+        pipeline = Pipeline(queue_size=5, on_error=lambda name, item, error: errors.append((name, item)))
+        pipeline.stage('produce', sink.produce, concurrency=4).stage('consume', sink.consume, concurrency=2)
+        results: list = async_to_sync(collect)(pipeline, range(100))
+        assert sorted(results) == [item * 2 for item in range(100) if item != 3]
+        assert sink.max_backlog <= 5 * 2 + 4 + 2
+        assert errors == [('consume', 3)]
+        assert pipeline.metrics()['consume'] == {'processed': 99, 'failed': 1, 'queued': 0}
+
+    def test_drain(self) -> None:
+        """Test drained pipeline stops taking source items and finishes taken ones."""
+        pipeline = Pipeline(queue_size=1)
+        pipeline.stage('stop', self._drain_on(pipeline, 10))
+        results: list = async_to_sync(collect)(pipeline, range(1000))
+        assert 10 in results
+        assert len(results) < 20
+
+    def test_error(self) -> None:
+        """Test unexpected error stops pipeline and is raised."""
+        pipeline = Pipeline().stage('fail', AsyncMock(side_effect=KeyError('key')), concurrency=3)
+        with pytest.raises(KeyError):
+            async_to_sync(pipeline.run)(range(10))
+
+    def _drain_on(self, pipeline: Pipeline, drain_item: int) -> Any:
+        """Get handler, draining pipeline on given item."""
+
+        async def handler(item: int) -> int:
+            if item == drain_item:
+                pipeline.drain()
+            await asyncio.sleep(0)
+            return item
+
+        return handler
+
+
+class TestEmailPipeline(object):
+    """Class for testing email_pipeline."""
+
+    @patch('forager_forward.app_clients.client.Client.averify_email', new_callable=AsyncMock)
+    @patch('forager_forward.app_clients.client.Client.aemail_finder', new_callable=AsyncMock)
+    @patch('forager_forward.app_clients.client.Client.adomain_search', new_callable=AsyncMock)
+    def test_email_pipeline(
+        self,
+        mock_search: AsyncMock,
+        mock_finder: AsyncMock,
+        mock_verify: AsyncMock,
+        faker: Faker,
+    ) -> None:
+        """Test domains and people pass search, find, verify and store stages."""
+        domain: str = faker.unique.domain_name()
+        found: str = faker.unique.email()
+        mock_search.return_value = {'emails': [{'value': 'info@{domain}'.format(domain=domain)}]}
+        mock_finder.return_value = {'email': found}
+        mock_verify.return_value = {'result': 'undeliverable'}
+        records: list = async_to_sync(collect)(
+            email_pipeline(Client('api_key')),
+            [domain, {'domain': domain, 'first_name': 'John', 'last_name': 'Doe'}],
+        )
+        assert sorted(record['email'] for record in records) == sorted([found, 'info@{domain}'.format(domain=domain)])
+        assert EmailValidationService().read_email_record(found)['is_valid'] is False
+        mock_finder.assert_awaited_once_with(domain=domain, first_name='John', last_name='Doe')
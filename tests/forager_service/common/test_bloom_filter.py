@@ -0,0 +1,70 @@
+"""Module for testing BloomFilter."""
+import pytest
+from faker import Faker
+
+from forager_forward.common.bloom_filter import BloomFilter
+from forager_forward.common.exceptions import ArgumentValidationError, ForagerError
+
+
+class TestBloomFilter(object):
+    """Class for testing BloomFilter add, lookup and false positive rate."""
+
+    def test_add(self, faker: Faker) -> None:
+        """Test added items are found and adding them again isn't new."""
+        emails: list = [faker.unique.email() for _ in range(100)]
+        bloom_filter = BloomFilter(1000)
+        assert all(bloom_filter.add(email) for email in emails)
+        assert all(email in bloom_filter for email in emails)
+        assert not any(bloom_filter.add(email) for email in emails)
+        assert len(bloom_filter) == 100
+        assert 42 not in bloom_filter
+
+    def test_error_rate(self) -> None:
+        """Test false positive rate at capacity is near configured one."""
+        bloom_filter = BloomFilter(10000, error_rate=0.01)
+        bloom_filter.update('added{number}@example.com'.format(number=number) for number in range(10000))
+        false_positives: int = sum(
+            'other{number}@example.com'.format(number=number) in bloom_filter for number in range(10000)
+        )
+        assert false_positives < 200
+        assert len(bloom_filter._bits) < 10000 * 1.25
+
+    def test_wrong_params(self) -> None:
+        """Test capacity and error rate are validated."""
+        with pytest.raises(ArgumentValidationError):
+            BloomFilter(0)
+        with pytest.raises(ArgumentValidationError):
+            BloomFilter(100, error_rate=1)
+
+
+class TestBloomFilterMerge(object):
+    """Class for testing BloomFilter merge, save and load."""
+
+    def test_merge(self, faker: Faker) -> None:
+        """Test merged filter has items of both workers."""
+        first_emails: list = [faker.unique.email() for _ in range(50)]
+        second_emails: list = [faker.unique.email() for _ in range(50)]
+        first_filter = BloomFilter(1000)
+        second_filter = BloomFilter(1000)
+        first_filter.update(first_emails)
+        second_filter.update(second_emails)
+        first_filter.merge(second_filter)
+        assert all(email in first_filter for email in first_emails + second_emails)
+        assert len(first_filter) == 100
+        with pytest.raises(ArgumentValidationError):
+            first_filter.merge(BloomFilter(2000))
+
+    def test_save_load(self, faker: Faker, tmp_path) -> None:
+        """Test loaded filter has the same items and params."""
+        emails: list = [faker.unique.email() for _ in range(50)]
+        bloom_filter = BloomFilter(1000, error_rate=0.001)
+        bloom_filter.update(emails)
+        path: str = str(tmp_path / 'seen.bloom')
+        bloom_filter.save(path)
+        loaded_filter: BloomFilter = BloomFilter.load(path)
+        assert all(email in loaded_filter for email in emails)
+        assert (loaded_filter.capacity, loaded_filter.error_rate, len(loaded_filter)) == (1000, 0.001, 50)
+        loaded_filter.merge(bloom_filter)
+        (tmp_path / 'wrong.bloom').write_bytes(b'wrong')
+        with pytest.raises(ForagerError):
+            BloomFilter.load(str(tmp_path / 'wrong.bloom'))
@@ -2,7 +2,10 @@
 import pytest
 from faker import Faker
 
-from forager_forward.common.common_utilities import create_and_validate_params
+from forager_forward.common.common_utilities import (
+    canonicalize_email,
+    create_and_validate_params,
+)
 from forager_forward.common.exceptions import ArgumentValidationError
 
 
@@ -71,3 +74,28 @@ class TestCreateAdnValidateParams(object):
                 kwargs[elem] = None
         with pytest.raises(ArgumentValidationError):
             create_and_validate_params(operation_type, **kwargs)
+
+
+class TestCanonicalizeEmail(object):
+    """Class for testing canonicalize_email."""
+
+    def test_canonicalize_email(self, faker: Faker) -> None:
+        """Test email is trimmed, lowercased and domain is IDNA encoded."""
+        user_name: str = faker.user_name()
+        assert canonicalize_email(' {name}@Example.COM '.format(name=user_name.upper())) == '{name}@example.com'.format(
+            name=user_name,
+        )
+        assert canonicalize_email('{name}@Bücher.de'.format(name=user_name)) == '{name}@xn--bcher-kva.de'.format(
+            name=user_name,
+        )
+
+    def test_canonicalize_email_provider_rules(self) -> None:
+        """Test provider specific rules."""
+        assert canonicalize_email('John.Doe+news@googlemail.com') == 'john.doe+news@googlemail.com'
+        assert canonicalize_email('John.Doe+news@googlemail.com', provider_rules=True) == 'johndoe@gmail.com'
+        assert canonicalize_email('John.Doe+news@outlook.com', provider_rules=True) == 'john.doe@outlook.com'
+
+    def test_canonicalize_email_error(self, faker: Faker) -> None:
+        """Test not str email raises error."""
+        with pytest.raises(ArgumentValidationError):
+            canonicalize_email(faker.random_int())
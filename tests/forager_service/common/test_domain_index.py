@@ -0,0 +1,49 @@
+"""Module for testing DomainIndex."""
+import pathlib
+
+import pytest
+from faker import Faker
+
+from forager_forward.common.domain_index import DomainIndex
+from forager_forward.common.exceptions import ArgumentValidationError
+
+
+class TestDomainIndexLookup(object):
+    """Class for testing DomainIndex lookup method."""
+
+    def test_lookup_disposable(self, faker: Faker) -> None:
+        """Test disposable domain and its subdomains have local verdict."""
+        index = DomainIndex()
+        email: str = '{name}@{sub}.Mailinator.com'.format(name=faker.user_name(), sub=faker.word())
+        verdict: dict = index.lookup(email)
+        assert verdict['reason'] == 'disposable'
+        assert verdict['result'] == 'undeliverable'
+        assert verdict['email'] == email
+
+    def test_lookup_role(self, faker: Faker) -> None:
+        """Test role address has risky verdict, personal address has none."""
+        index = DomainIndex()
+        assert index.lookup('admin@{domain}'.format(domain=faker.domain_name()))['result'] == 'risky'
+        assert index.lookup(faker.email()) is None
+
+
+class TestDomainIndexLoad(object):
+    """Class for testing DomainIndex load method."""
+
+    def test_from_file(self, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test index is loaded from file."""
+        blocked: str = faker.domain_name()
+        disposable: str = faker.domain_name()
+        path: pathlib.Path = tmp_path / 'index.txt'
+        path.write_text('# comment\n\nblocked:{blocked}\n{disposable}\n'.format(blocked=blocked, disposable=disposable))
+        index = DomainIndex.from_file(str(path))
+        assert index.lookup('a@{domain}'.format(domain=blocked))['reason'] == 'blocked'
+        assert index.lookup('a@{domain}'.format(domain=disposable))['reason'] == 'disposable'
+        assert index.lookup('a@mailinator.com') is None
+
+    def test_load_error(self, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test unknown entry kind raises error."""
+        path: pathlib.Path = tmp_path / 'index.txt'
+        path.write_text('unknown:{domain}\n'.format(domain=faker.domain_name()))
+        with pytest.raises(ArgumentValidationError):
+            DomainIndex().load(str(path))
@@ -0,0 +1,78 @@
+"""Module for testing JsonArrayStream."""
+import json
+
+import pytest
+from faker import Faker
+
+from forager_forward.common.exceptions import ForagerError
+from forager_forward.common.json_stream import JsonArrayStream
+
+
+def parse_by_chunks(document: bytes, chunk_size: int) -> list:
+    """Feed document to parser of data.emails by chunks of given size."""
+    parser = JsonArrayStream(('data', 'emails'))
+    items: list = []
+    for start in range(0, len(document), chunk_size):
+        end: int = start + chunk_size
+        items.extend(parser.feed(document[start:end]))
+    items.extend(parser.close())
+    return items
+
+
+class TestJsonArrayStream(object):
+    """Class for testing JsonArrayStream incremental parsing."""
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 64, 100000])
+    def test_items(self, faker: Faker, chunk_size: int) -> None:
+        """Test items are the same for any chunking, other keys and nested arrays with the same key are skipped."""
+        emails: list = [
+            {'value': faker.email(), 'confidence': 90, 'sources': [{'uri': faker.uri(), 'title': 'Ünïcode'}] * 3}
+            for _ in range(20)
+        ]
+        document: bytes = json.dumps(
+            {
+                'data': {'domain': faker.domain_name(), 'count': 123, 'meta': {'emails': [1]}, 'emails': emails},
+                'meta': {'results': 20},
+            },
+            indent=2,
+            ensure_ascii=False,
+        ).encode()
+        assert parse_by_chunks(document, chunk_size) == emails
+
+    def test_split_at_every_byte(self) -> None:
+        """Test numbers, literals and multibyte chars are decoded the same, wherever document is split."""
+        document: bytes = json.dumps(
+            {
+                'meta': {'offset': -12.5e-3, 'total': 1234},
+                'data': {'emails': [12.5, -3, 1e5, 0, {'confidence': 1.25e-2}, 'Ünïcode', True, None, 100]},
+            },
+            ensure_ascii=False,
+        ).encode()
+        expected: list = json.loads(document)['data']['emails']
+        for split_at in range(len(document) + 1):
+            parser = JsonArrayStream(('data', 'emails'))
+            items: list = parser.feed(document[:split_at])
+            items.extend(parser.feed(document[split_at:]))
+            items.extend(parser.close())
+            assert items == expected, split_at
+
+    def test_items_before_end(self) -> None:
+        """Test item is given as soon as it is complete."""
+        parser = JsonArrayStream(('data', 'emails'))
+        assert parser.feed(b'{"data": {"pattern": "{first}", "emails": [{"value": "a@b.com"}, {"val') == [
+            {'value': 'a@b.com'},
+        ]
+        assert parser.feed(b'ue": "c@b.com"}]') == [{'value': 'c@b.com'}]
+        assert parser.done
+
+    def test_no_array(self) -> None:
+        """Test documents without array at path have no items."""
+        assert parse_by_chunks(b'{"errors": [{"id": "wrong_params", "code": 400}]}', 5) == []
+        assert parse_by_chunks(b'{"data": null}', 5) == []
+
+    def test_truncated(self) -> None:
+        """Test truncated document raises ForagerError on close."""
+        parser = JsonArrayStream(('data', 'emails'))
+        assert parser.feed(b'{"data": {"emails": [{"value": "a@b.com"}, {"value"') == [{'value': 'a@b.com'}]
+        with pytest.raises(ForagerError):
+            parser.close()
@@ -0,0 +1,118 @@
+"""Module for testing shared storage."""
+import multiprocessing
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from forager_forward.common.exceptions import ForagerKeyError, ForagerStorageFullError
+from forager_forward.common.shared_storage import SharedStore
+from forager_forward.common.storage import Storage
+
+
+def create_same_keys(created: Any) -> None:
+    """Create the same keys in storage, shared before fork, counting created ones."""
+    storage = Storage()
+    for number in range(50):
+        try:
+            storage.create(str(number), number)
+        except ForagerKeyError:
+            continue
+        with created.get_lock():
+            created.value += 1
+
+
+def write_records(worker: int) -> None:
+    """Write records of worker process to storage, shared before fork."""
+    storage = Storage()
+    assert storage.read('existing') == 'record'
+    for number in range(50):
+        storage.create('{worker}:{number}'.format(worker=worker, number=number), {'worker': worker, 'number': number})
+
+
+@pytest.fixture
+def storage() -> Iterator[Storage]:
+    """Get storage, restore its in-memory records after test."""
+    storage = Storage()
+    records: dict = dict(storage.storage)
+    yield storage
+    storage.__dict__.pop('_storage', None)
+    storage.__dict__.pop('_shared_store', None)
+    storage.storage.clear()
+    storage.storage.update(records)
+
+
+class TestSharedStore(object):
+    """Class for testing SharedStore."""
+
+    def test_mapping(self, tmp_path: Path) -> None:
+        """Test records are saved, updated, deleted and seen by store, opened on the same file."""
+        path: str = str(tmp_path / 'storage.shm')
+        store = SharedStore(path, capacity=16, slot_size=128)
+        store['a@company.com'] = {'is_valid': True}
+        store['b@company.com'] = [1, 2]
+        store['a@company.com'] = {'is_valid': False}
+        del store['b@company.com']  # noqa: WPS420
+        store['c@company.com'] = 'c'
+        other_store = SharedStore(path)
+        assert dict(other_store) == {'a@company.com': {'is_valid': False}, 'c@company.com': 'c'}
+        assert 'b@company.com' not in other_store
+        assert other_store.get('b@company.com') is None
+        assert (other_store.capacity, other_store.slot_size) == (16, 128)
+        other_store.clear()
+        assert not store
+
+    def test_insert(self, tmp_path: Path) -> None:
+        """Test record is inserted only for new key and get returns default for missing one."""
+        store = SharedStore(str(tmp_path / 'storage.shm'), capacity=16, slot_size=128)
+        assert store.insert('a@company.com', 'first')
+        assert not store.insert('a@company.com', 'second')
+        assert store.get('a@company.com') == 'first'
+        assert store.get('b@company.com', 'default') == 'default'
+
+    def test_bounded(self, tmp_path: Path) -> None:
+        """Test too big record and record in full store raise ForagerStorageFullError."""
+        store = SharedStore(str(tmp_path / 'storage.shm'), capacity=4, slot_size=64)
+        with pytest.raises(ForagerStorageFullError):
+            store['key'] = 'x' * 64
+        for number in range(3):
+            store[str(number)] = number
+        with pytest.raises(ForagerStorageFullError):
+            store['3'] = 3
+        store['0'] = 'updated'
+        assert len(store) == 3
+
+
+class TestStorageShare(object):
+    """Class for testing Storage.share."""
+
+    def test_processes(self, storage: Storage, tmp_path: Path) -> None:
+        """Test records in memory are moved to shared file and records of forked workers are seen by all."""
+        path: str = str(tmp_path / 'storage.shm')
+        storage.create('existing', 'record')
+        storage.share(path, capacity=1024)
+        shared_records: int = len(storage.storage)
+        context = multiprocessing.get_context('fork')
+        workers: list = [context.Process(target=write_records, args=(worker,)) for worker in range(4)]
+        for worker_process in workers:
+            worker_process.start()
+        for worker_process in workers:
+            worker_process.join()
+        assert [worker_process.exitcode for worker_process in workers] == [0, 0, 0, 0]
+        assert len(storage.storage) == shared_records + 200
+        assert storage.read('3:49') == {'worker': 3, 'number': 49}
+        assert storage.read('existing') == 'record'
+
+    def test_create_same_keys(self, storage: Storage, tmp_path: Path) -> None:
+        """Test each key is created by one of forked workers, creating the same keys."""
+        storage.share(str(tmp_path / 'storage.shm'), capacity=1024)
+        context = multiprocessing.get_context('fork')
+        created = context.Value('i', 0)
+        workers: list = [context.Process(target=create_same_keys, args=(created,)) for _ in range(4)]
+        for worker_process in workers:
+            worker_process.start()
+        for worker_process in workers:
+            worker_process.join()
+        assert [worker_process.exitcode for worker_process in workers] == [0, 0, 0, 0]
+        assert created.value == 50
+        assert storage.read('49') == 49
@@ -0,0 +1,75 @@
+"""Module for testing storage snapshots."""
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from faker import Faker
+
+from forager_forward.app_services.email_validation_service import EmailValidationService
+from forager_forward.common.exceptions import ForagerError, ForagerKeyError
+from forager_forward.common.snapshot import Snapshot, write_snapshot
+from forager_forward.common.storage import Storage
+
+
+@pytest.fixture
+def storage() -> Iterator[Storage]:
+    """Get empty storage, restore its records and drop loaded snapshot after test."""
+    storage = Storage()
+    records: dict = dict(storage.storage)
+    storage.storage.clear()
+    yield storage
+    storage.storage.clear()
+    storage.storage.update(records)
+    storage._snapshot = None  # noqa: WPS437
+    storage._deleted.clear()  # noqa: WPS437
+
+
+class TestSnapshot(object):
+    """Class for testing Snapshot file."""
+
+    def test_read(self, tmp_path: Path, faker: Faker) -> None:
+        """Test every record is found by key and missing keys aren't."""
+        records: dict = {faker.unique.email(): {'is_valid': faker.pybool(), 'name': faker.name()} for _ in range(500)}
+        path: str = str(tmp_path / 'storage.snapshot')
+        assert write_snapshot(path, records.items()) == 500
+        snapshot = Snapshot(path)
+        assert len(snapshot) == 500
+        assert all(snapshot.get(key) == record for key, record in records.items())
+        assert list(snapshot.keys()) == sorted(records)
+        assert snapshot.get('missing@company.com') is None
+        assert 'missing@company.com' not in snapshot
+        snapshot.close()
+
+    def test_not_snapshot(self, tmp_path: Path) -> None:
+        """Test file of other format raises ForagerError."""
+        path: Path = tmp_path / 'storage.json'
+        path.write_bytes(b'{"key": "some data", "other_key": "other data"}')
+        with pytest.raises(ForagerError):
+            Snapshot(str(path))
+
+
+class TestStorageSnapshot(object):
+    """Class for testing Storage snapshot and load_snapshot."""
+
+    def test_round_trip(self, storage: Storage, tmp_path: Path) -> None:
+        """Test records are read from loaded snapshot, changes are kept over it and written to the next one."""
+        path: str = str(tmp_path / 'storage.snapshot')
+        EmailValidationService().create_email_record('John.Doe@Company.com')
+        storage.create('kept', {'count': 1})
+        storage.create('deleted', [1, 2])
+        assert storage.snapshot(path) == 3
+        storage.storage.clear()
+        assert storage.load_snapshot(path) == 3
+        assert EmailValidationService().read_email_record('john.doe@company.com')['email'] == 'John.Doe@Company.com'
+        with pytest.raises(ForagerKeyError):
+            storage.create('kept', {})
+        storage.update('kept', {'count': 2})
+        assert storage.delete('deleted') == [1, 2]
+        assert storage.read('deleted') is None
+        with pytest.raises(ForagerKeyError):
+            storage.update('deleted', [])
+        storage.create('new', 'value')
+        next_path: str = str(tmp_path / 'next.snapshot')
+        assert storage.snapshot(next_path) == 3
+        assert Snapshot(next_path).get('kept') == {'count': 2}
+        assert 'deleted' not in Snapshot(next_path)
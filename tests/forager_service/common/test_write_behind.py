@@ -0,0 +1,199 @@
+"""Module for testing Storage write-behind mode and change feed."""
+import multiprocessing
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from forager_forward.common.change_feed import ChangeFeed, StorageChange
+from forager_forward.common.exceptions import ForagerStorageFullError
+from forager_forward.common.shared_storage import SharedStore
+from forager_forward.common.storage import Storage
+
+
+class CountingDict(dict):
+    """Dict, counting batch updates."""
+
+    updates: int = 0
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Count batch update."""
+        self.updates += 1
+        super().update(*args, **kwargs)
+
+
+def hold_lock(storage: Storage, locked: threading.Event, release: threading.Event) -> None:
+    """Hold storage lock till release is set."""
+    with storage._lock:  # noqa: WPS437
+        locked.set()
+        release.wait(timeout=10)
+
+
+def read_in_thread(storage: Storage, key: str, read_data: list[Any], *args: Any) -> None:
+    """Read key by other thread, waiting for it."""
+    reader = threading.Thread(target=lambda: read_data.append(storage.read(key)))
+    reader.start()
+    reader.join(timeout=5)
+
+
+def write_in_child() -> None:
+    """Check forked child has no buffered changes of the parent and its storage lock isn't held."""
+    storage = Storage()
+    assert storage.read('a') is None
+    assert storage._flusher is not None and storage._flusher.is_alive()  # noqa: WPS437
+    storage.create('b', 2)
+    storage.flush()
+    assert storage.storage == {'b': 2}
+
+
+@pytest.fixture
+def storage() -> Iterator[Storage]:
+    """Get storage with empty counting backend, restore it after test."""
+    storage = Storage()
+    storage._storage = CountingDict()  # noqa: WPS437
+    yield storage
+    storage.disable_write_behind()
+    storage._subscribers.clear()  # noqa: WPS437
+    storage.__dict__.pop('_storage', None)
+    storage.__dict__.pop('_shared_store', None)
+
+
+class TestWriteBehind(object):
+    """Class for testing write-behind mode."""
+
+    @patch('atexit.register')
+    def test_batches(self, mock_register: MagicMock, storage: Storage) -> None:
+        """Test changes are visible at once, applied by batch_size in one update and fed in order."""
+        feed: ChangeFeed = storage.subscribe()  # type: ignore
+        storage.enable_write_behind(batch_size=4, interval=60)
+        mock_register.assert_called_once_with(storage.flush)
+        storage.create('a', 1)
+        storage.create('b', 2)
+        storage.update('a', 3)
+        assert storage.read('a') == 3
+        assert not storage.storage
+        assert not list(feed)
+        assert storage.delete('b') == 2
+        assert storage.storage == {'a': 3}
+        assert storage.storage.updates == 1
+        changes: list[StorageChange] = list(feed)
+        assert [(change.operation, change.key, change.some_data) for change in changes] == [
+            ('create', 'a', 1),
+            ('create', 'b', 2),
+            ('update', 'a', 3),
+            ('delete', 'b', None),
+        ]
+        assert [change.sequence for change in changes] == sorted(change.sequence for change in changes)
+
+    def test_interval(self, storage: Storage) -> None:
+        """Test buffered changes are flushed by background thread."""
+        feed: ChangeFeed = storage.subscribe()  # type: ignore
+        storage.enable_write_behind(batch_size=100, interval=0.01)
+        storage.create('a', 1)
+        change = feed.get(timeout=5)
+        assert change is not None
+        assert change.key == 'a'
+        assert storage.storage == {'a': 1}
+
+    def test_write_through(self, storage: Storage) -> None:
+        """Test changes are applied and given to callback at once without write-behind mode."""
+        changes: list[StorageChange] = []
+        storage.subscribe(changes.append)
+        storage.create('a', 1)
+        assert storage.storage == {'a': 1}
+        assert changes[0].operation == 'create'
+        storage.unsubscribe(changes.append)
+        storage.delete('a')
+        assert len(changes) == 1
+
+    def test_rejected_record(self, storage: Storage, tmp_path: Path) -> None:
+        """Test record, which doesn't fit shared slot, is rejected before it is buffered."""
+        storage.share(str(tmp_path / 'storage.shm'), capacity=16, slot_size=64)
+        with pytest.raises(ForagerStorageFullError):
+            storage.create('big', 'x' * 200)
+        assert storage.read('big') is None
+        storage.create('small', 'x')
+        assert storage.read('small') == 'x'
+
+    @patch('atexit.register')
+    def test_failed_batch(self, mock_register: MagicMock, storage: Storage, tmp_path: Path) -> None:
+        """Test batch, which doesn't fit shared storage, is kept buffered and applied, when removals free space."""
+        changes: list[StorageChange] = []
+        storage.subscribe(changes.append)
+        path: str = str(tmp_path / 'storage.shm')
+        storage.share(path, capacity=4, slot_size=64)
+        for number in range(3):
+            storage.create(str(number), number)
+        storage.enable_write_behind(batch_size=100, interval=60)
+        storage.update('0', 'updated')
+        other_store = SharedStore(path)
+        del other_store['0']  # noqa: WPS420
+        other_store['other'] = 'other'
+        with pytest.raises(ForagerStorageFullError):
+            storage.flush()
+        assert storage.read('0') == 'updated'
+        assert len(changes) == 3
+        storage.delete('1')
+        assert storage.flush() == 2
+        assert dict(storage.storage) == {'0': 'updated', '2': 2, 'other': 'other'}
+        assert [change.key for change in changes] == ['0', '1', '2', '0', '1']
+
+    def test_failed_write_through(self, storage: Storage, tmp_path: Path) -> None:
+        """Test write-through change, which doesn't fit shared storage, is rolled back and isn't fed."""
+        changes: list[StorageChange] = []
+        storage.subscribe(changes.append)
+        storage.share(str(tmp_path / 'storage.shm'), capacity=4, slot_size=64)
+        for number in range(3):
+            storage.create(str(number), number)
+        with pytest.raises(ForagerStorageFullError):
+            storage.create('3', 3)
+        assert storage.read('3') is None
+        assert len(changes) == 3
+        storage.delete('0')
+        storage.create('3', 3)
+        assert dict(storage.storage) == {'1': 1, '2': 2, '3': 3}
+        assert [change.sequence for change in changes] == sorted(change.sequence for change in changes)
+
+    @patch('atexit.register')
+    def test_read_while_flushing(self, mock_register: MagicMock, storage: Storage) -> None:
+        """Test buffered record is read by other thread without lock, while its batch is applied."""
+        read_data: list[Any] = []
+        storage.enable_write_behind(batch_size=100, interval=60)
+        storage.create('a', 1)
+        with patch.object(CountingDict, 'update', side_effect=partial(read_in_thread, storage, 'a', read_data)):
+            storage.flush()
+        assert read_data == [1]
+
+    @patch('atexit.register')
+    def test_fork(self, mock_register: MagicMock, storage: Storage) -> None:
+        """Test forked child gets new lock and flusher and no buffered changes, even if lock is held at fork."""
+        storage.enable_write_behind(batch_size=100, interval=60)
+        storage.create('a', 1)
+        locked = threading.Event()
+        release = threading.Event()
+        holder = threading.Thread(target=hold_lock, args=(storage, locked, release))
+        holder.start()
+        locked.wait(timeout=5)
+        child = multiprocessing.get_context('fork').Process(target=write_in_child)
+        child.start()
+        release.set()
+        holder.join()
+        child.join(timeout=10)
+        assert child.exitcode == 0
+        assert storage.read('a') == 1
+
+
+class TestChangeFeed(object):
+    """Class for testing ChangeFeed."""
+
+    def test_bounded(self) -> None:
+        """Test the oldest changes are dropped, when consumer falls behind."""
+        feed = ChangeFeed(max_size=2)
+        for sequence in range(3):
+            feed(StorageChange(sequence, 'create', str(sequence), sequence))
+        assert [change.sequence for change in feed] == [1, 2]
+        assert feed.dropped == 1
+        assert feed.get(timeout=0) is None
@@ -69,3 +69,10 @@ def get_kwargs(faker: Faker) -> dict:
 def get_query(some_variable: Any, **kwargs: Any) -> tuple:
     """Return given arguments."""
     return some_variable, kwargs
+
+
+def get_api_data(operation: str, **kwargs: Any) -> dict:
+    """Return fake api data for the operation."""
+    if operation == 'account':
+        return {'requests': {'searches': {'used': 0, 'available': 100}, 'verifications': {'used': 0, 'available': 100}}}
+    return dict(kwargs.get('param_dict', {}), operation=operation)
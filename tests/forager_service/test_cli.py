@@ -0,0 +1,32 @@
+"""Module for testing command line interface."""
+import json
+import pathlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from faker import Faker
+
+from forager_forward.cli import main
+from tests.forager_service.conftest import get_api_data
+
+
+class TestMain(object):
+    """Class for testing main function."""
+
+    @patch('forager_forward.app_clients.client.Client._aperform_request', new_callable=AsyncMock)
+    def test_enrich(self, mock_request: AsyncMock, faker: Faker, tmp_path: pathlib.Path) -> None:
+        """Test enrich command."""
+        email: str = faker.email()
+        input_path: pathlib.Path = tmp_path / 'input.csv'
+        input_path.write_text('email\n{email}\n'.format(email=email))
+        output_path: pathlib.Path = tmp_path / 'output.jsonl'
+        mock_request.side_effect = get_api_data
+        exit_code: int = main(['enrich', 'email-verifier', str(input_path), str(output_path), '--api-key', 'key'])
+        assert exit_code == 0
+        assert json.loads(output_path.read_text())['result']['email'] == email
+
+    def test_enrich_without_key(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test enrich command without api key."""
+        monkeypatch.delenv('FORAGER_API_KEYS', raising=False)
+        with pytest.raises(SystemExit):
+            main(['enrich', 'email-verifier', str(tmp_path / 'in.csv'), str(tmp_path / 'out.jsonl')])
@@ -0,0 +1,69 @@
+"""Module for testing cold import of forager_forward."""
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+
+import pytest
+
+from forager_forward.common.lazy_import import lazy_import
+
+project_root: Path = Path(__file__).resolve().parents[2]
+import_time_budget: float = 60
+deferred_modules: tuple[str, ...] = ('asyncio', 'concurrent.futures', 'h2', 'httpx')
+lazy_modules: tuple[str, ...] = (
+    'forager_forward.app_clients.count_table',
+    'forager_forward.app_clients.negative_cache',
+    'forager_forward.app_clients.response_cache',
+    'forager_forward.common.shared_storage',
+    'sqlite3',
+)
+
+
+def run_python(*arguments: str) -> subprocess.CompletedProcess:
+    """Run fresh interpreter in project root."""
+    return subprocess.run(  # noqa: S603
+        (sys.executable, *arguments),
+        capture_output=True,
+        cwd=project_root,
+        text=True,
+    )
+
+
+class TestImportTime(object):
+    """Class for testing import time and lazy import."""
+
+    def test_import_budget(self) -> None:
+        """Test client initializer with all modules, imported with it, is imported within budget (milliseconds)."""
+        completed = run_python(
+            str(project_root / 'benchmarks' / 'import_time_benchmark.py'),
+            '--budget',
+            str(import_time_budget),
+        )
+        assert completed.returncode == 0, completed.stdout + completed.stderr
+
+    def test_deferred_modules(self) -> None:
+        """Test httpx, asyncio and thread pools aren't imported with client initializer, only with the first client."""
+        completed = run_python(
+            '-c',
+            'import sys; import forager_forward.client_initializer; '
+            + 'print(sorted(set(sys.argv[1:]) & set(sys.modules)))',
+            *deferred_modules,
+        )
+        assert completed.stdout.strip() == '[]', completed.stderr
+
+    def test_lazy_modules(self) -> None:
+        """Test optional modules aren't executed on import and client creation, lazy ones are only registered."""
+        completed = run_python(
+            '-c',
+            'import sys, types; from forager_forward.client_initializer import ClientInitializer; '
+            + "ClientInitializer().initialize_client('api_key'); "
+            + 'print(sorted(name for name in sys.argv[1:] if type(sys.modules.get(name)) is types.ModuleType))',
+            *lazy_modules,
+        )
+        assert completed.stdout.strip() == '[]', completed.stderr
+
+    def test_lazy_import(self) -> None:
+        """Test imported module is returned as it is and missing module raises error."""
+        assert lazy_import('sys') is sys
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import('forager_forward.missing_module')